@@ -0,0 +1,149 @@
+"""
+Кэш ответов API для прогнозов из парсеров.
+
+Для каждой таблицы хранится уже сериализованный JSON-фрагмент ответа вместе с версией
+данных таблицы, при которой он был построен. Версии таблиц увеличивает планировщик
+при каждом изменении данных, поэтому фрагмент пересобирается только после изменения таблицы.
+"""
+
+import hashlib
+import threading
+from typing import Dict, Optional, Tuple
+
+from .responses import dumps_json
+
+
+def serialize(content) -> bytes:
+    """
+    Сериализует данные в JSON (см. `api.responses.dumps_json`).
+
+    Parameters
+    ----------
+    content : Any
+        Данные ответа.
+
+    Returns
+    -------
+    bytes
+        JSON в кодировке UTF-8.
+    """
+
+    return dumps_json(content)
+
+
+def make_etag(versions: Dict[str, int], *variant) -> str:
+    """
+    Формирует ETag по версиям таблиц и параметрам запроса.
+
+    Parameters
+    ----------
+    versions : dict
+        Версии таблиц, входящих в ответ.
+    *variant
+        Дополнительные параметры, влияющие на содержимое ответа.
+
+    Returns
+    -------
+    str
+        Значение заголовка ETag (в кавычках).
+    """
+
+    key = ";".join(f"{tablename}:{version}" for tablename, version in sorted(versions.items()))
+    key += "|" + "|".join(str(value) for value in variant)
+    return '"' + hashlib.sha1(key.encode("utf-8")).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Проверяет, совпадает ли ETag ответа с одним из значений заголовка If-None-Match.
+
+    Parameters
+    ----------
+    if_none_match : str or None
+        Значение заголовка If-None-Match.
+    etag : str
+        ETag текущего ответа.
+
+    Returns
+    -------
+    bool
+        True, если клиент уже имеет актуальную версию ответа.
+    """
+
+    if not if_none_match:
+        return False
+    candidates = [value.strip() for value in if_none_match.split(",")]
+    return "*" in candidates or any(value.removeprefix("W/") == etag for value in candidates)
+
+
+def assemble(fragments: Dict[str, bytes]) -> bytes:
+    """
+    Собирает JSON-объект вида {tablename: data, ...} из сериализованных фрагментов таблиц.
+
+    Parameters
+    ----------
+    fragments : dict
+        JSON-фрагменты таблиц (в порядке вывода).
+
+    Returns
+    -------
+    bytes
+        Тело ответа.
+    """
+
+    parts = [serialize(tablename) + b":" + fragment for tablename, fragment in fragments.items()]
+    return b"{" + b",".join(parts) + b"}"
+
+
+class TableResponseCache:
+    """
+    Потокобезопасный кэш сериализованных фрагментов ответа по таблицам.
+
+    Methods
+    -------
+    get(key, version)
+        Получение фрагмента, построенного при заданной версии данных таблицы.
+    put(key, version, fragment)
+        Сохранение фрагмента.
+    """
+
+    def __init__(self):
+        self._fragments: Dict[Tuple, Tuple[int, bytes]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple, version: int) -> Optional[bytes]:
+        """
+        Parameters
+        ----------
+        key : tuple
+            Ключ фрагмента (имя таблицы и параметры запроса).
+        version : int
+            Текущая версия данных таблицы.
+
+        Returns
+        -------
+        bytes or None
+            JSON-фрагмент или None, если его нет в кэше или он построен при другой версии.
+        """
+        with self._lock:
+            cached = self._fragments.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        return None
+
+    def put(self, key: Tuple, version: int, fragment: bytes) -> None:
+        """
+        Parameters
+        ----------
+        key : tuple
+            Ключ фрагмента (имя таблицы и параметры запроса).
+        version : int
+            Версия данных таблицы, при которой построен фрагмент.
+        fragment : bytes
+            JSON-фрагмент.
+        """
+        with self._lock:
+            self._fragments[key] = (version, fragment)
+
+
+parsers_response_cache = TableResponseCache()
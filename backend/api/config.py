@@ -1,16 +1,79 @@
 """Константы конфигурации API модуля."""
 
+import os
+from ipaddress import ip_network
+
+
 class ApiConfig:
     """Конфигурация параметров API.
 
     Attributes
     ----------
     MAX_SAMPLES_FROM_PARSERS : int
-        Максимальное количество записей (точек временного ряда), извлекаемых из базы данных для отображения на фронте.
+        Количество записей (точек временного ряда), извлекаемых из базы данных для отображения на фронте по умолчанию.
+
+    MAX_SAMPLES_LIMIT : int
+        Максимальное значение параметра limit при запросе прогнозов из базы данных.
     
     MAX_FILE_SIZE : int
         Максимально допустимый размер загружаемого файла в байтах.
+
+    MAX_BATCH_FILES : int
+        Максимальное количество файлов в одном пакетном запросе на прогнозирование.
+
+    MAX_BATCH_JOBS : int
+        Максимальное количество прогнозов (пар "ряд - конфигурация модели") в одном пакетном запросе.
+
+    MAX_PENDING_JOBS : int
+        Максимальное количество незавершённых асинхронных задач прогнозирования одного воркера
+        приложения; при превышении новые задачи отклоняются с кодом 429.
+
+    JOB_RESULT_TTL : int
+        Время хранения результата асинхронной задачи прогнозирования в секундах.
+
+    JOB_STALE_TTL : int
+        Время в секундах от постановки асинхронной задачи в очередь, после которого незавершённая
+        задача считается потерянной (воркер приложения завершился аварийно) и удаляется.
+        Должно превышать время ожидания и выполнения всех задач заполненной очереди.
+
+    JOB_CLEANUP_INTERVAL : int
+        Период удаления устаревших асинхронных задач из базы данных в секундах.
+
+    JOB_RETRY_AFTER : int
+        Значение заголовка Retry-After (в секундах) при заполненной очереди задач.
+
+    SSE_QUEUE_SIZE : int
+        Размер очереди сообщений одного клиента потока обновлений прогнозов.
+
+    GZIP_MINIMUM_SIZE : int
+        Минимальный размер тела ответа в байтах, начиная с которого ответ сжимается gzip
+        (если клиент его поддерживает).
+
+    SSE_HEARTBEAT_INTERVAL : int
+        Период отправки служебных сообщений в поток обновлений прогнозов в секундах
+        (поддерживает соединение через прокси и позволяет обнаружить отключение клиента).
+
+    TRUSTED_PROXIES : tuple
+        Адреса (сети) обратных прокси, которым разрешено передавать адрес клиента в заголовке
+        X-Real-IP. Задаются через переменную окружения TRUSTED_PROXIES списком через запятую;
+        заголовок от остальных адресов игнорируется.
     """
 
     MAX_SAMPLES_FROM_PARSERS = 300
-    MAX_FILE_SIZE = 1024 * 100
\ No newline at end of file
+    MAX_SAMPLES_LIMIT = 5000
+    MAX_FILE_SIZE = 1024 * 1024 * 64
+    MAX_BATCH_FILES = 10
+    MAX_BATCH_JOBS = 50
+    MAX_PENDING_JOBS = 20
+    JOB_RESULT_TTL = 60 * 10
+    JOB_STALE_TTL = 60 * 60 * 2
+    JOB_CLEANUP_INTERVAL = 60
+    JOB_RETRY_AFTER = 5
+    SSE_QUEUE_SIZE = 100
+    SSE_HEARTBEAT_INTERVAL = 15
+    GZIP_MINIMUM_SIZE = 1024
+    TRUSTED_PROXIES = tuple(
+        ip_network(address.strip(), strict=False)
+        for address in os.getenv("TRUSTED_PROXIES", "127.0.0.1,::1").split(",")
+        if address.strip()
+    )
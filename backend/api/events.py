@@ -0,0 +1,255 @@
+"""
+Рассылка обновлений прогнозов клиентам (Server-Sent Events).
+
+Планировщик при каждом изменении таблицы прогнозов увеличивает её версию и отправляет
+уведомление Postgres (NOTIFY). Каждый воркер приложения держит одно соединение,
+подписанное на канал (LISTEN); по уведомлению он один раз читает из таблицы изменённые
+записи и рассылает одно и то же сообщение в очереди всех подключённых клиентов.
+"""
+
+import asyncio
+import select
+import threading
+import traceback
+from datetime import datetime
+from typing import Dict, Optional, Set
+
+from database import engine, get_db_session
+from database.crud import get_crud_for_table, DataVersionCRUD, TABLE_CRUD_MAPPING
+from .cache import serialize
+from .utils import format_db_forecast_series
+from logger import Logger
+
+
+logger = Logger(name='backend', log_dir='logs', log_file='backend.log').get_logger()
+
+
+def format_event(event: str, data: bytes, event_id: Optional[str] = None) -> bytes:
+    """
+    Формирует сообщение в формате text/event-stream.
+
+    Parameters
+    ----------
+    event : str
+        Тип события.
+    data : bytes
+        Данные события (JSON в одну строку).
+    event_id : str, optional
+        Идентификатор события.
+
+    Returns
+    -------
+    bytes
+        Сообщение SSE.
+    """
+
+    message = f"event: {event}\n".encode("utf-8")
+    if event_id is not None:
+        message += f"id: {event_id}\n".encode("utf-8")
+    return message + b"data: " + data + b"\n\n"
+
+
+class Subscription:
+    """
+    Подписка клиента на обновления таблиц прогнозов.
+
+    Attributes
+    ----------
+    tables : set of str
+        Таблицы, обновления которых получает клиент.
+    queue : asyncio.Queue
+        Очередь готовых сообщений SSE.
+    """
+
+    def __init__(self, tables: Set[str], queue_size: int):
+        self.tables = tables
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+
+    def push(self, message: bytes) -> None:
+        """
+        Добавляет сообщение в очередь клиента.
+
+        Если клиент не успевает читать и очередь заполнена, накопленные изменения отбрасываются
+        и клиенту отправляется событие reset: он должен заново загрузить данные целиком.
+        """
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(format_event("reset", b"{}"))
+
+
+class ForecastUpdatesBroadcaster:
+    """
+    Слушатель канала уведомлений Postgres и рассылка изменений подписчикам.
+
+    Methods
+    -------
+    start(loop)
+        Запуск потока-слушателя.
+    subscribe(tables)
+        Подписка клиента на обновления таблиц.
+    unsubscribe(subscription)
+        Отмена подписки.
+    stop()
+        Остановка потока-слушателя.
+    """
+
+    def __init__(self, queue_size: int, delta_limit: int, poll_timeout: float = 1.0, reconnect_delay: float = 5.0):
+        """
+        Parameters
+        ----------
+        queue_size : int
+            Размер очереди сообщений одного клиента.
+        delta_limit : int
+            Максимальное количество записей в одном сообщении об изменении таблицы.
+        poll_timeout : float, optional
+            Период проверки сигнала остановки в секундах.
+        reconnect_delay : float, optional
+            Пауза перед повторным подключением к БД после ошибки в секундах.
+        """
+        self.queue_size = queue_size
+        self.delta_limit = delta_limit
+        self.poll_timeout = poll_timeout
+        self.reconnect_delay = reconnect_delay
+        self._subscriptions: Set[Subscription] = set()
+        self._cursors: Dict[str, Optional[datetime]] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, loop: asyncio.AbstractEventLoop) -> None:
+        """
+        Запускает поток, слушающий канал уведомлений.
+
+        Parameters
+        ----------
+        loop : asyncio.AbstractEventLoop
+            Цикл событий приложения, в котором живут очереди клиентов.
+        """
+        self._loop = loop
+        self._thread = threading.Thread(target=self._listen, name="forecast-updates-listener", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Останавливает поток-слушатель."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.poll_timeout * 2)
+
+    def subscribe(self, tables: Set[str]) -> Subscription:
+        """
+        Подписывает клиента на обновления таблиц (вызывается из цикла событий).
+
+        Parameters
+        ----------
+        tables : set of str
+            Имена таблиц прогнозов.
+
+        Returns
+        -------
+        Subscription
+            Подписка с очередью сообщений клиента.
+        """
+        subscription = Subscription(tables, self.queue_size)
+        self._subscriptions.add(subscription)
+        logger.info(f"Новый подписчик на обновления прогнозов (подписчиков: {len(self._subscriptions)})")
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """
+        Отменяет подписку клиента (вызывается из цикла событий).
+
+        Parameters
+        ----------
+        subscription : Subscription
+            Подписка клиента.
+        """
+        self._subscriptions.discard(subscription)
+        logger.info(f"Подписчик на обновления прогнозов отключился (подписчиков: {len(self._subscriptions)})")
+
+    def _init_cursors(self) -> None:
+        session_generator = get_db_session()
+        db_session = next(session_generator)
+        try:
+            for tablename in TABLE_CRUD_MAPPING:
+                self._cursors[tablename] = get_crud_for_table(tablename).get_last_updated_at(db_session)
+        finally:
+            db_session.close()
+
+    def _build_delta(self, tablename: str, version: str) -> bytes:
+        """
+        Один раз читает изменённые с прошлого уведомления записи таблицы и формирует сообщение.
+
+        Если изменений больше, чем помещается в одно сообщение (`delta_limit`), выборка содержит
+        только последние по дате записи, поэтому вместо неполного forecast_update отправляется
+        событие forecast_reset: клиент должен заново загрузить данные таблицы целиком.
+        """
+        session_generator = get_db_session()
+        db_session = next(session_generator)
+        try:
+            crud = get_crud_for_table(tablename)
+            rows, has_more = crud.get_series(
+                db_session, limit=self.delta_limit, after_updated_at=self._cursors.get(tablename)
+            )
+            if has_more:
+                self._cursors[tablename] = crud.get_last_updated_at(db_session)
+                summary = None
+            else:
+                summary = crud.get_summary(db_session, rows[-1].id) if rows else None
+        finally:
+            db_session.close()
+
+        if has_more:
+            logger.info(f"Изменений таблицы '{tablename}' больше {self.delta_limit}, отправляется forecast_reset")
+            payload = serialize({"tablename": tablename, "version": int(version)})
+            return format_event("forecast_reset", payload, event_id=f"{tablename}:{version}")
+
+        data = format_db_forecast_series(rows, summary, has_more)
+        if data["updated_at"] is not None:
+            self._cursors[tablename] = data["updated_at"]
+        payload = serialize({"tablename": tablename, "version": int(version), "data": data})
+        return format_event("forecast_update", payload, event_id=f"{tablename}:{version}")
+
+    def _dispatch(self, tablename: str, message: bytes) -> None:
+        for subscription in list(self._subscriptions):
+            if tablename in subscription.tables:
+                subscription.push(message)
+
+    def _handle_notification(self, payload: str) -> None:
+        tablename, _, version = payload.rpartition(":")
+        if tablename not in TABLE_CRUD_MAPPING:
+            logger.warning(f"Уведомление для неизвестной таблицы: {payload}")
+            return
+        message = self._build_delta(tablename, version)
+        self._loop.call_soon_threadsafe(self._dispatch, tablename, message)
+
+    def _listen(self) -> None:
+        while not self._stop_event.is_set():
+            connection = None
+            try:
+                # Курсоры сохраняются между переподключениями: следующее сообщение
+                # включит и изменения, уведомления о которых были пропущены
+                if not self._cursors:
+                    self._init_cursors()
+                connection = engine.raw_connection()
+                dbapi_connection = connection.driver_connection
+                dbapi_connection.autocommit = True
+                with dbapi_connection.cursor() as cursor:
+                    cursor.execute(f"LISTEN {DataVersionCRUD.NOTIFY_CHANNEL}")
+                logger.info(f"Подписка на канал уведомлений '{DataVersionCRUD.NOTIFY_CHANNEL}' установлена")
+
+                while not self._stop_event.is_set():
+                    if select.select([dbapi_connection], [], [], self.poll_timeout) == ([], [], []):
+                        continue
+                    dbapi_connection.poll()
+                    while dbapi_connection.notifies:
+                        notification = dbapi_connection.notifies.pop(0)
+                        self._handle_notification(notification.payload)
+            except Exception as e:
+                logger.error(f"Ошибка слушателя уведомлений об обновлении прогнозов: {e}\n{traceback.format_exc()}")
+                self._stop_event.wait(self.reconnect_delay)
+            finally:
+                if connection is not None:
+                    connection.close()
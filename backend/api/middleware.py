@@ -0,0 +1,51 @@
+"""
+ASGI middleware сбора метрик HTTP-запросов.
+
+Время запроса измеряется до начала отправки ответа (для потоковых ответов, например SSE,
+это время до отправки заголовков). Маршрут берётся из шаблона пути (`/api/forecast/jobs/{job_id}`),
+а не из фактического URL, чтобы количество значений метки оставалось ограниченным.
+"""
+
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from metrics import HTTP_REQUEST_SECONDS
+
+
+class MetricsMiddleware:
+    """Middleware, записывающее время обработки HTTP-запросов в гистограмму по маршрутам."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started_at = time.perf_counter()
+        observed = False
+
+        def observe(status: int) -> None:
+            nonlocal observed
+            if observed:
+                return
+            observed = True
+            route = scope.get("route")
+            HTTP_REQUEST_SECONDS.labels(
+                method=scope["method"],
+                route=getattr(route, "path", "unmatched"),
+                status=str(status),
+            ).observe(time.perf_counter() - started_at)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                observe(message["status"])
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception:
+            observe(500)
+            raise
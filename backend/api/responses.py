@@ -0,0 +1,169 @@
+"""
+Сериализация ответов API.
+
+Результаты прогнозов содержат массивы NumPy (в том числе массивы дат datetime64) и временные
+ряды `TimeSeries`, поэтому сериализуются напрямую через orjson (без `jsonable_encoder`). Клиенты, передавшие в заголовке Accept тип
+application/msgpack, получают тот же ответ в формате MessagePack.
+"""
+
+from typing import Any, Dict, Optional
+
+import msgpack
+import numpy as np
+import orjson
+from fastapi import Request
+from fastapi.responses import Response
+
+from services.timeseries import TimeSeries
+
+
+MSGPACK_MEDIA_TYPES = ("application/msgpack", "application/x-msgpack", "application/vnd.msgpack")
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def _default(value: Any) -> Any:
+    """Преобразование типов, которые orjson и msgpack не сериализуют сами."""
+
+    if isinstance(value, TimeSeries):
+        return {"dates": value.dates, "endog": value.endog}
+    if isinstance(value, (np.ndarray, np.generic)) and value.dtype.kind == "M":
+        # Даты datetime64 (для msgpack) записываются в том же формате ISO 8601, что и в JSON
+        return orjson.loads(orjson.dumps(value, option=ORJSON_OPTIONS))
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not serializable")
+
+
+def dumps_json(content: Any) -> bytes:
+    """
+    Сериализует данные в JSON.
+
+    Формат совпадает со стандартным JSONResponse FastAPI (даты в ISO 8601, UTF-8 без экранирования,
+    без пробелов), но массивы NumPy, скаляры NumPy и даты сериализуются без промежуточных
+    списков Python. Значения NaN записываются как null.
+
+    Parameters
+    ----------
+    content : Any
+        Данные ответа.
+
+    Returns
+    -------
+    bytes
+        JSON в кодировке UTF-8.
+    """
+
+    return orjson.dumps(content, default=_default, option=ORJSON_OPTIONS)
+
+
+def to_jsonable(content: Any) -> Any:
+    """
+    Преобразует данные в структуру из типов JSON (например, для сохранения в столбец JSON).
+
+    Parameters
+    ----------
+    content : Any
+        Данные (в том числе с массивами NumPy и датами).
+
+    Returns
+    -------
+    Any
+        Данные из словарей, списков, строк, чисел и None.
+    """
+
+    return orjson.loads(dumps_json(content))
+
+
+def dumps_msgpack(content: Any) -> bytes:
+    """
+    Сериализует данные в MessagePack с той же структурой, что и JSON-ответ.
+
+    Parameters
+    ----------
+    content : Any
+        Данные ответа.
+
+    Returns
+    -------
+    bytes
+        Данные в формате MessagePack.
+    """
+
+    return msgpack.packb(content, default=_default, use_bin_type=True)
+
+
+class ORJSONResponse(Response):
+    """JSON-ответ, сериализуемый функцией `dumps_json`."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps_json(content)
+
+
+class MsgPackResponse(Response):
+    """Ответ в формате MessagePack, сериализуемый функцией `dumps_msgpack`."""
+
+    media_type = "application/msgpack"
+
+    def render(self, content: Any) -> bytes:
+        return dumps_msgpack(content)
+
+
+def accepts_msgpack(request: Request) -> bool:
+    """
+    Проверяет, запросил ли клиент ответ в формате MessagePack.
+
+    Parameters
+    ----------
+    request : Request
+        Объект запроса FastAPI.
+
+    Returns
+    -------
+    bool
+        True, если заголовок Accept содержит тип MessagePack с ненулевым приоритетом.
+    """
+
+    for media_range in request.headers.get("accept", "").split(","):
+        media_type, *params = [part.strip() for part in media_range.split(";")]
+        if media_type.lower() in MSGPACK_MEDIA_TYPES and "q=0" not in params:
+            return True
+    return False
+
+
+def negotiate_response(
+    request: Request,
+    content: Any,
+    status_code: int = 200,
+    headers: Optional[Dict[str, str]] = None,
+) -> Response:
+    """
+    Формирует ответ в формате, запрошенном клиентом (JSON по умолчанию или MessagePack).
+
+    Parameters
+    ----------
+    request : Request
+        Объект запроса FastAPI (используется заголовок Accept).
+    content : Any
+        Данные ответа.
+    status_code : int, optional
+        Код ответа.
+    headers : dict, optional
+        Дополнительные заголовки ответа.
+
+    Returns
+    -------
+    Response
+        Ответ ORJSONResponse или MsgPackResponse.
+    """
+
+    headers = {**(headers or {}), "Vary": "Accept"}
+    response_class = MsgPackResponse if accepts_msgpack(request) else ORJSONResponse
+    return response_class(content=content, status_code=status_code, headers=headers)
@@ -5,17 +5,24 @@ API-эндпоинты для взаимодействия с пользоват
 """
 
 from json import loads
+from typing import Dict, List, Optional, Tuple
 import traceback
 import asyncio
+from datetime import datetime
 
-from fastapi import APIRouter, File, Form, UploadFile, HTTPException, Request
+from fastapi import APIRouter, File, Form, UploadFile, HTTPException, Query, Request
+from fastapi.responses import Response, StreamingResponse
 
-from services.forecasting import forecast
-from converters import convert_to_dict
+from services.forecasting import forecast, summarize, ForecastCancelledError, ForecastTimeoutError
+from services.forecasting.config import ForecastingConfig
+from services.timeseries import TimeSeries
 from database import get_db_session
-from database.crud import get_crud_for_table, TABLE_CRUD_MAPPING
-from .utils import format_db_forecast_data, validate_file_size
+from database.crud import get_crud_for_table, model_state_crud, data_version_crud, TABLE_CRUD_MAPPING
+from .utils import format_db_forecast_series, validate_file_size, get_client_id
+from .cache import parsers_response_cache, serialize, assemble, make_etag, etag_matches
+from .responses import dumps_json, negotiate_response
 from .config import ApiConfig
+from workers import AdmissionRejectedError, ConversionRejectedError, QueueFullError, run_with_deadline
 from logger import Logger
 
 
@@ -36,6 +43,10 @@ async def forecast_endpoint(
 
     Параметры конфигурации модели и данные для прогнозирования передаются в теле запроса.
     Выполняется валидация файла, парсинг параметров, и запуск расчёта прогноза.
+    Файл преобразуется в пуле процессов преобразования, не блокируя цикл событий.
+    Расчёт допускается в пул с ограничением одновременных прогнозов по семейству модели
+    (справедливая очередь по клиентам), ограничен крайним сроком по типу модели и отменяется,
+    если клиент отключился.
 
     Parameters
     ----------
@@ -52,8 +63,15 @@ async def forecast_endpoint(
 
     Returns
     -------
-    dict
-        Результаты прогноза.
+    Response
+        Результаты прогноза в формате JSON или MessagePack (по заголовку Accept).
+
+    Raises
+    ------
+    HTTPException
+        С кодом 429 и заголовком Retry-After, если очередь прогнозов или пул преобразования
+        файлов заполнены;
+        с кодом 504, если прогноз не построен за отведённое время.
     """
     
     logger.info(f"[POST /forecast] Запрос получен. Файл: {uploadedData.filename}")
@@ -69,62 +87,458 @@ async def forecast_endpoint(
     try:
         validate_file_size(uploadedData, ApiConfig.MAX_FILE_SIZE)
         logger.debug(f"Файл прошёл проверку размера: {uploadedData.size} байт")
-        file_data_dict = convert_to_dict(file=uploadedData, settings=file_settings_dict)
+        file_data_dict = await request.app.state.conversion_pool.convert(uploadedData, file_settings_dict)
         logger.debug("Файл успешно преобразован в словарь")
+    except ConversionRejectedError as e:
+        logger.warning(f"Преобразование файла отклонено: {e}")
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(e.retry_after)})
     except Exception as e:
         logger.error(f"Ошибка при обработке файла: {e}")
         raise HTTPException(status_code=400, detail=f"Error processing file: {str(e)}")
 
     try:
-        loop = asyncio.get_event_loop()
-        response = await loop.run_in_executor(
-            request.app.state.forecasting_process_pool,
-            forecast,
-            file_data_dict,
-            selectedModel,
-            model_settings_dict,
-        )
+        async with request.app.state.forecast_admission.admit(
+            selectedModel, get_client_id(request), is_disconnected=request.is_disconnected
+        ):
+            response = await run_with_deadline(
+                request.app.state.forecasting_process_pool,
+                selectedModel,
+                forecast,
+                file_data_dict,
+                selectedModel,
+                model_settings_dict,
+                is_disconnected=request.is_disconnected,
+            )
         logger.info("Прогноз успешно построен")
+    except AdmissionRejectedError as e:
+        logger.warning(f"Прогноз не допущен к выполнению: {e}")
+        raise HTTPException(
+            status_code=429,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)},
+        )
+    except ForecastTimeoutError as e:
+        logger.error(f"Прогноз не построен за отведённое время: {e}")
+        raise HTTPException(status_code=504, detail=f"Forecast timed out: {str(e)}")
+    except ForecastCancelledError as e:
+        logger.info(f"Построение прогноза прервано: {e}")
+        raise HTTPException(status_code=499, detail="Client closed request")
     except Exception as e:
         logger.error(f"Ошибка при построении прогноза: {e}\n{traceback.format_exc()}")
         raise HTTPException(
             status_code=400, detail=f"Error creating forecast: {str(e)}"
         )
 
-    return response
+    return negotiate_response(request, response)
+
+
+@router.post("/forecast/batch")
+async def forecast_batch_endpoint(
+    request: Request,
+    jobs: str = Form(...),
+    uploadedData: List[UploadFile] = File(...),
+    fileSettings: str = Form(...),
+):
+    """
+    Обрабатывает POST-запрос на построение пакета прогнозов.
+
+    Каждый загруженный файл преобразуется один раз (файлы преобразуются параллельно в пуле
+    процессов преобразования), после чего все прогнозы пакета
+    параллельно отправляются в пул процессов. Результаты возвращаются потоком
+    в формате NDJSON (одна JSON-строка на прогноз) по мере их готовности.
+
+    Parameters
+    ----------
+    request : Request
+        Объект запроса FastAPI с доступом к состоянию приложения.
+    jobs : str
+        JSON-строка со списком прогнозов вида
+        `[{"fileIndex": 0, "selectedModel": "SARIMA", "modelSettings": {...}}, ...]`.
+        Если `fileIndex` не указан, используется первый файл.
+    uploadedData : List[UploadFile]
+        Загружаемые пользователем файлы с временными рядами.
+    fileSettings : str
+        JSON-строка с параметрами для парсинга файлов (общие для всех файлов).
+
+    Returns
+    -------
+    StreamingResponse
+        Поток JSON-строк с ключами index, fileIndex, selectedModel и result (или error).
+    """
+
+    logger.info(f"[POST /forecast/batch] Запрос получен. Файлов: {len(uploadedData)}")
+
+    try:
+        jobs_list = loads(jobs)
+        file_settings_dict = loads(fileSettings)
+        if not isinstance(jobs_list, list) or not jobs_list:
+            raise ValueError("jobs must be a non-empty list")
+        if len(jobs_list) > ApiConfig.MAX_BATCH_JOBS:
+            raise ValueError(f"Too many jobs: maximum allowed is {ApiConfig.MAX_BATCH_JOBS}")
+        if len(uploadedData) > ApiConfig.MAX_BATCH_FILES:
+            raise ValueError(f"Too many files: maximum allowed is {ApiConfig.MAX_BATCH_FILES}")
+        for job in jobs_list:
+            job.setdefault("fileIndex", 0)
+            if not 0 <= job["fileIndex"] < len(uploadedData):
+                raise ValueError(f"Invalid fileIndex: {job['fileIndex']}")
+            if "selectedModel" not in job or "modelSettings" not in job:
+                raise ValueError("Each job must contain selectedModel and modelSettings")
+    except Exception as e:
+        logger.error(f"Ошибка при разборе параметров пакета: {e}")
+        raise HTTPException(status_code=400, detail=f"Error loading batch parameters: {str(e)}")
+
+    try:
+        for uploaded_file in uploadedData:
+            validate_file_size(uploaded_file, ApiConfig.MAX_FILE_SIZE)
+        files_data = await asyncio.gather(*(
+            request.app.state.conversion_pool.convert(uploaded_file, dict(file_settings_dict))
+            for uploaded_file in uploadedData
+        ))
+        logger.debug(f"Файлы пакета успешно преобразованы: {len(files_data)}")
+    except ConversionRejectedError as e:
+        logger.warning(f"Преобразование файлов пакета отклонено: {e}")
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+    except Exception as e:
+        logger.error(f"Ошибка при обработке файла пакета: {e}")
+        raise HTTPException(status_code=400, detail=f"Error processing file: {str(e)}")
+
+    pool = request.app.state.forecasting_process_pool
+    admission = request.app.state.forecast_admission
+    client_id = get_client_id(request)
+
+    async def run_job(index: int, job: dict) -> dict:
+        item = {"index": index, "fileIndex": job["fileIndex"], "selectedModel": job["selectedModel"]}
+        try:
+            # Размер пакета уже ограничен, поэтому его прогнозы ждут слота без ограничения очереди.
+            # При отключении клиента задачи пакета отменяются вместе с потоком ответа
+            async with admission.admit(job["selectedModel"], client_id, bounded=False):
+                item["result"] = await run_with_deadline(
+                    pool,
+                    job["selectedModel"],
+                    forecast,
+                    files_data[job["fileIndex"]],
+                    job["selectedModel"],
+                    job["modelSettings"],
+                )
+        except ForecastTimeoutError as e:
+            logger.error(f"Прогноз #{index} пакета не построен за отведённое время: {e}")
+            item["error"] = f"Forecast timed out: {str(e)}"
+        except Exception as e:
+            logger.error(f"Ошибка при построении прогноза #{index} пакета: {e}\n{traceback.format_exc()}")
+            item["error"] = f"Error creating forecast: {str(e)}"
+        return item
+
+    tasks = [asyncio.ensure_future(run_job(index, job)) for index, job in enumerate(jobs_list)]
+
+    async def stream_results():
+        try:
+            for completed in asyncio.as_completed(tasks):
+                item = await completed
+                yield dumps_json(item) + b"\n"
+            logger.info(f"Пакет из {len(tasks)} прогнозов успешно обработан")
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    # Потоковые ответы не сжимаются: GZipMiddleware буферизует их до конца потока
+    return StreamingResponse(
+        stream_results(),
+        media_type="application/x-ndjson",
+        headers={"Content-Encoding": "identity"},
+    )
+
+
+@router.post("/forecast/jobs", status_code=202)
+async def forecast_job_create_endpoint(
+    request: Request,
+    selectedModel: str = Form(...),
+    modelSettings: str = Form(...),
+    uploadedData: UploadFile = File(...),
+    fileSettings: str = Form(...),
+):
+    """
+    Обрабатывает POST-запрос на постановку прогноза в очередь.
+
+    Параметры и файл проверяются сразу, а сам прогноз строится в фоне; результат
+    запрашивается по идентификатору задачи через `GET /forecast/jobs/{job_id}`.
+
+    Parameters
+    ----------
+    request : Request
+        Объект запроса FastAPI с доступом к состоянию приложения.
+    selectedModel : str
+        Имя выбранной модели прогнозирования.
+    modelSettings : str
+        JSON-строка с параметрами модели.
+    uploadedData : UploadFile
+        Загружаемый пользователем файл с временным рядом.
+    fileSettings : str
+        JSON-строка с параметрами для парсинга файла.
+
+    Returns
+    -------
+    dict
+        Идентификатор и статус задачи.
+
+    Raises
+    ------
+    HTTPException
+        С кодом 429 и заголовком Retry-After, если очередь задач, очередь семейства модели
+        в контроле допуска или пул преобразования файлов заполнены.
+    """
+
+    logger.info(f"[POST /forecast/jobs] Запрос получен. Файл: {uploadedData.filename}")
+
+    try:
+        file_settings_dict = loads(fileSettings)
+        model_settings_dict = loads(modelSettings)
+    except Exception as e:
+        logger.error(f"Ошибка при разборе параметров: {e}")
+        raise HTTPException(status_code=400, detail=f"Error loading file: {str(e)}")
+
+    try:
+        validate_file_size(uploadedData, ApiConfig.MAX_FILE_SIZE)
+        file_data_dict = await request.app.state.conversion_pool.convert(uploadedData, file_settings_dict)
+    except ConversionRejectedError as e:
+        logger.warning(f"Преобразование файла отклонено: {e}")
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+    except Exception as e:
+        logger.error(f"Ошибка при обработке файла: {e}")
+        raise HTTPException(status_code=400, detail=f"Error processing file: {str(e)}")
+
+    try:
+        job_id = await request.app.state.forecast_jobs.submit(
+            selectedModel, get_client_id(request), forecast, file_data_dict, selectedModel, model_settings_dict
+        )
+    except QueueFullError as e:
+        logger.warning(f"Задача прогнозирования отклонена: {e}")
+        raise HTTPException(
+            status_code=429,
+            detail=str(e),
+            headers={"Retry-After": str(ApiConfig.JOB_RETRY_AFTER)},
+        )
+    except AdmissionRejectedError as e:
+        logger.warning(f"Задача прогнозирования не допущена к выполнению: {e}")
+        raise HTTPException(
+            status_code=429,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)},
+        )
+
+    return {"id": job_id, "status": "queued"}
+
+
+@router.get("/forecast/jobs/{job_id}")
+def forecast_job_status_endpoint(request: Request, job_id: str):
+    """
+    Обрабатывает GET-запрос на получение статуса и результата задачи прогнозирования.
+
+    Parameters
+    ----------
+    request : Request
+        Объект запроса FastAPI с доступом к состоянию приложения.
+    job_id : str
+        Идентификатор задачи.
+
+    Returns
+    -------
+    dict
+        Статус задачи ("queued", "running", "done" или "failed"), результат прогноза
+        (для "done") или текст ошибки (для "failed").
+    """
+
+    try:
+        job = request.app.state.forecast_jobs.get(job_id)
+    except Exception as e:
+        logger.error(f"Ошибка при извлечении задачи из БД: {e}\n{traceback.format_exc()}")
+        raise HTTPException(status_code=400, detail=f"Error fetching the data from DB: {str(e)}")
+
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job '{job_id}' not found or expired")
+    return negotiate_response(request, job)
+
+
+@router.get("/forecast/admission-stats")
+def forecast_admission_stats_endpoint(request: Request):
+    """
+    Обрабатывает GET-запрос на получение загрузки и глубины очередей допуска прогнозов.
+
+    Значения относятся к данному воркеру приложения.
+
+    Parameters
+    ----------
+    request : Request
+        Объект запроса FastAPI с доступом к состоянию приложения.
+
+    Returns
+    -------
+    dict
+        Для каждого семейства моделей: количество выполняемых и ожидающих прогнозов,
+        их ограничения, количество клиентов в очереди и средняя длительность прогноза.
+    """
+
+    return request.app.state.forecast_admission.stats()
+
+
+@router.get("/forecast/cache-stats")
+def forecast_cache_stats_endpoint(request: Request):
+    """
+    Обрабатывает GET-запрос на получение статистики кэша обученных моделей.
+
+    Счётчики попаданий и промахов общие для всех процессов пула прогнозирования
+    данного воркера приложения.
+
+    Parameters
+    ----------
+    request : Request
+        Объект запроса FastAPI с доступом к состоянию приложения.
+
+    Returns
+    -------
+    dict
+        Количество попаданий, промахов, доля попаданий и параметры кэша.
+    """
+
+    pool = request.app.state.forecasting_process_pool
+    hits = pool.cache_hits.value
+    misses = pool.cache_misses.value
+    total = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": round(hits / total, 4) if total else 0.0,
+        "max_size_per_worker": ForecastingConfig.FITTED_CACHE_MAX_SIZE,
+        "ttl": ForecastingConfig.FITTED_CACHE_TTL,
+    }
+
+
+def _parse_tables(tables: Optional[List[str]]) -> List[str]:
+    """
+    Разбирает параметр запроса tables (`?tables=a&tables=b` или `?tables=a,b`).
+
+    Raises
+    ------
+    HTTPException
+        С кодом 400, если указаны неизвестные таблицы.
+    """
+
+    if not tables:
+        return list(TABLE_CRUD_MAPPING.keys())
+
+    forecast_tables = list(dict.fromkeys(
+        tablename.strip() for value in tables for tablename in value.split(",") if tablename.strip()
+    ))
+    unknown_tables = [tablename for tablename in forecast_tables if tablename not in TABLE_CRUD_MAPPING]
+    if unknown_tables:
+        raise HTTPException(status_code=400, detail=f"Unknown tables: {', '.join(unknown_tables)}")
+    return forecast_tables
+
+
+def _get_table_versions(tablenames: List[str]) -> Dict[str, int]:
+    """Читает версии данных таблиц прогнозов в отдельной сессии."""
+
+    session_generator = get_db_session()
+    db_session = next(session_generator)
+    try:
+        return data_version_crud.get_versions(db_session, tablenames)
+    finally:
+        db_session.close()
+
+
+def _load_table_fragment(tablename: str, version: int, limit: int, filters: Dict) -> bytes:
+    """
+    Загружает данные одной таблицы в отдельной сессии и сериализует фрагмент ответа.
+
+    Выполняется в пуле потоков, поэтому запросы к разным таблицам идут параллельно.
+    Фрагменты запросов без фильтров кэшируются до изменения версии данных таблицы.
+    """
+
+    session_generator = get_db_session()
+    db_session = next(session_generator)
+    try:
+        crud = get_crud_for_table(tablename)
+        rows, has_more = crud.get_series(db_session, limit=limit, **filters)
+        summary = crud.get_summary(db_session, rows[-1].id) if rows else None
+        logger.debug(f"{len(rows)} записей загружено из таблицы '{tablename}'")
+        fragment = serialize(format_db_forecast_series(rows, summary, has_more))
+    finally:
+        db_session.close()
+
+    if not any(value is not None for value in filters.values()):
+        parsers_response_cache.put((tablename, limit), version, fragment)
+    return fragment
 
 
 @router.get("/forecasts-from-parsers")
-def forecasts_from_parsers_endpoint():
+async def forecasts_from_parsers_endpoint(
+    request: Request,
+    tables: Optional[List[str]] = Query(None),
+    since: Optional[datetime] = Query(None),
+    until: Optional[datetime] = Query(None),
+    limit: int = Query(ApiConfig.MAX_SAMPLES_FROM_PARSERS, ge=1, le=ApiConfig.MAX_SAMPLES_LIMIT),
+    after_updated_at: Optional[datetime] = Query(None),
+):
     """
     Обрабатывает GET-запрос для получения сохранённых прогнозов из БД.
 
-    Возвращает данные из всех таблиц, соответствующих источникам, ограничивая
-    количество записей значением из файла конфигурации.
+    Возвращает данные из всех (или только запрошенных) таблиц, соответствующих источникам.
+    По умолчанию для каждой таблицы возвращаются последние `limit` записей; выборка
+    постраничная (keyset-пагинация по дате) и может быть ограничена записями, изменёнными
+    после предыдущего опроса. Ответы без фильтров сериализуются один раз для каждой версии
+    данных таблицы, а устаревшие таблицы загружаются параллельно, каждая в своей сессии.
+    Ответ снабжается ETag, и если он совпадает с If-None-Match запроса, возвращается 304 без тела.
+
+    Parameters
+    ----------
+    request : Request
+        Объект запроса FastAPI (используется заголовок If-None-Match).
+    tables : List[str], optional
+        Имена таблиц (`?tables=a&tables=b` или `?tables=a,b`); по умолчанию все таблицы
+        из TABLE_CRUD_MAPPING.
+    since : datetime, optional
+        Вернуть первые `limit` записей с датой строго после указанной (следующая страница).
+    until : datetime, optional
+        Вернуть записи с датой строго до указанной (без `since` — последние `limit` таких записей).
+    limit : int, optional
+        Количество записей на таблицу (по умолчанию MAX_SAMPLES_FROM_PARSERS).
+    after_updated_at : datetime, optional
+        Вернуть только записи, созданные или изменённые после указанного момента
+        (значение updated_at из ответа на предыдущий запрос).
 
     Returns
     -------
-    dict
-        Словарь с результатами прогнозов из всех таблиц, включённых в TABLE_CRUD_MAPPING.
+    Response
+        JSON со словарём результатов прогнозов по таблицам либо пустой ответ 304.
     """
 
     logger.info("[GET /forecasts-from-parsers] Запрос на получение прогнозов из БД")
-    session_generator = get_db_session()
+    filters = {"since": since, "until": until, "after_updated_at": after_updated_at}
+
+    forecast_tables = _parse_tables(tables)
 
     try:
-        db_session = next(session_generator)
-        forecast_tables = TABLE_CRUD_MAPPING.keys()
-        response = {}
-
-        for tablename in forecast_tables:
-            crud = get_crud_for_table(tablename)
-            instances = crud.get_all(
-                db_session, limit=ApiConfig.MAX_SAMPLES_FROM_PARSERS
-            )
-            logger.debug(f"{len(instances)} записей загружено из таблицы '{tablename}'")
-            response[tablename] = format_db_forecast_data(instances)
+        versions = await asyncio.to_thread(_get_table_versions, forecast_tables)
 
-        logger.info("Прогнозы для данных из парсеров успешно получены")
+        etag = make_etag(versions, limit, since, until, after_updated_at)
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            logger.info("Прогнозы для данных из парсеров не изменились (304)")
+            return Response(status_code=304, headers=headers)
+
+        fragments = {
+            tablename: parsers_response_cache.get((tablename, limit), versions[tablename])
+            if not any(value is not None for value in filters.values()) else None
+            for tablename in forecast_tables
+        }
+        stale_tables = [tablename for tablename, fragment in fragments.items() if fragment is None]
+        loaded = await asyncio.gather(*(
+            asyncio.to_thread(_load_table_fragment, tablename, versions[tablename], limit, filters)
+            for tablename in stale_tables
+        ))
+        fragments.update(zip(stale_tables, loaded))
+        logger.info(
+            f"Прогнозы для данных из парсеров успешно получены (загружено таблиц: {len(stale_tables)})"
+        )
     except Exception as e:
         logger.error(
             f"Ошибка при извлечении данных из БД: {e}\n{traceback.format_exc()}"
@@ -132,7 +546,138 @@ def forecasts_from_parsers_endpoint():
         raise HTTPException(
             status_code=400, detail=f"Error fetching the data from DB: {str(e)}"
         )
+
+    return Response(content=assemble(fragments), media_type="application/json", headers=headers)
+
+
+@router.get("/forecasts-from-parsers/events")
+async def forecasts_from_parsers_events_endpoint(request: Request, tables: Optional[List[str]] = Query(None)):
+    """
+    Обрабатывает GET-запрос на подписку на обновления прогнозов из БД (Server-Sent Events).
+
+    После каждой фиксации изменений планировщиком клиенту отправляется событие forecast_update
+    с изменёнными записями таблицы в формате ответа `/forecasts-from-parsers`
+    (`{"tablename": ..., "version": ..., "data": {...}}`). Если изменённых записей больше,
+    чем помещается в одно событие, вместо него отправляется forecast_reset
+    (`{"tablename": ..., "version": ...}`): клиент должен заново загрузить данные этой таблицы.
+    Событие reset означает, что клиент пропустил часть изменений и должен заново загрузить
+    данные целиком.
+
+    Parameters
+    ----------
+    request : Request
+        Объект запроса FastAPI с доступом к состоянию приложения.
+    tables : List[str], optional
+        Имена таблиц (`?tables=a&tables=b` или `?tables=a,b`); по умолчанию все таблицы
+        из TABLE_CRUD_MAPPING.
+
+    Returns
+    -------
+    StreamingResponse
+        Поток событий в формате text/event-stream.
+    """
+
+    logger.info("[GET /forecasts-from-parsers/events] Подписка на обновления прогнозов")
+    forecast_tables = set(_parse_tables(tables))
+    broadcaster = request.app.state.forecast_updates
+    subscription = broadcaster.subscribe(forecast_tables)
+
+    async def stream_events():
+        try:
+            yield b": connected\n\n"
+            while not await request.is_disconnected():
+                try:
+                    yield await asyncio.wait_for(subscription.queue.get(), timeout=ApiConfig.SSE_HEARTBEAT_INTERVAL)
+                except asyncio.TimeoutError:
+                    yield b": heartbeat\n\n"
+        finally:
+            broadcaster.unsubscribe(subscription)
+
+    return StreamingResponse(
+        stream_events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no", "Content-Encoding": "identity"},
+    )
+
+
+def _load_model_state(tablename: str) -> Optional[Tuple[TimeSeries, str, Dict, Dict, datetime]]:
+    """
+    Загружает сохранённое состояние модели таблицы и окно наблюдений в отдельной сессии.
+
+    Выполняется в пуле потоков, чтобы синхронные запросы к БД не блокировали цикл событий.
+    Возвращает ряд наблюдений, тип модели, её настройки, параметры и время обновления,
+    либо None, если обученная модель для таблицы не сохранена.
+    """
+
+    session_generator = get_db_session()
+    db_session = next(session_generator)
+    try:
+        crud = get_crud_for_table(tablename)
+        model_state = model_state_crud.get_by_tablename(db_session, tablename)
+        if model_state is None or model_state.params is None or model_state.window_start is None:
+            return None
+
+        observations = (
+            db_session.query(crud.model.date, crud.model.endog)
+            .filter(crud.model.endog.isnot(None))
+            .filter(crud.model.date >= model_state.window_start)
+            .filter(crud.model.date <= model_state.window_end)
+            .order_by(crud.model.date)
+            .all()
+        )
+        data = TimeSeries(
+            [row.endog for row in observations],
+            [row.date for row in observations],
+        )
+        return data, model_state.model_type, model_state.settings, model_state.params, model_state.updated_at
     finally:
         db_session.close()
 
-    return response
+
+@router.get("/forecasts-from-parsers/{tablename}/summary")
+async def forecast_summary_endpoint(request: Request, tablename: str):
+    """
+    Обрабатывает GET-запрос на получение полного саммари последнего прогноза из БД.
+
+    Планировщик может сохранять облегчённое саммари; полное саммари строится по запросу
+    из сохранённых параметров модели и окна наблюдений без переобучения.
+
+    Parameters
+    ----------
+    request : Request
+        Объект запроса FastAPI с доступом к состоянию приложения.
+    tablename : str
+        Имя таблицы прогнозов.
+
+    Returns
+    -------
+    dict
+        Словарь с ключами tablename, summary и last_update.
+    """
+
+    logger.info(f"[GET /forecasts-from-parsers/{tablename}/summary] Запрос полного саммари")
+
+    try:
+        model_state = await asyncio.to_thread(_load_model_state, tablename)
+    except Exception as e:
+        logger.error(f"Ошибка при извлечении данных из БД: {e}\n{traceback.format_exc()}")
+        raise HTTPException(status_code=400, detail=f"Error fetching the data from DB: {str(e)}")
+    if model_state is None:
+        raise HTTPException(status_code=404, detail=f"No fitted model stored for table '{tablename}'")
+    data, model_type, settings, params, last_update = model_state
+
+    try:
+        loop = asyncio.get_event_loop()
+        summary = await loop.run_in_executor(
+            request.app.state.forecasting_process_pool,
+            summarize,
+            data,
+            model_type,
+            settings,
+            params,
+        )
+    except Exception as e:
+        logger.error(f"Ошибка при построении саммари: {e}\n{traceback.format_exc()}")
+        raise HTTPException(status_code=400, detail=f"Error creating summary: {str(e)}")
+
+    return {"tablename": tablename, "summary": summary, "last_update": last_update}
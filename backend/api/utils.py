@@ -1,12 +1,16 @@
 """
 Утилиты для обработки данных и валидации в API.
 
-Содержит функции для форматирования результатов из базы данных и проверки размера загружаемых файлов.
+Содержит функции для форматирования результатов из базы данных, проверки размера загружаемых файлов
+и определения клиента запроса.
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Sequence
 from datetime import datetime
-from fastapi import UploadFile
+from ipaddress import ip_address
+from fastapi import Request, UploadFile
+
+from .config import ApiConfig
 
 
 def format_db_forecast_data(instances: list) -> Dict[str, Any]:
@@ -57,6 +61,51 @@ def format_db_forecast_data(instances: list) -> Dict[str, Any]:
     }
 
 
+def format_db_forecast_series(rows: List[Sequence], summary: Optional[str], has_more: bool = False) -> Dict[str, Any]:
+    """
+    Преобразует записи прогноза из БД, прочитанные по столбцам, в формат API-ответа.
+
+    Ответ совпадает с `format_db_forecast_data`, но строится по столбцам из кортежей,
+    уже отсортированных по дате, без создания ORM-объектов и повторной сортировки.
+
+    Parameters
+    ----------
+    rows : list
+        Кортежи (id, date, endog, predict, ci_low, ci_up, conf_level, absolute_error, created_at,
+        updated_at), отсортированные по дате (см. `ForecastCRUD.get_series`).
+    summary : str or None
+        Саммари модели из последней записи.
+    has_more : bool, optional
+        Есть ли за пределами выборки ещё записи (для постраничной загрузки).
+
+    Returns
+    -------
+    dict
+        Словарь с информацией о прогнозе, пригодный для обработки на фронтенде. Помимо полей
+        `format_db_forecast_data` содержит has_more и updated_at — момент последнего изменения
+        записей выборки (значение для параметра after_updated_at следующего запроса).
+    """
+
+    if not rows:
+        return {**format_db_forecast_data([]), "has_more": has_more, "updated_at": None}
+
+    _, dates, endog, predict, ci_low, ci_up, _, absolute_error, _, updated_at = zip(*rows)
+    last_row = rows[-1]
+
+    return {
+        "summary": summary or "",
+        "full_dates": list(dates),
+        "endog": list(endog),
+        "confidence_intervals": [list(interval) for interval in zip(ci_low, ci_up)],
+        "confidence_level": last_row[6],
+        "prediction": list(predict),
+        "absolute_error": list(absolute_error),
+        "last_update": last_row[8],
+        "has_more": has_more,
+        "updated_at": max((value for value in updated_at if value is not None), default=None),
+    }
+
+
 def validate_file_size(uploaded_file: UploadFile, max_size):
     """
     Проверяет, не превышает ли размер загруженного файла допустимый предел.
@@ -79,3 +128,39 @@ def validate_file_size(uploaded_file: UploadFile, max_size):
             f"File '{uploaded_file.filename}' is too large: {uploaded_file.size / 1024:.2f} KB. "
             f"Maximum allowed size is {max_size / 1024:.2f} KB.",
         )
+
+
+def get_client_id(request: Request) -> str:
+    """
+    Определяет клиента запроса для справедливого распределения ресурсов между пользователями.
+
+    За nginx фронтенда адрес клиента берётся из заголовка X-Real-IP, который выставляет прокси.
+    Заголовку доверяют, только если соединение установлено с адреса доверенного прокси
+    (`ApiConfig.TRUSTED_PROXIES`); в остальных случаях используется адрес соединения,
+    чтобы клиент не мог выдать себя за другого.
+
+    Parameters
+    ----------
+    request : Request
+        Объект запроса FastAPI.
+
+    Returns
+    -------
+    str
+        Идентификатор клиента (IP-адрес).
+    """
+
+    if request.client is None:
+        return "unknown"
+    real_ip = request.headers.get("x-real-ip")
+    if real_ip and _is_trusted_proxy(request.client.host):
+        return real_ip.strip()
+    return request.client.host
+
+
+def _is_trusted_proxy(host: str) -> bool:
+    try:
+        address = ip_address(host)
+    except ValueError:
+        return False
+    return any(address in network for network in ApiConfig.TRUSTED_PROXIES)
@@ -1,14 +1,18 @@
 """
 Инициализация модуля преобразования данных.
 
-Определяет функцию-обёртку для выбора соответствующего конвертера (CSV или Excel)
-в зависимости от формата загружаемого файла.
+Определяет функцию-обёртку для выбора соответствующего конвертера (CSV, Excel, Parquet или Arrow IPC)
+в зависимости от формата загружаемого файла, а также функцию преобразования файла,
+сохранённого на диск, для выполнения в пуле процессов преобразования.
 """
 
 from starlette.datastructures import UploadFile
 from .excel_to_dict import excel_to_dict
 from .csv_to_dict import csv_to_dict
+from .arrow_to_dict import arrow_to_dict, parquet_to_dict
 from logger import Logger
+from metrics import FILE_CONVERSION_SECONDS
+from services.timeseries import TimeSeries
 
 
 logger = Logger(
@@ -16,12 +20,13 @@ logger = Logger(
 ).get_logger()
 
 
-def convert_to_dict(file: UploadFile, settings: dict):
+def convert_to_dict(file: UploadFile, settings: dict) -> TimeSeries:
     """
-    Преобразует загружаемый файл в словарь на основе его формата.
+    Преобразует загружаемый файл во временной ряд на основе его формата.
 
-    Вызывает соответствующую функцию преобразования для файлов CSV или Excel,
-    в зависимости от расширения файла. Также преобразует параметры в нужный формат.
+    Вызывает соответствующую функцию преобразования для файлов CSV, Excel, Parquet
+    или Arrow IPC (Feather) в зависимости от расширения файла. Также преобразует параметры
+    в нужный формат.
 
     Parameters
     ----------
@@ -32,8 +37,8 @@ def convert_to_dict(file: UploadFile, settings: dict):
 
     Returns
     -------
-    dict
-        Словарь, содержащий данные из файла.
+    TimeSeries
+        Временной ряд из файла.
 
     Raises
     ------
@@ -44,13 +49,51 @@ def convert_to_dict(file: UploadFile, settings: dict):
     if file.filename.endswith(".csv"):
         settings["delimiter"] = settings.pop("csvDelimiter")
         settings["date_format"] = settings.pop("dateFormat")
-        result = csv_to_dict(file, **settings)
-        logger.info("CSV-файл успешно преобразован в словарь.")
+        with FILE_CONVERSION_SECONDS.labels(format="csv").time():
+            result = csv_to_dict(file, **settings)
+        logger.info("CSV-файл успешно преобразован во временной ряд.")
         return result
     elif file.filename.endswith(".xlsx"):
-        result = excel_to_dict(file)
-        logger.info("Excel-файл успешно преобразован в словарь.")
+        with FILE_CONVERSION_SECONDS.labels(format="xlsx").time():
+            result = excel_to_dict(file, date_format=settings.get("dateFormat", "auto"))
+        logger.info("Excel-файл успешно преобразован во временной ряд.")
+        return result
+    elif file.filename.endswith(".parquet"):
+        with FILE_CONVERSION_SECONDS.labels(format="parquet").time():
+            result = parquet_to_dict(file, date_format=settings.get("dateFormat", "auto"))
+        logger.info("Parquet-файл успешно преобразован во временной ряд.")
+        return result
+    elif file.filename.endswith((".feather", ".arrow")):
+        with FILE_CONVERSION_SECONDS.labels(format="arrow").time():
+            result = arrow_to_dict(file, date_format=settings.get("dateFormat", "auto"))
+        logger.info("Файл Arrow IPC успешно преобразован во временной ряд.")
         return result
     else:
         logger.error(f"Неподдерживаемый формат файла: {file.filename}")
-        raise ValueError("Файл должен быть в формате CSV или Excel (.xlsx)")
+        raise ValueError("Файл должен быть в формате CSV, Excel (.xlsx), Parquet или Arrow IPC (.feather, .arrow)")
+
+
+def convert_file(path: str, filename: str, settings: dict) -> TimeSeries:
+    """
+    Преобразует сохранённый на диск загруженный файл во временной ряд.
+
+    Выполняется в процессе пула преобразования: файл читается с диска потоково,
+    а формат определяется по исходному имени файла.
+
+    Parameters
+    ----------
+    path : str
+        Путь к сохранённой копии загруженного файла.
+    filename : str
+        Исходное имя загруженного файла.
+    settings : dict
+        Параметры преобразования (см. `convert_to_dict`).
+
+    Returns
+    -------
+    TimeSeries
+        Временной ряд из файла.
+    """
+
+    with open(path, "rb") as f:
+        return convert_to_dict(UploadFile(file=f, filename=filename), settings)
@@ -0,0 +1,164 @@
+"""
+Преобразование файлов Parquet и Arrow IPC (Feather) во внутреннее словарное представление.
+
+Модуль содержит функции, конвертирующие содержимое колоночных файлов во временной ряд (`TimeSeries`),
+пригодный для дальнейшего анализа и построения прогнозов.
+
+Как и для CSV и Excel, ряд строится по столбцу "dates" (если он есть) и первому столбцу значений.
+Из файла читаются только эти столбцы; значения float64 без пропусков и даты-метки времени
+передаются в ряд без поэлементного разбора, а для файлов Arrow IPC — без копирования буферов
+(файл на диске отображается в память).
+"""
+
+import os
+from typing import List, Union
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from starlette.datastructures import UploadFile
+
+from services.timeseries import TimeSeries
+from .csv_to_dict import parse_dates
+from .utils import validate_rows_count
+from .config import ConvertersConfig
+
+
+def _open_source(file: UploadFile) -> Union[pa.NativeFile, object]:
+    """Отображает в память файл, сохранённый на диск, или возвращает файловый объект как есть."""
+    file.file.seek(0)
+    path = getattr(file.file, "name", None)
+    if isinstance(path, str) and os.path.isfile(path):
+        return pa.memory_map(path)
+    return file.file
+
+
+def _select_columns(names: List[str]) -> List[str]:
+    """Возвращает читаемые столбцы: ["dates", <значения>] или [<значения>] для ряда без дат."""
+    # Служебные столбцы индекса, которые pandas добавляет при сохранении DataFrame
+    names = [name for name in names if not name.startswith("__index_level_")]
+    use_index = "dates" not in names
+    value_column = names[0] if use_index and names else next((name for name in names if name != "dates"), None)
+    if value_column is None:
+        raise ValueError("File must contain a column with values")
+    return [value_column] if use_index else ["dates", value_column]
+
+
+def _column_values(column: pa.ChunkedArray, name: str) -> np.ndarray:
+    """Значения ряда в float64 (без копирования для столбца float64 без пропусков из одного блока)."""
+    if not (pa.types.is_integer(column.type) or pa.types.is_floating(column.type) or pa.types.is_decimal(column.type)):
+        raise ValueError(f"Column '{name}' must contain numeric values")
+    if column.null_count:
+        raise ValueError(f"Column '{name}' contains empty or non-numeric values")
+    if not pa.types.is_float64(column.type):
+        column = column.cast(pa.float64())
+    endog = column.to_numpy()
+    if np.isnan(endog).any():
+        raise ValueError(f"Column '{name}' contains empty or non-numeric values")
+    return endog
+
+
+def _column_dates(column: pa.ChunkedArray, date_format: str) -> Union[np.ndarray, pd.DatetimeIndex]:
+    """Даты ряда: метки времени и даты приводятся к datetime64[ns], строки разбираются по формату."""
+    if column.null_count:
+        raise ValueError("Column 'dates' contains empty values")
+    if pa.types.is_timestamp(column.type) or pa.types.is_date(column.type):
+        # Метки времени с часовым поясом приводятся к UTC, как и даты ISO 8601 со смещением в CSV
+        return column.cast(pa.timestamp("ns")).to_numpy()
+    if pa.types.is_string(column.type) or pa.types.is_large_string(column.type):
+        return parse_dates(column.to_pandas(), date_format)
+    raise ValueError("Column 'dates' must contain dates or strings")
+
+
+def _table_to_series(table: pa.Table, columns: List[str], date_format: str) -> TimeSeries:
+    validate_rows_count(table.num_rows, ConvertersConfig.MAX_FILE_ROWS)
+    endog = _column_values(table.column(columns[-1]), columns[-1])
+    if len(columns) == 1:
+        return TimeSeries(endog)
+    return TimeSeries(endog, _column_dates(table.column("dates"), date_format))
+
+
+def parquet_to_dict(file: UploadFile, date_format: str = "auto") -> TimeSeries:
+    """
+    Конвертирует загруженный Parquet-файл во временной ряд с данными и, при наличии, датами.
+
+    Parameters
+    ----------
+    file : UploadFile
+        Загруженный Parquet-файл.
+
+    date_format : str, optional
+        Формат строковых дат в столбце "dates" (см. `csv_to_dict`). Для столбца с типом
+        даты или метки времени не используется.
+
+    Returns
+    -------
+    TimeSeries
+        Значения временного ряда и даты (если столбец дат присутствует).
+
+    Raises
+    ------
+    ValueError
+        Если файл содержит больше строк, чем разрешено, или нечисловые/пропущенные значения.
+    """
+
+    parquet = pq.ParquetFile(_open_source(file))
+    columns = _select_columns(parquet.schema_arrow.names)
+    # Количество строк известно из метаданных файла, поэтому превышение обнаруживается до чтения данных
+    validate_rows_count(parquet.metadata.num_rows, ConvertersConfig.MAX_FILE_ROWS)
+    table = parquet.read(columns=columns)
+    file.file.seek(0)
+    return _table_to_series(table, columns, date_format)
+
+
+def arrow_to_dict(file: UploadFile, date_format: str = "auto") -> TimeSeries:
+    """
+    Конвертирует загруженный файл Arrow IPC (Feather v2, файловый или потоковый формат)
+    во временной ряд с данными и, при наличии, датами.
+
+    Parameters
+    ----------
+    file : UploadFile
+        Загруженный файл Arrow IPC.
+
+    date_format : str, optional
+        Формат строковых дат в столбце "dates" (см. `csv_to_dict`). Для столбца с типом
+        даты или метки времени не используется.
+
+    Returns
+    -------
+    TimeSeries
+        Значения временного ряда и даты (если столбец дат присутствует).
+
+    Raises
+    ------
+    ValueError
+        Если файл не в формате Arrow IPC, содержит больше строк, чем разрешено,
+        или нечисловые/пропущенные значения.
+    """
+
+    source = _open_source(file)
+    try:
+        reader = pa.ipc.open_file(source)
+        batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+    except pa.ArrowInvalid:
+        source.seek(0)
+        try:
+            reader = pa.ipc.open_stream(source)
+        except pa.ArrowInvalid:
+            raise ValueError("File is not in Arrow IPC (Feather v2) format")
+        batches = reader
+
+    columns = _select_columns(reader.schema.names)
+    selected = []
+    rows = 0
+    for batch in batches:
+        rows += batch.num_rows
+        # Чтение прерывается, как только превышено допустимое количество строк
+        validate_rows_count(rows, ConvertersConfig.MAX_FILE_ROWS)
+        selected.append(batch.select(columns))
+    file.file.seek(0)
+
+    schema = pa.schema([reader.schema.field(name) for name in columns])
+    return _table_to_series(pa.Table.from_batches(selected, schema=schema), columns, date_format)
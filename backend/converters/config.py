@@ -1,7 +1,7 @@
 """
 Конфигурация для модуля преобразования данных.
 
-Содержит настройки, определяющие ограничения на размер файлов и правила обработки CSV-файлов.
+Содержит настройки, определяющие ограничения на размер файлов и правила обработки CSV и Excel-файлов.
 """
 
 
@@ -16,12 +16,26 @@ class ConvertersConfig:
     ----------
     MAX_FILE_ROWS : int
         Максимальное количество строк в CSV/Excel файле.
+    CSV_ENCODING : str
+        Кодировка CSV-файлов (UTF-8, допускается BOM).
+    EXCEL_CHUNK_ROWS : int
+        Количество строк Excel-файла, значения и даты которых преобразуются в массивы за один раз.
+    DATE_FORMATS : dict
+        Соответствие поддерживаемых форматов дат форматам strftime.
     CSV_DELIMITERS : list of str
         Допустимые разделители для CSV (для автоопределения).
     CSV_DEFAULT_DELIMETER : str
         Разделитель по умолчанию, если не удалось определить разделитель автоматически.
     """
 
-    MAX_FILE_ROWS = 500
+    MAX_FILE_ROWS = 2_000_000
+    CSV_ENCODING = "utf-8-sig"
+    EXCEL_CHUNK_ROWS = 16_384
+    DATE_FORMATS = {
+        "YYYY-MM-DD": "%Y-%m-%d",
+        "DD.MM.YYYY": "%d.%m.%Y",
+        "MM/DD/YYYY": "%m/%d/%Y",
+        "DD/MM/YYYY": "%d/%m/%Y",
+    }
     CSV_DELIMITERS = [",", "\t", ";", " "]
     CSV_DEFAULT_DELIMETER = ","
@@ -1,21 +1,68 @@
 """
 Преобразование CSV-файлов во внутреннее словарное представление.
 
-Модуль содержит функцию, конвертирующую содержимое CSV-файла в структуру, 
-пригодную для дальнейшего анализа и построения прогнозов.
+Модуль содержит функцию, конвертирующую содержимое CSV-файла во временной ряд (`TimeSeries`),
+пригодный для дальнейшего анализа и построения прогнозов.
+
+Файл читается за один проход C-парсером pandas: значения сразу разбираются в массив float64,
+а даты — в datetime64 по один раз определённому формату, без цикла Python по строкам.
 """
 
 import csv
-from io import StringIO
+from typing import List, Tuple
+
+import numpy as np
+import pandas as pd
 from starlette.datastructures import UploadFile
-from datetime import datetime
-from .utils import detect_date_format, detect_delimiter, validate_csv_size
+
+from services.timeseries import TimeSeries
+from .utils import detect_date_format, detect_delimiter, validate_rows_count
 from .config import ConvertersConfig
 
 
-def csv_to_dict(file: UploadFile, delimiter: str = "auto", date_format: str = "auto") -> dict:
+def _read_header(file: UploadFile, delimiter: str) -> Tuple[str, List[str]]:
+    """Читает первую строку файла и определяет разделитель (если он не задан) и имена столбцов."""
+    file.file.seek(0)
+    first_line = file.file.readline().decode(ConvertersConfig.CSV_ENCODING).rstrip("\r\n")
+    file.file.seek(0)
+
+    if delimiter == "auto":
+        delimiter = detect_delimiter(first_line, ConvertersConfig.CSV_DELIMITERS, ConvertersConfig.CSV_DEFAULT_DELIMETER)
+    columns = next(csv.reader([first_line], delimiter=delimiter), [])
+    if not columns:
+        raise ValueError("CSV file is empty")
+    return delimiter, columns
+
+
+def parse_dates(dates: pd.Series, date_format: str) -> pd.DatetimeIndex:
     """
-    Конвертирует загруженный CSV-файл в словарь с данными и, при наличии, датами.
+    Разбирает столбец дат в datetime64 по заданному формату.
+
+    Parameters
+    ----------
+    dates : pd.Series
+        Строковые значения дат.
+    date_format : str
+        Формат даты ("YYYY-MM-DD", "DD.MM.YYYY", "MM/DD/YYYY", "DD/MM/YYYY" или "auto").
+        Неизвестный формат разбирается как ISO 8601.
+
+    Returns
+    -------
+    pd.DatetimeIndex
+        Даты в формате datetime64.
+    """
+    if date_format == "auto":
+        date_format = detect_date_format(dates.iloc[0])
+    strftime_format = ConvertersConfig.DATE_FORMATS.get(date_format, "ISO8601")
+    parsed = pd.DatetimeIndex(pd.to_datetime(dates, format=strftime_format))
+    if parsed.hasnans:
+        raise ValueError("Column 'dates' contains empty values")
+    return parsed
+
+
+def csv_to_dict(file: UploadFile, delimiter: str = "auto", date_format: str = "auto") -> TimeSeries:
+    """
+    Конвертирует загруженный CSV-файл во временной ряд с данными и, при наличии, датами.
 
     Parameters
     ----------
@@ -31,51 +78,40 @@ def csv_to_dict(file: UploadFile, delimiter: str = "auto", date_format: str = "a
 
     Returns
     -------
-    dict
-        Словарь с ключами:
-        - "dates": список объектов datetime (если столбец дат присутствует),
-        - "endog": список числовых значений временного ряда.
-    """  
-
-    content = file.file.read().decode('utf-8')  
-    validate_csv_size(content, ConvertersConfig.MAX_FILE_ROWS)
+    TimeSeries
+        Значения временного ряда и даты (если столбец дат присутствует).
 
-    file.file.seek(0)  
-
-    if delimiter == "auto":
-        first_line = content.split('\n')[0]
-        delimiter = detect_delimiter(first_line, ConvertersConfig.CSV_DELIMITERS, ConvertersConfig.CSV_DEFAULT_DELIMETER)
+    Raises
+    ------
+    ValueError
+        Если файл пуст, содержит больше строк, чем разрешено, или нечисловые/пропущенные значения.
+    """
 
-    reader = csv.DictReader(StringIO(content), delimiter=delimiter)  
-    use_index = "dates" not in reader.fieldnames  
-    if use_index: 
-        data = {"dates": None, "endog": []} 
-    else:
-        data = {"dates": [], "endog": []} 
+    delimiter, columns = _read_header(file, delimiter)
+    use_index = "dates" not in columns
+    value_column = columns[0] if use_index else next((c for c in columns if c != "dates"), None)
+    if value_column is None:
+        raise ValueError("CSV file must contain a column with values")
+
+    usecols = [value_column] if use_index else ["dates", value_column]
+    # Читается на одну строку больше предела, чтобы обнаружить превышение без чтения всего файла
+    frame = pd.read_csv(
+        file.file,
+        sep=delimiter,
+        usecols=usecols,
+        dtype={"dates": str, value_column: np.float64},
+        encoding=ConvertersConfig.CSV_ENCODING,
+        engine="c",
+        skip_blank_lines=True,
+        nrows=ConvertersConfig.MAX_FILE_ROWS + 1,
+    )
+    file.file.seek(0)
+    validate_rows_count(len(frame), ConvertersConfig.MAX_FILE_ROWS)
 
-    if date_format == "auto" and not use_index:
-        sample_date = next(reader)["dates"]
-        date_format = detect_date_format(sample_date)
+    endog = frame[value_column].to_numpy(dtype=np.float64)
+    if np.isnan(endog).any():
+        raise ValueError(f"Column '{value_column}' contains empty or non-numeric values")
 
-    file.file.seek(0)
-    reader = csv.DictReader(StringIO(content), delimiter=delimiter)
-
-    for i, row in enumerate(reader):
-        if use_index:
-            data["endog"].append(float(list(row.values())[0]))
-        else:
-            date_str = row["dates"]
-            if date_format == "YYYY-MM-DD":
-                date = datetime.strptime(date_str, "%Y-%m-%d")
-            elif date_format == "DD.MM.YYYY":
-                date = datetime.strptime(date_str, "%d.%m.%Y")
-            elif date_format == "MM/DD/YYYY":
-                date = datetime.strptime(date_str, "%m/%d/%Y")
-            elif date_format == "DD/MM/YYYY":
-                date = datetime.strptime(date_str, "%d/%m/%Y")
-            else:
-                date = datetime.fromisoformat(date_str)  # По умолчанию используем ISO формат
-
-            data["dates"].append(date)
-            data["endog"].append([float(val) for key, val in row.items() if key != "dates"][0])
-    return data  
\ No newline at end of file
+    if use_index:
+        return TimeSeries(endog)
+    return TimeSeries(endog, parse_dates(frame["dates"], date_format))
@@ -1,69 +1,128 @@
 """
 Преобразование Excel-файлов во внутреннее словарное представление.
 
-Модуль содержит функцию, конвертирующую содержимое Excel-файла в структуру,
-пригодную для дальнейшего анализа и построения прогнозов.
+Модуль содержит функцию, конвертирующую содержимое Excel-файла во временной ряд (`TimeSeries`),
+пригодный для дальнейшего анализа и построения прогнозов.
+
+Первый лист книги читается потоково (openpyxl в режиме только для чтения), без построения
+всей книги в памяти: из каждой строки берутся только ячейки дат и значений, которые
+частями по `ConvertersConfig.EXCEL_CHUNK_ROWS` строк преобразуются в массивы float64
+и datetime64. Чтение прерывается, как только превышено допустимое количество строк,
+поэтому потребление памяти ограничено независимо от размера книги.
 """
 
+from typing import Any, List, Optional
+
+import numpy as np
 import pandas as pd
-from datetime import datetime
+import openpyxl
 from starlette.datastructures import UploadFile
-from .utils import detect_date_format
 
+from services.timeseries import TimeSeries
+from .csv_to_dict import parse_dates
+from .utils import detect_date_format, validate_rows_count
+from .config import ConvertersConfig
+
+
+def _to_values(values: List[Any], name: str) -> np.ndarray:
+    """Значения ряда в float64; пустые и нечисловые ячейки отклоняются, как и в `csv_to_dict`."""
+    try:
+        endog = np.array(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        raise ValueError(f"Column '{name}' contains empty or non-numeric values")
+    # Пустая ячейка в строке с датой становится NaN
+    if np.isnan(endog).any():
+        raise ValueError(f"Column '{name}' contains empty or non-numeric values")
+    return endog
 
-def excel_to_dict(file: UploadFile) -> dict:
+
+def _to_dates(dates: List[Any], date_format: str) -> np.ndarray:
+    """Даты ряда в datetime64: строки разбираются по формату, ячейки-даты преобразуются как есть."""
+    if isinstance(dates[0], str):
+        return parse_dates(pd.Series(dates, dtype=object), date_format).to_numpy()
+    parsed = pd.DatetimeIndex(pd.to_datetime(dates))
+    if parsed.hasnans:
+        raise ValueError("Column 'dates' contains empty values")
+    return parsed.to_numpy()
+
+
+def excel_to_dict(file: UploadFile, date_format: str = "auto") -> TimeSeries:
     """
-    Конвертирует загруженный Excel-файл в словарь с данными и, при наличии, датами.
+    Конвертирует загруженный Excel-файл во временной ряд с данными и, при наличии, датами.
 
     Parameters
     ----------
     file : UploadFile
         Загруженный Excel-файл.
 
+    date_format : str, optional
+        Формат строковых дат в столбце "dates" (см. `csv_to_dict`). По умолчанию ("auto")
+        определяется по первой дате. Для ячеек с типом даты не используется.
+
     Returns
     -------
-    dict
-        Словарь с ключами:
-        - "dates": список объектов datetime (если столбец дат присутствует) или None,
-        - "endog": список числовых значений временного ряда.
+    TimeSeries
+        Значения временного ряда и даты (если столбец дат присутствует).
+
+    Raises
+    ------
+    ValueError
+        Если файл пуст, содержит больше строк, чем разрешено, нечисловые значения или пропущенные даты.
     """
-    
-    df = pd.read_excel(file.file)  # Загружаем Excel-файл в DataFrame
-
-    if "dates" not in df.columns:
-        # Если столбца "dates" нет, устанавливаем dates в None
-        data = {
-            "dates": None,
-            "endog": df.iloc[:, 0].astype(float).tolist()  # Конвертируем первый столбец в значения
-        }
-    else:
-        # Если столбец "dates" есть, определяем формат даты и преобразуем их
-        date_format = None
-        try:
-            # Пробуем определить формат даты на основе первой строки
-            sample_date = df["dates"].iloc[0]
-            if isinstance(sample_date, str):  # Если дата представлена как строка
-                date_format = detect_date_format(sample_date)
-        except Exception as e:
-            raise ValueError(f"Ошибка при определении формата даты: {e}")
-
-        # Преобразуем даты в datetime объекты
-        if date_format:
-            # Если формат даты определен, используем его для парсинга
-            df["dates"] = df["dates"].apply(
-                lambda x: datetime.strptime(x, {
-                    "YYYY-MM-DD": "%Y-%m-%d",
-                    "DD.MM.YYYY": "%d.%m.%Y",
-                    "MM/DD/YYYY": "%m/%d/%Y",
-                    "DD/MM/YYYY": "%d/%m/%Y",
-                }[date_format])
-            )
-        else:
-            # Если формат не определен, пытаемся автоматически преобразовать
-            df["dates"] = pd.to_datetime(df["dates"])
-
-        data = {
-            "dates": df["dates"].tolist(),  # Преобразуем даты в список
-            "endog": df.drop(columns=["dates"]).iloc[:, 0].astype(float).tolist()  # Конвертируем значения
-        }
-    return data
\ No newline at end of file
+
+    file.file.seek(0)
+    workbook = openpyxl.load_workbook(file.file, read_only=True, data_only=True)
+    try:
+        sheet = workbook.worksheets[0]
+        header = next(sheet.iter_rows(max_row=1, values_only=True), None)
+        if not header:
+            raise ValueError("Excel file is empty")
+
+        columns = ["" if name is None else str(name) for name in header]
+        dates_index: Optional[int] = columns.index("dates") if "dates" in columns else None
+        value_index = next((i for i, name in enumerate(columns) if i != dates_index), None)
+        if value_index is None:
+            raise ValueError("Excel file must contain a column with values")
+        value_name = columns[value_index]
+
+        endog_chunks, dates_chunks = [], []
+        values, dates = [], []
+        rows_count = 0
+
+        def flush() -> None:
+            nonlocal date_format
+            endog_chunks.append(_to_values(values, value_name))
+            if dates_index is not None:
+                # Формат определяется один раз, чтобы все части файла разбирались одинаково
+                if date_format == "auto" and isinstance(dates[0], str):
+                    date_format = detect_date_format(dates[0])
+                dates_chunks.append(_to_dates(dates, date_format))
+            values.clear()
+            dates.clear()
+
+        # Ячейки правее столбцов дат и значений не читаются
+        last_column = max(value_index, dates_index if dates_index is not None else 0) + 1
+        for row in sheet.iter_rows(min_row=2, max_col=last_column, values_only=True):
+            value = row[value_index] if value_index < len(row) else None
+            date = row[dates_index] if dates_index is not None and dates_index < len(row) else None
+            if value is None and date is None:
+                continue  # Пустые строки пропускаются, как и в pd.read_excel
+            rows_count += 1
+            validate_rows_count(rows_count, ConvertersConfig.MAX_FILE_ROWS)
+            values.append(value)
+            if dates_index is not None:
+                dates.append(date)
+            if len(values) == ConvertersConfig.EXCEL_CHUNK_ROWS:
+                flush()
+        if values:
+            flush()
+    finally:
+        workbook.close()
+        file.file.seek(0)
+
+    if not endog_chunks:
+        raise ValueError("Excel file contains no data")
+    endog = np.concatenate(endog_chunks)
+    if dates_index is None:
+        return TimeSeries(endog)
+    return TimeSeries(endog, np.concatenate(dates_chunks))
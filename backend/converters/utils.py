@@ -1,7 +1,7 @@
 """
 Утилиты для работы с форматами даты и разделителями CSV.
 
-Модуль содержит функции для определения формата даты, разделителя CSV и проверки размера CSV-файла.
+Модуль содержит функции для определения формата даты, разделителя CSV и проверки количества строк в файле.
 """
 
 from typing import List
@@ -75,28 +75,24 @@ def detect_delimiter(
     return detected_delimiter
 
 
-def validate_csv_size(content: str, max_rows: int = 50) -> None:
+def validate_rows_count(rows_count: int, max_rows: int) -> None:
     """
-    Проверяет, что CSV-файл содержит не более указанного количества строк данных
+    Проверяет, что файл содержит не более указанного количества строк данных
     (не считая строки заголовков).
 
     Parameters
     ----------
-    content : str
-        Содержимое CSV-файла в виде строки.
-    max_rows : int, optional
-        Максимально допустимое количество строк данных (по умолчанию 50).
+    rows_count : int
+        Количество прочитанных строк данных.
+    max_rows : int
+        Максимально допустимое количество строк данных.
 
     Raises
     ------
     ValueError
         Если количество строк данных превышает максимально допустимое.
     """
-    # Подсчет строк, исключая пустые и строку заголовков
-    lines = [line for line in content.split("\n") if line.strip()]
-    data_rows = len(lines) - 1  # Вычитаем строку заголовков
-
-    if data_rows > max_rows:
+    if rows_count > max_rows:
         raise ValueError(
-            f"The file contains too much data. The maximum allowed is {max_rows} rows, received {data_rows}."
+            f"The file contains too much data. The maximum allowed is {max_rows} rows."
         )
@@ -2,17 +2,20 @@
 Инициализация и настройка подключения к базе данных.
 
 Модуль создает движок SQLAlchemy, конфигурирует сессию для работы с БД, а также
-содержит функции для получения сессии и инициализации базы данных.
+содержит функции для получения сессии и инициализации базы данных. Время выполнения
+SQL-запросов записывается в метрики по типу операции.
 """
 
 import os
+import time
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import NullPool
 
 from logger import Logger
+from metrics import DB_QUERY_SECONDS
 
 
 DB_USER = os.getenv("DB_USER", "admin")
@@ -34,6 +37,18 @@ engine = create_engine(
 )
 logger.info("Движок базы данных успешно создан!")
 
+
+@event.listens_for(engine, "before_cursor_execute")
+def _start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+
+@event.listens_for(engine, "after_cursor_execute")
+def _observe_query_time(conn, cursor, statement, parameters, context, executemany):
+    started_at = conn.info["query_started_at"].pop()
+    operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "UNKNOWN"
+    DB_QUERY_SECONDS.labels(operation=operation).observe(time.perf_counter() - started_at)
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
@@ -58,3 +73,28 @@ def init_db():
     from . import models
 
     Base.metadata.create_all(bind=engine)
+    _add_missing_columns(models)
+
+
+def _add_missing_columns(models):
+    """
+    Добавляет в уже существующие таблицы прогнозов столбцы, появившиеся после их создания.
+
+    `create_all` не изменяет существующие таблицы, поэтому столбец updated_at (и индекс по нему)
+    добавляется идемпотентными DDL-командами. Так же снимается ограничение NOT NULL со срока
+    хранения задач прогнозирования (у незавершённых задач он не задан).
+    """
+    tablenames = [
+        model.__tablename__ for model in models.ForecastBase.__subclasses__()
+    ]
+    with engine.begin() as connection:
+        for tablename in tablenames:
+            connection.execute(text(
+                f"ALTER TABLE {tablename} ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP DEFAULT now()"
+            ))
+            connection.execute(text(
+                f"CREATE INDEX IF NOT EXISTS ix_{tablename}_updated_at ON {tablename} (updated_at)"
+            ))
+        connection.execute(text(
+            f"ALTER TABLE {models.ForecastJob.__tablename__} ALTER COLUMN expires_at DROP NOT NULL"
+        ))
@@ -2,12 +2,19 @@
 CRUD-операции для моделей прогнозных данных.
 
 Модуль содержит базовый класс CRUDBase для стандартных операций с БД,
+класс ForecastCRUD для чтения временных рядов прогнозов без создания ORM-объектов,
+класс ModelStateCRUD для состояния моделей задач планировщика,
+класс ForecastJobCRUD для асинхронных задач прогнозирования,
+класс DataVersionCRUD для версий данных таблиц прогнозов,
 а также инициализирует объекты CRUD для конкретных моделей прогнозов.
 """
 
-from .models import TemperatureForecast, RelativeHumidityForecast, WindSpeedForecast, PrecipitationForecast
-from typing import List, Dict
-from sqlalchemy import asc
+from .models import TemperatureForecast, RelativeHumidityForecast, WindSpeedForecast, PrecipitationForecast, ForecastModelState, ForecastJob, DataVersion
+from datetime import datetime
+from typing import List, Dict, Optional, Tuple
+from sqlalchemy import and_, asc, desc, or_, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.sql import func
 
 
 class CRUDBase:
@@ -83,7 +90,7 @@ class CRUDBase:
         db_session.refresh(obj)
         return obj
 
-    def bulk_create(self, db_session, objects_data: List[Dict]):
+    def bulk_create(self, db_session, objects_data: List[Dict], commit: bool = True):
         """
         Массовое создание записей.
 
@@ -93,6 +100,9 @@ class CRUDBase:
             Сессия базы данных.
         objects_data : List[Dict]
             Список словарей с данными для создания.
+        commit : bool, optional
+            Зафиксировать транзакцию. При False записи фиксируются вызывающим кодом
+            вместе с другими изменениями транзакции.
 
         Returns
         -------
@@ -101,7 +111,8 @@ class CRUDBase:
         """
         objects = [self.model(**data) for data in objects_data]
         db_session.bulk_save_objects(objects)
-        db_session.commit()
+        if commit:
+            db_session.commit()
         return len(objects)
 
     def bulk_delete(self, db_session, ids: list):
@@ -169,10 +180,312 @@ class CRUDBase:
         return obj
 
 
-temperature_crud = CRUDBase(TemperatureForecast) 
-relative_humidity_crud =  CRUDBase(RelativeHumidityForecast)
-wind_speed_crud = CRUDBase(WindSpeedForecast)
-precipitation_crud = CRUDBase(PrecipitationForecast)
+class ForecastCRUD(CRUDBase):
+    """
+    CRUD-операции для таблиц прогнозов.
+
+    Помимо стандартных операций позволяет читать временной ряд в виде кортежей только нужных
+    столбцов (без ORM-объектов и без текстового саммари каждой записи).
+    """
+
+    SERIES_COLUMNS = (
+        "id", "date", "endog", "predict", "ci_low", "ci_up", "conf_level", "absolute_error", "created_at", "updated_at",
+    )
+
+    def get_series(
+        self,
+        db_session,
+        limit=100,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        after_updated_at: Optional[datetime] = None,
+    ) -> Tuple[list, bool]:
+        """
+        Получить записи временного ряда в виде кортежей, отсортированных по дате.
+
+        Выборка использует keyset-пагинацию по индексированному столбцу date: если задан `since`,
+        возвращаются первые `limit` записей после него, иначе — последние `limit` записей
+        (до `until`, если он задан). Следующая страница запрашивается с `since` (или `until`),
+        равным дате последней (первой) записи текущей страницы.
+
+        Parameters
+        ----------
+        db_session : Session
+            Сессия базы данных.
+        limit : int, optional
+            Максимальное количество записей для выборки (по умолчанию 100).
+        since : datetime, optional
+            Выбирать записи с датой строго после указанной.
+        until : datetime, optional
+            Выбирать записи с датой строго до указанной.
+        after_updated_at : datetime, optional
+            Выбирать только записи, созданные или изменённые строго после указанного момента.
+
+        Returns
+        -------
+        Tuple[List[tuple], bool]
+            Кортежи значений столбцов SERIES_COLUMNS и признак того, что в выбранном
+            направлении есть ещё записи.
+        """
+        columns = [getattr(self.model, column) for column in self.SERIES_COLUMNS]
+        statement = select(*columns)
+        if since is not None:
+            statement = statement.where(self.model.date > since)
+        if until is not None:
+            statement = statement.where(self.model.date < until)
+        if after_updated_at is not None:
+            statement = statement.where(self.model.updated_at > after_updated_at)
+
+        # Лишняя запись запрашивается только для определения наличия следующей страницы
+        order = asc(self.model.date) if since is not None else desc(self.model.date)
+        rows = db_session.execute(statement.order_by(order).limit(limit + 1)).all()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        if since is None:
+            rows.reverse()
+        return rows, has_more
+
+    def get_last_updated_at(self, db_session) -> Optional[datetime]:
+        """
+        Получить момент последнего изменения записей таблицы.
+
+        Parameters
+        ----------
+        db_session : Session
+            Сессия базы данных.
+
+        Returns
+        -------
+        datetime or None
+            Максимальное значение updated_at (None для пустой таблицы).
+        """
+        return db_session.execute(select(func.max(self.model.updated_at))).scalar()
+
+    def get_summary(self, db_session, id):
+        """
+        Получить саммари модели, сохранённое в записи.
+
+        Parameters
+        ----------
+        db_session : Session
+            Сессия базы данных.
+        id : int
+            Идентификатор записи.
+
+        Returns
+        -------
+        str or None
+            Текст саммари.
+        """
+        return db_session.execute(select(self.model.last_summary).where(self.model.id == id)).scalar()
+
+
+class ModelStateCRUD(CRUDBase):
+    """
+    CRUD-операции для состояния моделей задач планировщика.
+    """
+
+    def get_by_task_name(self, db_session, task_name: str):
+        """
+        Получить состояние модели по имени задачи.
+
+        Parameters
+        ----------
+        db_session : Session
+            Сессия базы данных.
+        task_name : str
+            Имя задачи планировщика.
+
+        Returns
+        -------
+        Объект модели или None, если не найден.
+        """
+        return db_session.query(self.model).filter(self.model.task_name == task_name).first()
+
+    def get_by_tablename(self, db_session, tablename: str):
+        """
+        Получить состояние модели по имени таблицы прогнозов.
+
+        Parameters
+        ----------
+        db_session : Session
+            Сессия базы данных.
+        tablename : str
+            Имя таблицы, в которую задача сохраняет прогнозы.
+
+        Returns
+        -------
+        Объект модели или None, если не найден.
+        """
+        return db_session.query(self.model).filter(self.model.tablename == tablename).first()
+
+    def save(self, db_session, task_name: str, state_data: dict):
+        """
+        Создать или обновить состояние модели задачи.
+
+        Parameters
+        ----------
+        db_session : Session
+            Сессия базы данных.
+        task_name : str
+            Имя задачи планировщика.
+        state_data : dict
+            Данные состояния (тип модели, параметры конфигурации, обученные параметры).
+
+        Returns
+        -------
+        Объект модели.
+        """
+        db_obj = self.get_by_task_name(db_session, task_name)
+        if db_obj is None:
+            return self.create(db_session, {"task_name": task_name, **state_data})
+        return self.update(db_session, db_obj, state_data)
+
+
+class ForecastJobCRUD(CRUDBase):
+    """
+    CRUD-операции для асинхронных задач прогнозирования.
+
+    Срок хранения (expires_at) задаётся при завершении задачи и относится только к её результату.
+    Незавершённые задачи устаревают, только если созданы раньше заданного момента
+    (их воркер завершился аварийно и не довёл задачу до конца).
+    """
+
+    FINISHED_STATUSES = ("done", "failed")
+
+    def _expired(self, now: datetime, stale_before: datetime):
+        finished = self.model.status.in_(self.FINISHED_STATUSES)
+        return or_(
+            and_(finished, self.model.expires_at <= now),
+            and_(~finished, self.model.created_at <= stale_before),
+        )
+
+    def get_active(self, db_session, id: str, now: datetime, stale_before: datetime):
+        """
+        Получить задачу по ID, если она не устарела.
+
+        Parameters
+        ----------
+        db_session : Session
+            Сессия базы данных.
+        id : str
+            Идентификатор задачи.
+        now : datetime
+            Текущее время (сравнивается со сроком хранения результата завершённых задач).
+        stale_before : datetime
+            Незавершённые задачи, созданные до этого момента, считаются потерянными.
+
+        Returns
+        -------
+        Объект модели или None, если задача не найдена или устарела.
+        """
+        return (
+            db_session.query(self.model)
+            .filter(self.model.id == id)
+            .filter(~self._expired(now, stale_before))
+            .first()
+        )
+
+    def delete_expired(self, db_session, now: datetime, stale_before: datetime):
+        """
+        Удалить завершённые задачи с истёкшим сроком хранения и потерянные незавершённые задачи.
+
+        Parameters
+        ----------
+        db_session : Session
+            Сессия базы данных.
+        now : datetime
+            Текущее время.
+        stale_before : datetime
+            Незавершённые задачи, созданные до этого момента, считаются потерянными.
+
+        Returns
+        -------
+        int
+            Количество удаленных записей.
+        """
+        count = (
+            db_session.query(self.model)
+            .filter(self._expired(now, stale_before))
+            .delete(synchronize_session=False)
+        )
+        db_session.commit()
+        return count
+
+
+class DataVersionCRUD(CRUDBase):
+    """
+    CRUD-операции для версий данных таблиц прогнозов.
+
+    Версия таблицы увеличивается при каждом изменении её данных планировщиком
+    и используется для инвалидации кэша ответов API. Об увеличении версии уведомляются
+    подписчики канала NOTIFY_CHANNEL (Postgres LISTEN/NOTIFY) с сообщением "<tablename>:<version>".
+    """
+
+    NOTIFY_CHANNEL = "forecast_updates"
+
+    def get_versions(self, db_session, tablenames: List[str]) -> Dict[str, int]:
+        """
+        Получить текущие версии таблиц.
+
+        Parameters
+        ----------
+        db_session : Session
+            Сессия базы данных.
+        tablenames : List[str]
+            Имена таблиц прогнозов.
+
+        Returns
+        -------
+        Dict[str, int]
+            Версии таблиц (0 для таблиц, которые ещё не изменялись).
+        """
+        rows = (
+            db_session.query(self.model.tablename, self.model.version)
+            .filter(self.model.tablename.in_(tablenames))
+            .all()
+        )
+        versions = dict.fromkeys(tablenames, 0)
+        versions.update({tablename: version for tablename, version in rows})
+        return versions
+
+    def bump(self, db_session, tablename: str) -> int:
+        """
+        Увеличить версию таблицы и уведомить подписчиков канала NOTIFY_CHANNEL.
+
+        Изменение не фиксируется: оно попадает в ту же транзакцию, что и изменение данных
+        таблицы, и фиксируется вместе с ним вызывающим кодом (уведомление Postgres
+        доставляется только после фиксации транзакции).
+
+        Parameters
+        ----------
+        db_session : Session
+            Сессия базы данных.
+        tablename : str
+            Имя таблицы прогнозов.
+
+        Returns
+        -------
+        int
+            Новая версия таблицы.
+        """
+        statement = insert(self.model).values(tablename=tablename, version=1)
+        statement = statement.on_conflict_do_update(
+            index_elements=[self.model.tablename],
+            set_={"version": self.model.version + 1, "updated_at": func.now()},
+        )
+        version = db_session.execute(statement.returning(self.model.version)).scalar()
+        db_session.execute(select(func.pg_notify(self.NOTIFY_CHANNEL, f"{tablename}:{version}")))
+        return version
+
+
+temperature_crud = ForecastCRUD(TemperatureForecast)
+relative_humidity_crud = ForecastCRUD(RelativeHumidityForecast)
+wind_speed_crud = ForecastCRUD(WindSpeedForecast)
+precipitation_crud = ForecastCRUD(PrecipitationForecast)
+model_state_crud = ModelStateCRUD(ForecastModelState)
+forecast_job_crud = ForecastJobCRUD(ForecastJob)
+data_version_crud = DataVersionCRUD(DataVersion)
 
 # Маппинг таблица
 TABLE_CRUD_MAPPING = {
@@ -2,10 +2,13 @@
 Модели базы данных для хранения прогнозов.
 
 Содержит базовый класс ForecastBase и конкретные модели
-для различных типов прогнозов: температуры, влажности, скорости ветра и осадков.
+для различных типов прогнозов: температуры, влажности, скорости ветра и осадков,
+модель ForecastModelState для хранения состояния моделей задач планировщика,
+модель ForecastJob для асинхронных задач прогнозирования
+и модель DataVersion для отслеживания изменений таблиц прогнозов.
 """
 
-from sqlalchemy import Column, Float, Integer, Text, TIMESTAMP
+from sqlalchemy import Column, Float, Integer, String, Text, JSON, TIMESTAMP
 from sqlalchemy.sql import func
 from database import Base
 
@@ -15,6 +18,7 @@ class ForecastBase(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     created_at = Column(TIMESTAMP, server_default=func.now())
+    updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now(), index=True)
 
     date = Column(TIMESTAMP, nullable=False, index=True)
     endog = Column(Float)
@@ -35,4 +39,42 @@ class WindSpeedForecast(ForecastBase):
     __tablename__ = "wind_speed_forecast"
 
 class PrecipitationForecast(ForecastBase):
-    __tablename__ = "precipitation_forecast"
\ No newline at end of file
+    __tablename__ = "precipitation_forecast"
+
+
+class ForecastModelState(Base):
+    __tablename__ = "forecast_model_state"
+
+    id = Column(Integer, primary_key=True, index=True)
+    task_name = Column(String, nullable=False, unique=True, index=True)
+    tablename = Column(String, index=True)
+    model_type = Column(String)
+    settings = Column(JSON)
+    params = Column(JSON)
+    ticks_since_refit = Column(Integer, default=0)
+    window_start = Column(TIMESTAMP)
+    window_end = Column(TIMESTAMP)
+    updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now())
+
+
+class ForecastJob(Base):
+    __tablename__ = "forecast_job"
+
+    id = Column(String(32), primary_key=True)
+    status = Column(String, nullable=False, index=True)
+    selected_model = Column(String)
+    result = Column(JSON)
+    error = Column(Text)
+    created_at = Column(TIMESTAMP, server_default=func.now())
+    started_at = Column(TIMESTAMP)
+    finished_at = Column(TIMESTAMP)
+    # Срок хранения результата; NULL, пока задача не завершена
+    expires_at = Column(TIMESTAMP, index=True)
+
+
+class DataVersion(Base):
+    __tablename__ = "data_version"
+
+    tablename = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now())
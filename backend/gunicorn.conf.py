@@ -0,0 +1,16 @@
+"""
+Хуки gunicorn для многопроцессного сбора метрик Prometheus.
+
+Параметры запуска (адрес, количество воркеров и т.д.) передаются в командной строке (см. Dockerfile).
+"""
+
+from metrics import clear_multiprocess_dir, mark_process_dead
+
+
+def on_starting(server):
+    # Значения метрик предыдущего запуска не должны попадать в агрегаты
+    clear_multiprocess_dir()
+
+
+def child_exit(server, worker):
+    mark_process_dead(worker.pid)
@@ -2,20 +2,29 @@
 Основной модуль запуска FastAPI приложения.
 
 - Инициализирует базу данных.
-- Настраивает пул процессов для прогнозирования.
+- Настраивает и прогревает пулы процессов для прогнозирования и преобразования загруженных файлов.
+- Создаёт контроль допуска прогнозов в пул и очередь асинхронных задач прогнозирования.
+- Запускает рассылку обновлений прогнозов из БД подписчикам.
 - Подключает маршруты API.
-- Добавляет CORS middleware для frontend.
+- Добавляет CORS middleware для frontend, сжатие ответов gzip и сбор метрик запросов.
+- Отдаёт метрики Prometheus всех процессов сервиса по адресу /metrics.
 """
 
-import os
+import asyncio
 from contextlib import asynccontextmanager
-from concurrent.futures import ProcessPoolExecutor
 
 from fastapi import FastAPI
+from fastapi.responses import Response
 from api.routes import router as api_router
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 
 from database import init_db
+from api.config import ApiConfig
+from api.events import ForecastUpdatesBroadcaster
+from api.middleware import MetricsMiddleware
+from metrics import render_metrics
+from workers import AdmissionController, ConversionPool, ForecastingPool, ForecastJobQueue, WorkersConfig
 from logger import Logger
 
 
@@ -26,10 +35,51 @@ logger = Logger(name="backend", log_dir="logs", log_file="backend.log").get_logg
 async def lifespan(app: FastAPI):
     logger.info("Запуск FastAPI приложения.")
     init_db()
-    app.state.forecasting_process_pool = ProcessPoolExecutor(os.cpu_count())
+    app.state.forecasting_process_pool = ForecastingPool(
+        WorkersConfig.FORECASTING_POOL_SIZE,
+        max_tasks_per_child=WorkersConfig.FORECASTING_MAX_TASKS_PER_CHILD,
+        max_worker_rss_mb=WorkersConfig.FORECASTING_MAX_WORKER_RSS_MB,
+        cancel_slots=WorkersConfig.FORECASTING_CANCEL_SLOTS,
+        shared_min_bytes=WorkersConfig.FORECASTING_SHARED_MIN_KB * 1024,
+        shared_max_bytes=WorkersConfig.FORECASTING_SHARED_MAX_MB * 1024 * 1024,
+    )
+    app.state.forecasting_process_pool.warm_up()
+    app.state.conversion_pool = ConversionPool(
+        WorkersConfig.CONVERSION_POOL_SIZE,
+        max_pending=WorkersConfig.CONVERSION_MAX_PENDING,
+        max_pending_bytes=WorkersConfig.CONVERSION_MAX_PENDING_MB * 1024 * 1024,
+        chunk_size=WorkersConfig.CONVERSION_CHUNK_SIZE,
+        max_tasks_per_child=WorkersConfig.CONVERSION_MAX_TASKS_PER_CHILD,
+    )
+    app.state.conversion_pool.warm_up()
+    app.state.forecast_admission = AdmissionController(
+        families=WorkersConfig.MODEL_FAMILIES,
+        default_family=WorkersConfig.DEFAULT_MODEL_FAMILY,
+        concurrency=WorkersConfig.ADMISSION_CONCURRENCY,
+        max_queued=WorkersConfig.ADMISSION_MAX_QUEUED,
+        max_queued_per_client=WorkersConfig.ADMISSION_MAX_QUEUED_PER_CLIENT,
+        poll_interval=WorkersConfig.DISCONNECT_POLL_INTERVAL,
+    )
+    app.state.forecast_jobs = ForecastJobQueue(
+        app.state.forecasting_process_pool,
+        app.state.forecast_admission,
+        max_pending=ApiConfig.MAX_PENDING_JOBS,
+        result_ttl=ApiConfig.JOB_RESULT_TTL,
+        stale_ttl=ApiConfig.JOB_STALE_TTL,
+        cleanup_interval=ApiConfig.JOB_CLEANUP_INTERVAL,
+    )
+    app.state.forecast_jobs.start_cleanup()
+    app.state.forecast_updates = ForecastUpdatesBroadcaster(
+        queue_size=ApiConfig.SSE_QUEUE_SIZE,
+        delta_limit=ApiConfig.MAX_SAMPLES_LIMIT,
+    )
+    app.state.forecast_updates.start(asyncio.get_running_loop())
 
     yield
 
+    app.state.forecast_updates.stop()
+    await app.state.forecast_jobs.shutdown()
+    app.state.conversion_pool.shutdown(wait=True)
     app.state.forecasting_process_pool.shutdown(wait=True)
     logger.info("FastAPI приложение успешно завершило работу.")
 
@@ -43,3 +93,12 @@ app.add_middleware(
     allow_methods=["*"],  # Разрешаем все методы, например, GET, POST
     allow_headers=["*"],  # Разрешаем все заголовки
 )
+app.add_middleware(GZipMiddleware, minimum_size=ApiConfig.GZIP_MINIMUM_SIZE)
+app.add_middleware(MetricsMiddleware)
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics_endpoint():
+    """Метрики Prometheus, агрегированные по всем воркерам и процессам пула (не проксируется nginx)."""
+    content, media_type = render_metrics()
+    return Response(content=content, media_type=media_type)
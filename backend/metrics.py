@@ -0,0 +1,202 @@
+"""
+Метрики производительности в формате Prometheus для backend-приложения и планировщика.
+
+Метрики пишут несколько процессов (воркеры gunicorn, процессы пулов прогнозирования и задач
+планировщика), поэтому используется многопроцессный режим prometheus_client: каталог
+для файлов метрик задаётся переменной окружения PROMETHEUS_MULTIPROC_DIR до запуска сервиса
+и очищается один раз при его старте (`clear_multiprocess_dir`; при запуске без gunicorn
+каталог только создаётся при импорте модуля). Без этой переменной метрики собираются только
+в текущем процессе.
+
+Все метрики имеют метки, поэтому файлы значений создаются при первом наблюдении,
+а не при импорте модуля.
+"""
+
+import os
+import time
+from pathlib import Path
+from typing import Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+    start_http_server,
+)
+
+
+MULTIPROC_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+if MULTIPROC_DIR:
+    # Каталог нужен до первой записи метрики и при запуске без хуков gunicorn (uvicorn --reload)
+    Path(MULTIPROC_DIR).mkdir(parents=True, exist_ok=True)
+
+# Границы гистограмм: от быстрых запросов к БД до полного переобучения SARIMA
+FAST_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+SLOW_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "predictify_http_request_duration_seconds",
+    "Время обработки HTTP-запроса до начала ответа",
+    ["method", "route", "status"],
+    buckets=SLOW_BUCKETS,
+)
+FILE_CONVERSION_SECONDS = Histogram(
+    "predictify_file_conversion_seconds",
+    "Время преобразования загруженного файла в данные временного ряда",
+    ["format"],
+    buckets=FAST_BUCKETS,
+)
+FORECAST_FIT_SECONDS = Histogram(
+    "predictify_forecast_fit_seconds",
+    "Время обучения модели прогнозирования (с учётом кэша обученных моделей)",
+    ["model_type", "order"],
+    buckets=SLOW_BUCKETS,
+)
+POOL_PENDING_TASKS = Gauge(
+    "predictify_pool_pending_tasks",
+    "Задачи пула прогнозирования, ожидающие свободного процесса",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+POOL_BUSY_WORKERS = Gauge(
+    "predictify_pool_busy_workers",
+    "Занятые процессы пула прогнозирования",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+ADMISSION_RUNNING = Gauge(
+    "predictify_admission_running",
+    "Выполняемые прогнозы по семействам моделей",
+    ["family"],
+    multiprocess_mode="livesum",
+)
+ADMISSION_QUEUED = Gauge(
+    "predictify_admission_queued",
+    "Прогнозы, ожидающие допуска в пул, по семействам моделей",
+    ["family"],
+    multiprocess_mode="livesum",
+)
+DB_QUERY_SECONDS = Histogram(
+    "predictify_db_query_duration_seconds",
+    "Время выполнения SQL-запроса",
+    ["operation"],
+    buckets=FAST_BUCKETS,
+)
+SCHEDULER_PHASE_SECONDS = Histogram(
+    "predictify_scheduler_phase_duration_seconds",
+    "Длительность этапов задачи планировщика",
+    ["task", "phase"],
+    buckets=SLOW_BUCKETS,
+)
+
+
+class PhaseTimer:
+    """
+    Последовательный замер длительности этапов задачи.
+
+    Каждый вызов `mark` записывает время, прошедшее с предыдущего вызова (или с создания
+    таймера), как длительность завершившегося этапа.
+
+    Methods
+    -------
+    mark(phase)
+        Завершение этапа.
+    total()
+        Запись полной длительности задачи.
+    """
+
+    def __init__(self, histogram: Histogram, **labels: str):
+        """
+        Parameters
+        ----------
+        histogram : Histogram
+            Гистограмма с меткой phase.
+        **labels
+            Значения остальных меток гистограммы.
+        """
+        self.histogram = histogram
+        self.labels = labels
+        self.started_at = self.phase_started_at = time.perf_counter()
+
+    def mark(self, phase: str) -> None:
+        """Записывает длительность завершившегося этапа."""
+        now = time.perf_counter()
+        self.histogram.labels(phase=phase, **self.labels).observe(now - self.phase_started_at)
+        self.phase_started_at = now
+
+    def total(self) -> None:
+        """Записывает полную длительность задачи как этап total."""
+        self.histogram.labels(phase="total", **self.labels).observe(time.perf_counter() - self.started_at)
+
+
+def clear_multiprocess_dir() -> None:
+    """
+    Очищает каталог файлов метрик от значений предыдущего запуска сервиса.
+
+    Вызывается один раз при старте сервиса до запуска дочерних процессов
+    (в планировщике — в `main`, в backend — в хуке `on_starting` gunicorn).
+    """
+    if not MULTIPROC_DIR:
+        return
+    path = Path(MULTIPROC_DIR)
+    path.mkdir(parents=True, exist_ok=True)
+    for file in path.glob("*.db"):
+        file.unlink()
+
+
+def mark_process_dead(pid: int) -> None:
+    """
+    Исключает значения gauge-метрик завершившегося процесса из агрегатов livesum.
+
+    Parameters
+    ----------
+    pid : int
+        Идентификатор завершившегося процесса.
+    """
+    if MULTIPROC_DIR:
+        multiprocess.mark_process_dead(pid, MULTIPROC_DIR)
+
+
+def get_registry() -> CollectorRegistry:
+    """
+    Возвращает реестр, агрегирующий метрики всех процессов сервиса.
+
+    Returns
+    -------
+    CollectorRegistry
+        Реестр многопроцессного режима или реестр текущего процесса.
+    """
+    if not MULTIPROC_DIR:
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """
+    Формирует текущие значения метрик в текстовом формате Prometheus.
+
+    Returns
+    -------
+    tuple
+        Тело ответа и его Content-Type.
+    """
+    return generate_latest(get_registry()), CONTENT_TYPE_LATEST
+
+
+def start_metrics_server(port: int) -> None:
+    """
+    Запускает HTTP-сервер метрик в фоновом потоке (для сервисов без собственного HTTP API).
+
+    Parameters
+    ----------
+    port : int
+        Порт сервера метрик.
+    """
+    start_http_server(port, registry=get_registry())
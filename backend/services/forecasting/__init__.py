@@ -2,41 +2,179 @@
 Модуль для прогнозирования временных рядов.
 
 Содержит функцию `forecast`, которая выбирает модель по переданным параметрам, настраивает её,
-обучает на данных и возвращает прогноз с дополнительной информацией.
+обучает на данных и возвращает прогноз с дополнительной информацией. Данные передаются
+в виде `TimeSeries` (словарь с ключами "endog" и "dates" приводится к нему).
 """
 
-from typing import Dict
+import time
+from typing import Dict, List, Optional, Union
+
+import numpy as np
 
 from .models import SARIMAXModel, ExponentialSmoothingModel
-from .utils import extend_dates, is_camel_case, camel_to_snake, validate_no_nans
+from .smoothing import NumpyExponentialSmoothingModel
+from .utils import is_camel_case, camel_to_snake, validate_no_nans, build_summary, SUMMARY_MODES
+from .cache import fitted_models_cache
+from .config import ForecastingConfig
+from .tuning import stepwise_search
+from .cancellation import ForecastCancelledError, ForecastTimeoutError
+from services.timeseries import TimeSeries, as_series
 from logger import Logger
+from metrics import FORECAST_FIT_SECONDS
 
 
 logger = Logger(name='forecasting', log_dir='logs', log_file='forecasting.log').get_logger()
 
 
-def forecast(data: Dict, model_type: str, settings: Dict):
+def _snake_case_keys(settings: Dict) -> None:
+    """
+    Переименовывает ключи параметров модели из camelCase в snake_case (на месте).
+
+    Parameters
+    ----------
+    settings : dict
+        Параметры модели.
+    """
+
+    for param in settings.copy().keys():
+        if is_camel_case(param):
+            settings[camel_to_snake(param)] = settings.pop(param)
+
+
+def _order_label(settings: Dict) -> str:
+    """
+    Формирует метку порядка SARIMA-модели для метрик, например "(1,1,1)x(0,1,1,12)".
+
+    Parameters
+    ----------
+    settings : dict
+        Параметры модели `SARIMAXModel` (ключи order и seasonal_order).
+
+    Returns
+    -------
+    str
+        Метка порядка модели.
+    """
+
+    return "x".join(
+        "(" + ",".join(str(value) for value in settings[key]) + ")" for key in ("order", "seasonal_order")
+    )
+
+
+def _fit_cached(model, data: TimeSeries, model_type: str, **fit_kwargs):
+    """
+    Обучает модель либо берёт уже обученную модель из кэша процесса.
+
+    Parameters
+    ----------
+    model : SARIMAXModel or ExponentialSmoothingModel
+        Обёртка модели с заданными параметрами.
+    data : TimeSeries
+        Входные данные временного ряда.
+    model_type : str
+        Тип модели.
+    **fit_kwargs
+        Дополнительные параметры обучения (учитываются в ключе кэша).
+
+    Returns
+    -------
+    ResultsWrapper
+        Обученная модель statsmodels.
+    """
+
+    key = fitted_models_cache.make_key(data, model_type, {**model.settings, **fit_kwargs})
+    fitted_model = fitted_models_cache.get(key)
+    if fitted_model is not None:
+        logger.info(f"Обученная модель {model_type} взята из кэша: {fitted_models_cache.stats()}")
+        model.model = fitted_model
+        return fitted_model
+
+    fitted_model = model.fit(data, **fit_kwargs)
+    fitted_models_cache.put(key, fitted_model)
+    return fitted_model
+
+
+def _fit_warm(model: SARIMAXModel, data: TimeSeries, start_params: List[float], **fit_kwargs):
+    """
+    Обучает модель SARIMAX, начиная оптимизацию с переданного вектора параметров.
+
+    Если оптимизация с тёплого старта завершилась ошибкой или не сошлась,
+    модель переобучается с параметрами по умолчанию.
+
+    Parameters
+    ----------
+    model : SARIMAXModel
+        Обёртка модели с заданными параметрами.
+    data : TimeSeries
+        Входные данные временного ряда.
+    start_params : list of float
+        Начальный вектор параметров (например, результат предыдущего обучения).
+    **fit_kwargs
+        Дополнительные параметры обучения.
+
+    Returns
+    -------
+    SARIMAXResultsWrapper
+        Обученная модель.
+    """
+
+    try:
+        fitted_model = model.fit(data, start_params=start_params, disp=False, **fit_kwargs)
+        if fitted_model.mle_retvals.get("converged", True):
+            logger.info(
+                f"Модель обучена с тёплого старта за {fitted_model.mle_retvals.get('iterations')} итераций"
+            )
+            return fitted_model
+        logger.warning("Обучение с тёплого старта не сошлось, выполняется обучение с нуля")
+    except ForecastCancelledError:
+        raise
+    except Exception as e:
+        logger.warning(f"Ошибка обучения с тёплого старта: {e}. Выполняется обучение с нуля")
+
+    return model.fit(data, disp=False, **fit_kwargs)
+
+
+def forecast(
+    data: Union[TimeSeries, Dict],
+    model_type: str,
+    settings: Dict,
+    start_params: Optional[List[float]] = None,
+    fixed_params: Optional[List[float]] = None,
+    return_params: bool = False,
+):
     """
     Выполняет прогнозирование временного ряда выбранной моделью.
 
     Parameters
     ----------
-    data : dict
+    data : TimeSeries or dict
         Входные данные временного ряда.
     model_type : str
-        Тип модели (например, "ARIMA", "HWES").
+        Тип модели (например, "ARIMA", "HWES"). Для "AUTO_SARIMA" порядки p, q, P, Q подбираются
+        пошаговым поиском с ограничением по времени и числу кандидатов.
     settings : dict
-        Параметры модели и количество шагов прогноза ('steps').
+        Параметры модели, количество шагов прогноза ('steps') и, опционально, режим саммари
+        ('summary_mode': "full", "light" или "none", по умолчанию "full").
+    start_params : list of float, optional
+        Начальный вектор параметров для тёплого старта обучения (только для SARIMA-моделей).
+    fixed_params : list of float, optional
+        Вектор ранее обученных параметров: модель не переобучается, а только применяется
+        к данным проходом фильтра Калмана (только для SARIMA-моделей).
+    return_params : bool, optional
+        Добавить в результат вектор обученных параметров (только для SARIMA-моделей).
 
     Returns
     -------
     dict
         Результат прогноза с ключами:
         - summary: саммари прогноза,
-        - full_dates: список даты полного временного ряда (endog + predict),
-        - endog: исходные данные,
-        - prediction: прогнозные значения,
-        - confidence_intervals: интервалы доверия (если применимо).
+        - full_dates: даты полного временного ряда (endog + predict), массив datetime64
+          или числовые индексы для ряда без дат,
+        - endog: исходные данные (массив NumPy),
+        - prediction: прогнозные значения (массив NumPy),
+        - confidence_intervals: интервалы доверия (массив NumPy формы (steps, 2), если применимо),
+        - search: порядки лучшей модели и трасса поиска (для "AUTO_SARIMA"),
+        - params: обученные параметры модели (если `return_params=True`).
 
     Raises
     ------
@@ -47,43 +185,95 @@ def forecast(data: Dict, model_type: str, settings: Dict):
     nan_found_message = "Обнаружены NaN значения в данных прогноза"
     unknown_model_message = "Неизвестная модель"
 
+    data = as_series(data)
     steps = settings.pop("steps")
 
     logger.info(f"Запуск прогноза: модель={model_type}, шаги={steps}")
     logger.debug(f"Исходные настройки модели: {settings}")
 
-    for param in settings.copy().keys():
-        if is_camel_case(param):
-            settings[camel_to_snake(param)] = settings.pop(param)
+    _snake_case_keys(settings)
+
+    summary_mode = settings.pop("summary_mode", "full")
+    if summary_mode not in SUMMARY_MODES:
+        raise ValueError(f"Неизвестный режим саммари: {summary_mode}")
 
-    if model_type in ["SARIMA", "ARIMA", "ARMA", "AR", "MA"]:
+    if model_type in ["SARIMA", "ARIMA", "ARMA", "AR", "MA", "AUTO_SARIMA"]:
         significance_level = settings.pop("significance_level")
         logger.info(
             f"Используется модель {model_type} с уровнем значимости {significance_level}"
         )
-        model = SARIMAXModel(**settings)
-        summary = model.fit(data).summary().as_text()
+        # Ковариация параметров нужна только для полного саммари, интервалы прогноза от неё не зависят
+        fit_kwargs = {} if summary_mode == "full" else {"cov_type": "none"}
+        search = None
+        fit_started_at = time.perf_counter()
+        if model_type == "AUTO_SARIMA":
+            search_settings = {
+                "max_p": settings.pop("max_p", ForecastingConfig.AUTO_SARIMA_MAX_P),
+                "max_q": settings.pop("max_q", ForecastingConfig.AUTO_SARIMA_MAX_Q),
+                "max_P": settings.pop("max_seasonal_p", ForecastingConfig.AUTO_SARIMA_MAX_SEASONAL_P),
+                "max_Q": settings.pop("max_seasonal_q", ForecastingConfig.AUTO_SARIMA_MAX_SEASONAL_Q),
+                "max_candidates": min(
+                    settings.pop("max_candidates", ForecastingConfig.AUTO_SARIMA_MAX_CANDIDATES),
+                    ForecastingConfig.AUTO_SARIMA_MAX_CANDIDATES,
+                ),
+                "time_limit": min(
+                    settings.pop("time_limit", ForecastingConfig.AUTO_SARIMA_TIME_LIMIT),
+                    ForecastingConfig.AUTO_SARIMA_TIME_LIMIT,
+                ),
+            }
+            for order_param in ("p", "q", "P", "Q"):
+                settings.pop(order_param, None)
+            model, search = stepwise_search(
+                data,
+                d=settings.pop("d", 0),
+                D=settings.pop("D", 0),
+                s=settings.pop("s", 0),
+                settings=settings,
+                **search_settings,
+            )
+            fitted_model = model.model
+            logger.info(
+                f"Автоподбор завершён: {search['candidates']} кандидатов за {search['elapsed']} с, "
+                f"лучшая модель {search['best_order']}x{search['best_seasonal_order']}"
+            )
+        elif fixed_params is not None:
+            model = SARIMAXModel(**settings)
+            logger.info("Модель применяется к данным с фиксированными параметрами без переобучения")
+            fitted_model = model.apply(data, fixed_params, **fit_kwargs)
+        elif start_params is not None:
+            model = SARIMAXModel(**settings)
+            fitted_model = _fit_warm(model, data, start_params, **fit_kwargs)
+        else:
+            model = SARIMAXModel(**settings)
+            fitted_model = _fit_cached(model, data, model_type, **fit_kwargs)
+        FORECAST_FIT_SECONDS.labels(model_type=model_type, order=_order_label(model.settings)).observe(
+            time.perf_counter() - fit_started_at
+        )
+        summary = build_summary(fitted_model, summary_mode)
 
         prediction_result = model.detailed_forecast(steps)
-        prediction_vals = prediction_result.predicted_mean
+        prediction_vals = np.asarray(prediction_result.predicted_mean, dtype=np.float64)
         validate_no_nans(prediction_vals, nan_found_message)
-        prediction_conf_ints = prediction_result.conf_int(
-            alpha=significance_level
-        ).tolist()
+        prediction_conf_ints = np.asarray(prediction_result.conf_int(alpha=significance_level), dtype=np.float64)
 
-        full_dates = extend_dates(data, steps)
+        full_dates = data.extended_dates(steps)
         logger.info(f"Прогноз по модели {model_type} успешно построен")
 
-        return {
+        result = {
             "summary": summary,
             "full_dates": full_dates,
-            "endog": data.get("endog"),
-            "prediction": prediction_vals.tolist(),
+            "endog": data.endog,
+            "prediction": prediction_vals,
             "confidence_intervals": {
                 "intervals": prediction_conf_ints,
                 "confidence_level": round(1 - significance_level, 2),
             },
         }
+        if search is not None:
+            result["search"] = search
+        if return_params:
+            result["params"] = np.asarray(fitted_model.params).tolist()
+        return result
 
     elif model_type in ["HWES", "HES", "SES"]:
         logger.info(f"Используется модель сглаживания {model_type}")
@@ -99,11 +289,31 @@ def forecast(data: Dict, model_type: str, settings: Dict):
         if settings.get("seasonal", None) == "none":
             settings["seasonal"] = None
 
-        model = ExponentialSmoothingModel(**settings)
-        full_dates = extend_dates(data, steps)
-        summary = model.fit(data).summary().as_text()
+        full_dates = data.extended_dates(steps)
+        fit_started_at = time.perf_counter()
+        if (
+            model_type in ["SES", "HES"]
+            and ForecastingConfig.NUMPY_SMOOTHING
+            and NumpyExponentialSmoothingModel.supports(settings)
+        ):
+            logger.info(f"Модель {model_type} обучается быстрой реализацией на NumPy")
+            model = NumpyExponentialSmoothingModel(
+                initialization_method=settings["initialization_method"],
+                initial_level=settings.get("initial_level"),
+                initial_trend=settings.get("initial_trend"),
+                trend=settings.get("trend"),
+            )
+            # Полное саммари statsmodels для быстрой реализации недоступно
+            summary = build_summary(model.fit(data), "none" if summary_mode == "none" else "light")
+        else:
+            model = ExponentialSmoothingModel(**settings)
+            summary = build_summary(_fit_cached(model, data, model_type), summary_mode)
+        FORECAST_FIT_SECONDS.labels(
+            model_type=model_type,
+            order=f"trend={settings.get('trend')},seasonal={settings.get('seasonal')}",
+        ).observe(time.perf_counter() - fit_started_at)
 
-        prediction_vals = model.forecast(steps)
+        prediction_vals = np.asarray(model.forecast(steps), dtype=np.float64)
         validate_no_nans(prediction_vals, nan_found_message)
 
         logger.info(f"Прогноз по модели {model_type} успешно построен")
@@ -111,11 +321,53 @@ def forecast(data: Dict, model_type: str, settings: Dict):
         return {
             "summary": summary,
             "full_dates": full_dates,
-            "endog": data.get("endog"),
-            "prediction": prediction_vals.tolist(),
+            "endog": data.endog,
+            "prediction": prediction_vals,
             "confidence_intervals": {"intervals": None, "confidence_level": None},
         }
 
     else:
         logger.error(f"Выбрана неизвестная модель: {model_type}")
-        raise ValueError(unknown_model_message)
\ No newline at end of file
+        raise ValueError(unknown_model_message)
+
+
+def summarize(data: Union[TimeSeries, Dict], model_type: str, settings: Dict, params: List[float]) -> str:
+    """
+    Строит полное саммари SARIMA-модели по ранее обученным параметрам без переобучения.
+
+    Используется для отложенного получения саммари прогнозов, построенных в облегчённом режиме.
+
+    Parameters
+    ----------
+    data : TimeSeries or dict
+        Данные временного ряда, на которых была обучена модель.
+    model_type : str
+        Тип модели (одна из SARIMA-моделей).
+    settings : dict
+        Параметры модели в том виде, в котором они передавались в `forecast`.
+    params : list of float
+        Вектор обученных параметров модели.
+
+    Returns
+    -------
+    str
+        Полное саммари модели.
+
+    Raises
+    ------
+    ValueError
+        Если тип модели не относится к SARIMA-моделям.
+    """
+
+    if model_type not in ["SARIMA", "ARIMA", "ARMA", "AR", "MA"]:
+        raise ValueError(f"Отложенное саммари не поддерживается для модели {model_type}")
+
+    settings = dict(settings)
+    _snake_case_keys(settings)
+    for param in ("steps", "significance_level", "summary_mode"):
+        settings.pop(param, None)
+
+    model = SARIMAXModel(**settings)
+    summary = build_summary(model.apply(data, params), "full")
+    logger.info(f"Полное саммари модели {model_type} построено по сохранённым параметрам")
+    return summary
@@ -0,0 +1,160 @@
+"""
+Кэш обученных моделей прогнозирования.
+
+Кэш живёт в памяти каждого процесса пула прогнозирования: повторный запрос с теми же
+данными и параметрами обучения пропускает `fit()` и сразу строит прогноз. Счётчики
+попаданий и промахов могут разделяться между процессами через `multiprocessing.Value`.
+"""
+
+import json
+import time
+import hashlib
+import multiprocessing
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from .config import ForecastingConfig
+from services.timeseries import TimeSeries
+
+
+class FittedModelCache:
+    """
+    LRU-кэш обученных моделей с ограничением по размеру и времени жизни записей.
+
+    Methods
+    -------
+    make_key(data, model_type, settings)
+        Вычисление ключа кэша по данным и параметрам обучения.
+    get(key)
+        Получение обученной модели из кэша.
+    put(key, fitted_model)
+        Сохранение обученной модели в кэш.
+    stats()
+        Текущие значения счётчиков кэша.
+    """
+
+    def __init__(self, max_size: int, ttl: float, hits=None, misses=None):
+        """
+        Parameters
+        ----------
+        max_size : int
+            Максимальное количество записей в кэше.
+        ttl : float
+            Время жизни записи в секундах.
+        hits : multiprocessing.Value, optional
+            Счётчик попаданий (может быть общим для нескольких процессов).
+        misses : multiprocessing.Value, optional
+            Счётчик промахов (может быть общим для нескольких процессов).
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = hits if hits is not None else multiprocessing.Value("L", 0)
+        self.misses = misses if misses is not None else multiprocessing.Value("L", 0)
+        self._entries = OrderedDict()
+
+    @staticmethod
+    def make_key(data: TimeSeries, model_type: str, settings: Dict) -> str:
+        """
+        Parameters
+        ----------
+        data : TimeSeries
+            Данные временного ряда.
+        model_type : str
+            Тип модели.
+        settings : dict
+            Параметры модели, влияющие на обучение.
+
+        Returns
+        -------
+        str
+            Хэш, однозначно определяющий обученную модель.
+        """
+        digest = hashlib.sha256()
+        digest.update(model_type.encode())
+        digest.update(json.dumps(settings, sort_keys=True, default=str).encode())
+        digest.update(data.endog.tobytes())
+        if data.dates is not None:
+            digest.update(data.dates.view(np.int64).tobytes())
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Parameters
+        ----------
+        key : str
+            Ключ кэша.
+
+        Returns
+        -------
+        Any or None
+            Обученная модель или None, если запись отсутствует или устарела.
+        """
+        entry = self._entries.get(key)
+        if entry is not None and time.monotonic() - entry[0] > self.ttl:
+            del self._entries[key]
+            entry = None
+
+        if entry is None:
+            with self.misses.get_lock():
+                self.misses.value += 1
+            return None
+
+        self._entries.move_to_end(key)
+        with self.hits.get_lock():
+            self.hits.value += 1
+        return entry[1]
+
+    def put(self, key: str, fitted_model: Any) -> None:
+        """
+        Parameters
+        ----------
+        key : str
+            Ключ кэша.
+        fitted_model : Any
+            Обученная модель (результаты `fit()` из statsmodels).
+        """
+        self._entries[key] = (time.monotonic(), fitted_model)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns
+        -------
+        dict
+            Количество попаданий, промахов, доля попаданий и текущий размер кэша процесса.
+        """
+        hits, misses = self.hits.value, self.misses.value
+        total = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / total, 4) if total else 0.0,
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl": self.ttl,
+        }
+
+
+fitted_models_cache = FittedModelCache(
+    max_size=ForecastingConfig.FITTED_CACHE_MAX_SIZE,
+    ttl=ForecastingConfig.FITTED_CACHE_TTL,
+)
+
+
+def init_cache_counters(hits, misses) -> None:
+    """
+    Инициализатор процесса пула: подключает общие счётчики попаданий и промахов кэша.
+
+    Parameters
+    ----------
+    hits : multiprocessing.Value
+        Общий счётчик попаданий.
+    misses : multiprocessing.Value
+        Общий счётчик промахов.
+    """
+    fitted_models_cache.hits = hits
+    fitted_models_cache.misses = misses
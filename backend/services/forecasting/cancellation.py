@@ -0,0 +1,90 @@
+"""
+Крайние сроки и отмена прогнозов, выполняемых в процессах пула.
+
+Задача пула выполняется в "области отмены": для неё известен крайний срок (время UNIX) и,
+опционально, номер ячейки в общем массиве флагов отмены, который родительский процесс
+выставляет, когда результат больше не нужен (например, клиент отключился). Оптимизаторы
+statsmodels и scipy вызывают `check_cancelled` на каждой итерации, поэтому отменённое
+обучение прерывается исключением, а процесс пула освобождается для других задач.
+
+Вне области отмены (например, в планировщике) проверка ничего не делает.
+"""
+
+import time
+from typing import Any, Callable, Optional
+
+
+_cancel_flags = None
+_slot: Optional[int] = None
+_deadline: Optional[float] = None
+
+
+class ForecastCancelledError(Exception):
+    """Прогноз отменён: его результат больше не нужен."""
+
+
+class ForecastTimeoutError(ForecastCancelledError):
+    """Прогноз не уложился в отведённое время."""
+
+
+def init_cancel_flags(cancel_flags) -> None:
+    """
+    Инициализатор процесса пула: подключает общий массив флагов отмены.
+
+    Parameters
+    ----------
+    cancel_flags : multiprocessing.RawArray
+        Массив флагов отмены задач (ненулевое значение — задача отменена).
+    """
+    global _cancel_flags
+    _cancel_flags = cancel_flags
+
+
+def check_cancelled(*_: Any) -> None:
+    """
+    Прерывает выполнение, если текущая задача отменена или истёк её крайний срок.
+
+    Принимает и игнорирует любые позиционные аргументы, поэтому может передаваться
+    в оптимизаторы как `callback`.
+
+    Raises
+    ------
+    ForecastTimeoutError
+        Если истёк крайний срок задачи.
+    ForecastCancelledError
+        Если задача отменена родительским процессом.
+    """
+    if _deadline is not None and time.time() > _deadline:
+        raise ForecastTimeoutError("Превышено время построения прогноза")
+    if _slot is not None and _cancel_flags is not None and _cancel_flags[_slot]:
+        raise ForecastCancelledError("Построение прогноза отменено")
+
+
+def run_cancellable(slot: Optional[int], deadline: Optional[float], fn: Callable, *args) -> Any:
+    """
+    Выполняет функцию в области отмены (вызывается в процессе пула).
+
+    Parameters
+    ----------
+    slot : int or None
+        Номер ячейки в массиве флагов отмены (None — отмена только по крайнему сроку).
+    deadline : float or None
+        Крайний срок выполнения (время UNIX); None — без ограничения.
+    fn : Callable
+        Выполняемая функция.
+    *args
+        Аргументы функции.
+
+    Returns
+    -------
+    Any
+        Результат функции.
+    """
+    global _slot, _deadline
+    _slot, _deadline = slot, deadline
+    try:
+        # Задача могла быть отменена или просрочена, пока ждала в очереди пула
+        check_cancelled()
+        return fn(*args)
+    finally:
+        _slot, _deadline = None, None
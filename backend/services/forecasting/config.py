@@ -0,0 +1,42 @@
+"""Константы конфигурации модуля прогнозирования."""
+
+
+class ForecastingConfig:
+    """Конфигурация параметров прогнозирования.
+
+    Attributes
+    ----------
+    FITTED_CACHE_MAX_SIZE : int
+        Максимальное количество обученных моделей, хранимых в кэше одного процесса-воркера.
+
+    FITTED_CACHE_TTL : int
+        Время жизни записи в кэше обученных моделей в секундах.
+
+    AUTO_SARIMA_MAX_P, AUTO_SARIMA_MAX_Q : int
+        Максимальные несезонные порядки AR и MA при автоматическом подборе модели.
+
+    AUTO_SARIMA_MAX_SEASONAL_P, AUTO_SARIMA_MAX_SEASONAL_Q : int
+        Максимальные сезонные порядки AR и MA при автоматическом подборе модели.
+
+    AUTO_SARIMA_MAX_CANDIDATES : int
+        Максимальное количество моделей, обучаемых при автоматическом подборе (верхняя граница
+        и для значения, переданного пользователем).
+
+    AUTO_SARIMA_TIME_LIMIT : float
+        Ограничение времени автоматического подбора в секундах (верхняя граница и для значения,
+        переданного пользователем).
+
+    NUMPY_SMOOTHING : bool
+        Обучать модели SES и HES (без сезонности и затухания тренда) быстрой реализацией на NumPy
+        вместо statsmodels. Полное саммари для таких моделей заменяется облегчённым.
+    """
+
+    FITTED_CACHE_MAX_SIZE = 32
+    FITTED_CACHE_TTL = 60 * 30
+    AUTO_SARIMA_MAX_P = 3
+    AUTO_SARIMA_MAX_Q = 3
+    AUTO_SARIMA_MAX_SEASONAL_P = 2
+    AUTO_SARIMA_MAX_SEASONAL_Q = 2
+    AUTO_SARIMA_MAX_CANDIDATES = 30
+    AUTO_SARIMA_TIME_LIMIT = 60.0
+    NUMPY_SMOOTHING = True
@@ -7,6 +7,9 @@
 from statsmodels.tsa.statespace.sarimax import SARIMAX
 from statsmodels.tsa.holtwinters import SimpleExpSmoothing, Holt, ExponentialSmoothing
 
+from .cancellation import check_cancelled
+from services.timeseries import as_series
+
 
 class SARIMAXModel:
     """
@@ -18,6 +21,8 @@ class SARIMAXModel:
     -------
     fit(data)
         Обучение модели на данных.
+    apply(data, params)
+        Применение модели с фиксированными параметрами к новым данным.
     forecast(steps)
         Прогнозирование на заданное число шагов.
     detailed_forecast(steps)
@@ -70,20 +75,48 @@ class SARIMAXModel:
         }
         self.model = None
 
-    def fit(self, data: dict):
+    def fit(self, data: dict, **fit_kwargs):
         """
         Parameters
         ----------
-        data : dict
+        data : TimeSeries or dict
             Данные временного ряда для обучения.
+        **fit_kwargs
+            Дополнительные параметры `SARIMAX.fit` (например, `start_params`, `maxiter`).
 
         Returns
         -------
         SARIMAXResultsWrapper
             Обученная модель.
         """
-        self.model = SARIMAX(**data, **self.settings)
-        self.model = self.model.fit()
+        # Проверка отмены на каждой итерации оптимизатора
+        fit_kwargs.setdefault("callback", check_cancelled)
+        self.model = SARIMAX(**as_series(data).model_data(), **self.settings)
+        self.model = self.model.fit(**fit_kwargs)
+        return self.model
+
+    def apply(self, data: dict, params, **filter_kwargs):
+        """
+        Применение модели с фиксированными параметрами к новым данным без переобучения.
+
+        Вместо оптимизации выполняется один проход фильтра Калмана (аналог `results.apply`).
+
+        Parameters
+        ----------
+        data : TimeSeries or dict
+            Данные временного ряда.
+        params : array_like
+            Вектор ранее обученных параметров модели.
+        **filter_kwargs
+            Дополнительные параметры `SARIMAX.filter` (например, `cov_type`).
+
+        Returns
+        -------
+        SARIMAXResultsWrapper
+            Модель с отфильтрованными по новым данным состояниями.
+        """
+        self.model = SARIMAX(**as_series(data).model_data(), **self.settings)
+        self.model = self.model.filter(params, **filter_kwargs)
         return self.model
 
     def forecast(self, steps: int):
@@ -170,20 +203,23 @@ class ExponentialSmoothingModel:
         }
         self.model = None
 
-    def fit(self, data: dict):
+    def fit(self, data: dict, **fit_kwargs):
         """
         Parameters
         ----------
-        data : dict
+        data : TimeSeries or dict
             Данные временного ряда для обучения.
+        **fit_kwargs
+            Дополнительные параметры `ExponentialSmoothing.fit`.
 
         Returns
         -------
         ExponentialSmoothingResultsWrapper
             Обученная модель.
         """
-        self.model = ExponentialSmoothing(**data, **self.settings)
-        self.model = self.model.fit()
+        fit_kwargs.setdefault("minimize_kwargs", {"callback": check_cancelled})
+        self.model = ExponentialSmoothing(**as_series(data).model_data(), **self.settings)
+        self.model = self.model.fit(**fit_kwargs)
         return self.model
 
     def forecast(self, steps: int = 1):
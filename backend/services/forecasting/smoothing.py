@@ -0,0 +1,267 @@
+"""
+Быстрая реализация простого экспоненциального сглаживания и линейного метода Холта на NumPy.
+
+Для фиксированных параметров сглаживания ошибки одношагового прогноза линейно зависят
+от начальных уровня и тренда, поэтому оптимальные начальные значения находятся в замкнутой
+форме (метод наименьших квадратов), и оптимизировать остаётся только параметры сглаживания
+(одномерный поиск для SES, двумерный для метода Холта). Рекурсии сглаживания вычисляются
+линейными фильтрами (`scipy.signal.lfilter`), без цикла Python по наблюдениям.
+"""
+
+from typing import Dict, Optional, Tuple, Union
+
+import numpy as np
+from scipy.optimize import minimize, minimize_scalar
+from scipy.signal import lfilter
+
+from .cancellation import check_cancelled
+from services.timeseries import TimeSeries, as_series
+
+
+class SmoothingResults:
+    """
+    Результаты обучения модели экспоненциального сглаживания.
+
+    Attributes
+    ----------
+    params : dict
+        Параметры модели (smoothing_level, smoothing_trend, initial_level, initial_trend).
+    sse : float
+        Сумма квадратов ошибок одношагового прогноза.
+    aic, bic : float
+        Информационные критерии (в той же форме, что и в statsmodels).
+    level, trend : float
+        Уровень и тренд в конце ряда.
+    """
+
+    def __init__(self, params: Dict, sse: float, nobs: int, k: int, level: float, trend: float):
+        self.params = params
+        self.sse = sse
+        self.nobs = nobs
+        self.level = level
+        self.trend = trend
+        log_sse = np.log(sse / nobs) if sse > 0 else -np.inf
+        self.aic = nobs * log_sse + 2 * k
+        self.bic = nobs * log_sse + k * np.log(nobs)
+
+    def forecast(self, steps: int) -> np.ndarray:
+        return self.level + self.trend * np.arange(1, steps + 1)
+
+
+def _system(alpha: float, beta: float) -> Tuple[float, float, float, float, float, float]:
+    """
+    Матрица перехода D и вектор усиления g рекурсии x_t = D x_{t-1} + g y_t.
+
+    Состояние x_t = [l_t, b_t], одношаговый прогноз h' x_{t-1}, h = [1, 1].
+    """
+
+    g1, g2 = alpha, alpha * beta
+    d11, d12 = 1 - alpha, 1 - alpha
+    d21, d22 = -g2, 1 - g2
+    return d11, d12, d21, d22, g1, g2
+
+
+def _evaluate(
+    y: np.ndarray,
+    alpha: float,
+    beta: float,
+    trend: bool,
+    initial_level: Optional[float],
+    initial_trend: Optional[float],
+) -> Tuple[float, float, float]:
+    """
+    Сумма квадратов ошибок и оптимальные (или заданные) начальные уровень и тренд.
+
+    Одношаговые прогнозы при нулевом начальном состоянии и вклад начального состояния
+    (h' D^t e1, h' D^t e2) вычисляются двумя линейными фильтрами с общим знаменателем.
+    """
+
+    n = len(y)
+    d11, d12, d21, d22, g1, g2 = _system(alpha, beta)
+    trace, det = d11 + d22, d11 * d22 - d12 * d21
+    denominator = [1.0, -trace, det]
+
+    residual = y - lfilter([0.0, g1 + g2, -d22 * g1 + d12 * g2 + d21 * g1 - d11 * g2], denominator, y)
+
+    impulse = np.zeros(n)
+    impulse[0] = 1.0
+    response = lfilter([1.0], denominator, impulse)
+    phi_level = response.copy()
+    phi_level[1:] += (d11 + d21 - trace) * response[:-1]
+
+    if initial_level is not None:
+        l0 = initial_level
+        b0 = initial_trend if trend and initial_trend is not None else 0.0
+        phi_trend = response.copy()
+        phi_trend[1:] += (d12 + d22 - trace) * response[:-1]
+        errors = residual - phi_level * l0 - phi_trend * b0
+    elif trend:
+        phi_trend = response.copy()
+        phi_trend[1:] += (d12 + d22 - trace) * response[:-1]
+        # Нормальные уравнения 2x2 для начальных уровня и тренда
+        a11, a12, a22 = phi_level @ phi_level, phi_level @ phi_trend, phi_trend @ phi_trend
+        r1, r2 = phi_level @ residual, phi_trend @ residual
+        det_normal = a11 * a22 - a12 * a12
+        if abs(det_normal) > 1e-12 * max(a11 * a22, 1.0):
+            l0, b0 = (a22 * r1 - a12 * r2) / det_normal, (a11 * r2 - a12 * r1) / det_normal
+        else:
+            l0, b0 = r1 / a11, 0.0
+        errors = residual - phi_level * l0 - phi_trend * b0
+    else:
+        l0, b0 = (phi_level @ residual) / (phi_level @ phi_level), 0.0
+        errors = residual - phi_level * l0
+
+    return float(errors @ errors), float(l0), float(b0)
+
+
+def _final_state(y: np.ndarray, alpha: float, beta: float, l0: float, b0: float) -> Tuple[float, float]:
+    """Уровень и тренд после прохода по всему ряду."""
+
+    d11, d12, d21, d22, g1, g2 = _system(alpha, beta)
+    denominator = [1.0, -(d11 + d22), d11 * d22 - d12 * d21]
+    level = lfilter([g1, -d22 * g1 + d12 * g2], denominator, y)[-1]
+    slope = lfilter([g2, d21 * g1 - d11 * g2], denominator, y)[-1]
+
+    # Вклад начального состояния: D^n [l0, b0]
+    transition = np.array([[d11, d12], [d21, d22]])
+    level_0, slope_0 = np.linalg.matrix_power(transition, len(y)) @ np.array([l0, b0])
+    return float(level + level_0), float(slope + slope_0)
+
+
+class NumpyExponentialSmoothingModel:
+    """
+    Модель простого экспоненциального сглаживания или линейного метода Холта на NumPy.
+
+    Поддерживает аддитивный тренд без затухания и без сезонности, инициализацию
+    'estimated' (начальные значения оцениваются) и 'known' (начальные значения заданы).
+
+    Methods
+    -------
+    supports(settings)
+        Проверка, может ли модель с такими параметрами обучаться на NumPy.
+    fit(data)
+        Обучение модели.
+    forecast(steps)
+        Прогнозирование.
+    """
+
+    COARSE_GRID_SIZE = 5
+    TOLERANCE = 1e-5
+
+    def __init__(
+        self,
+        initialization_method: str = "estimated",
+        initial_level: float = None,
+        initial_trend: float = None,
+        trend: str = None,
+    ):
+        """
+        Parameters
+        ----------
+        initialization_method : str, optional
+            Метод инициализации ('estimated' или 'known').
+        initial_level : float, optional
+            Начальный уровень (требуется при initialization_method='known').
+        initial_trend : float, optional
+            Начальный тренд (требуется при initialization_method='known' и наличии тренда).
+        trend : str, optional
+            Тип тренда: None или 'add'.
+        """
+        self.settings = {
+            "initialization_method": initialization_method,
+            "initial_level": initial_level,
+            "initial_trend": initial_trend,
+            "trend": trend,
+        }
+        self.model = None
+
+    @staticmethod
+    def supports(settings: Dict) -> bool:
+        """
+        Parameters
+        ----------
+        settings : dict
+            Параметры модели экспоненциального сглаживания (в формате `ExponentialSmoothingModel`).
+
+        Returns
+        -------
+        bool
+            True, если модель не требует сезонности, затухания или мультипликативного тренда.
+        """
+        return (
+            settings.get("trend") in (None, "add")
+            and settings.get("seasonal") is None
+            and not settings.get("damped_trend", False)
+            and settings.get("initialization_method") in ("estimated", "known")
+        )
+
+    def fit(self, data: Union[TimeSeries, Dict]) -> SmoothingResults:
+        """
+        Parameters
+        ----------
+        data : TimeSeries or dict
+            Данные временного ряда для обучения.
+
+        Returns
+        -------
+        SmoothingResults
+            Обученная модель.
+        """
+        y = as_series(data).endog
+        if len(y) < 2:
+            raise ValueError("Для экспоненциального сглаживания нужно хотя бы 2 наблюдения")
+
+        trend = self.settings["trend"] == "add"
+        known = self.settings["initialization_method"] == "known"
+        initial_level = self.settings["initial_level"] if known else None
+        initial_trend = self.settings["initial_trend"] if known else None
+
+        def sse(alpha: float, beta: float) -> float:
+            check_cancelled()
+            value = _evaluate(y, alpha, beta, trend, initial_level, initial_trend)[0]
+            return value if np.isfinite(value) else np.inf
+
+        if trend:
+            # Стартовая точка — лучший узел грубой сетки, далее уточнение L-BFGS-B в границах [0, 1]
+            grid = np.linspace(0.0, 1.0, self.COARSE_GRID_SIZE)
+            start = min(((a, b) for a in grid for b in grid), key=lambda ab: sse(*ab))
+            result = minimize(
+                lambda x: sse(x[0], x[1]), x0=np.array(start), method="L-BFGS-B", bounds=[(0.0, 1.0)] * 2
+            )
+            alpha, beta = (float(v) for v in result.x) if sse(*result.x) <= sse(*start) else start
+        else:
+            result = minimize_scalar(lambda a: sse(a, 0.0), bounds=(0.0, 1.0), method="bounded",
+                                     options={"xatol": self.TOLERANCE})
+            alpha, beta = float(result.x), 0.0  # beta = 0 — модель без тренда
+            # Ограниченный метод Брента не проверяет сами границы отрезка
+            alpha = min((alpha, 0.0, 1.0), key=lambda a: sse(a, 0.0))
+
+        sse_value, l0, b0 = _evaluate(y, alpha, beta, trend, initial_level, initial_trend)
+
+        level, slope = _final_state(y, alpha, beta, l0, b0)
+
+        params = {"smoothing_level": float(alpha)}
+        if trend:
+            params["smoothing_trend"] = float(beta)
+        params["initial_level"] = float(l0)
+        if trend:
+            params["initial_trend"] = float(b0)
+        # Начальные значения учитываются в числе параметров так же, как в statsmodels
+        k = len(params)
+
+        self.model = SmoothingResults(params, sse_value, len(y), k, float(level), float(slope))
+        return self.model
+
+    def forecast(self, steps: int = 1) -> np.ndarray:
+        """
+        Parameters
+        ----------
+        steps : int, optional
+            Количество шагов для прогноза (по умолчанию 1).
+
+        Returns
+        -------
+        ndarray
+            Прогнозируемые значения.
+        """
+        return self.model.forecast(steps)
@@ -0,0 +1,561 @@
+"""
+Подбор порядков SARIMA-модели.
+
+Перебор по сетке: кандидаты обучаются параллельно в пуле процессов через общую обёртку
+`SARIMAXModel`. Заведомо неперспективные кандидаты (не сошедшиеся или с информационным
+критерием хуже лучшего найденного на заданный запас) не проверяются на отложенной выборке.
+Результаты пишутся в JSONL-файл по мере готовности, поэтому прерванный перебор продолжается
+с места остановки.
+
+Пошаговый поиск: ограниченный по времени и числу кандидатов обход соседних порядков
+(в духе алгоритма Хиндмана-Хандакара) внутри одного процесса, при котором обучение каждого
+кандидата стартует с параметров уже обученного соседа.
+"""
+
+import os
+import json
+import time
+import itertools
+import warnings
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, List, Optional, Iterable, Tuple, Callable, Union
+
+import numpy as np
+
+from statsmodels.tsa.statespace.sarimax import SARIMAX
+
+from .models import SARIMAXModel
+from .cancellation import ForecastCancelledError, check_cancelled
+from services.timeseries import TimeSeries, as_series
+
+
+def evaluate_candidate(
+    train: TimeSeries,
+    test_endog: np.ndarray,
+    order: Tuple[int, int, int],
+    seasonal_order: Tuple[int, int, int, int],
+    settings: Dict,
+    criterion: str = "aic",
+    criterion_bound: Optional[float] = None,
+    maxiter: int = 50,
+) -> Dict:
+    """
+    Обучает одного кандидата и оценивает его на отложенной выборке.
+
+    Parameters
+    ----------
+    train : TimeSeries
+        Обучающая часть ряда.
+    test_endog : np.ndarray
+        Отложенная часть ряда для расчёта RMSE.
+    order : tuple of int
+        Несезонный порядок (p, d, q).
+    seasonal_order : tuple of int
+        Сезонный порядок (P, D, Q, s).
+    settings : dict
+        Прочие параметры `SARIMAXModel` (trend, enforce_stationarity, enforce_invertibility).
+    criterion : str, optional
+        Информационный критерий для отсечения кандидатов ("aic" или "bic").
+    criterion_bound : float, optional
+        Кандидаты с критерием выше этой границы не проверяются на отложенной выборке.
+    maxiter : int, optional
+        Максимальное число итераций оптимизатора.
+
+    Returns
+    -------
+    dict
+        Запись с порядками, значениями AIC/BIC, RMSE и причиной отсечения (если есть).
+    """
+
+    p, d, q = order
+    P, D, Q, s = seasonal_order
+    record = {
+        "order": list(order),
+        "seasonal_order": list(seasonal_order),
+        "aic": None,
+        "bic": None,
+        "rmse": None,
+        "converged": False,
+        "pruned": None,
+    }
+
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            model = SARIMAXModel(p=p, d=d, q=q, P=P, D=D, Q=Q, s=s, **settings)
+            fitted_model = model.fit(train, disp=False, maxiter=maxiter)
+            record["aic"] = float(fitted_model.aic)
+            record["bic"] = float(fitted_model.bic)
+            record["converged"] = bool(fitted_model.mle_retvals.get("converged", True))
+
+            if not record["converged"]:
+                record["pruned"] = "not converged"
+            elif not np.isfinite(record[criterion]):
+                record["pruned"] = f"{criterion} is not finite"
+            elif criterion_bound is not None and record[criterion] > criterion_bound:
+                record["pruned"] = f"{criterion} bound"
+            else:
+                prediction = np.asarray(model.forecast(len(test_endog)), dtype=np.float64)
+                errors = prediction - np.asarray(test_endog, dtype=np.float64)
+                record["rmse"] = float(np.sqrt(np.mean(errors ** 2)))
+    except ForecastCancelledError:
+        raise
+    except Exception as e:
+        record["pruned"] = f"error: {e}"
+
+    return record
+
+
+def candidate_key(order: Iterable[int], seasonal_order: Iterable[int]) -> str:
+    """
+    Parameters
+    ----------
+    order : iterable of int
+        Несезонный порядок (p, d, q).
+    seasonal_order : iterable of int
+        Сезонный порядок (P, D, Q, s).
+
+    Returns
+    -------
+    str
+        Строковый ключ кандидата, используемый при возобновлении перебора.
+    """
+    return f"{tuple(order)}x{tuple(seasonal_order)}"
+
+
+class SARIMAGridSearch:
+    """
+    Параллельный возобновляемый перебор порядков SARIMA-модели.
+
+    Methods
+    -------
+    candidates()
+        Список кандидатов в порядке возрастания сложности модели.
+    run(progress)
+        Запуск перебора.
+    best(metric)
+        Лучший кандидат по выбранной метрике.
+    """
+
+    def __init__(
+        self,
+        data: Union[TimeSeries, Dict],
+        p_values: Iterable[int] = range(3),
+        d_values: Iterable[int] = range(3),
+        q_values: Iterable[int] = range(3),
+        P_values: Iterable[int] = range(3),
+        D_values: Iterable[int] = range(3),
+        Q_values: Iterable[int] = range(3),
+        s: int = 0,
+        settings: Optional[Dict] = None,
+        test_size: float = 0.2,
+        criterion: str = "aic",
+        criterion_margin: Optional[float] = None,
+        maxiter: int = 50,
+        results_path: Optional[str] = None,
+        max_workers: Optional[int] = None,
+    ):
+        """
+        Parameters
+        ----------
+        data : TimeSeries or dict
+            Данные временного ряда.
+        p_values, d_values, q_values : iterable of int, optional
+            Перебираемые значения несезонных порядков.
+        P_values, D_values, Q_values : iterable of int, optional
+            Перебираемые значения сезонных порядков.
+        s : int, optional
+            Количество периодов в сезоне.
+        settings : dict, optional
+            Прочие параметры `SARIMAXModel` (trend, enforce_stationarity, enforce_invertibility).
+        test_size : float, optional
+            Доля ряда, откладываемая для расчёта RMSE.
+        criterion : str, optional
+            Информационный критерий для отсечения кандидатов ("aic" или "bic").
+        criterion_margin : float, optional
+            Запас относительно лучшего значения критерия; кандидаты хуже него не проверяются
+            на отложенной выборке. Если не задан, отсекаются только не сошедшиеся кандидаты.
+        maxiter : int, optional
+            Максимальное число итераций оптимизатора для одного кандидата.
+        results_path : str, optional
+            Путь к JSONL-файлу с результатами; уже оценённые кандидаты из него пропускаются.
+        max_workers : int, optional
+            Количество процессов пула (по умолчанию — количество ядер).
+        """
+        if criterion not in ("aic", "bic"):
+            raise ValueError("criterion должен быть 'aic' или 'bic'")
+
+        data = as_series(data)
+        train_size = int(len(data) * (1 - test_size))
+        if train_size < 2 or train_size >= len(data):
+            raise ValueError("Недостаточно данных для разбиения на обучающую и отложенную выборки")
+
+        self.train = data[:train_size]
+        self.test_endog = data.endog[train_size:]
+        self.grid = tuple(list(values) for values in (p_values, d_values, q_values, P_values, D_values, Q_values))
+        self.s = s
+        self.settings = settings or {}
+        self.criterion = criterion
+        self.criterion_margin = criterion_margin
+        self.maxiter = maxiter
+        self.results_path = Path(results_path) if results_path else None
+        self.max_workers = max_workers or os.cpu_count()
+        self.results = []
+
+    def candidates(self) -> List[Tuple[Tuple[int, int, int], Tuple[int, int, int, int]]]:
+        """
+        Returns
+        -------
+        list of tuple
+            Пары (order, seasonal_order), отсортированные по суммарному порядку модели,
+            чтобы простые модели задавали границу отсечения как можно раньше.
+        """
+        p_values, d_values, q_values, P_values, D_values, Q_values = self.grid
+        candidates = []
+        for p, d, q in itertools.product(p_values, d_values, q_values):
+            for P, D, Q in itertools.product(P_values, D_values, Q_values):
+                if self.s == 0 and (P, D, Q) != (0, 0, 0):
+                    continue
+                candidates.append(((p, d, q), (P, D, Q, self.s)))
+        return sorted(candidates, key=lambda c: sum(c[0]) + sum(c[1][:3]))
+
+    def _load_results(self) -> Dict[str, Dict]:
+        if not self.results_path or not self.results_path.exists():
+            return {}
+        done = {}
+        with open(self.results_path, "r") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # Недописанная строка прерванного запуска
+                done[candidate_key(record["order"], record["seasonal_order"])] = record
+        return done
+
+    def _criterion_bound(self) -> Optional[float]:
+        if self.criterion_margin is None:
+            return None
+        values = [r[self.criterion] for r in self.results if r["rmse"] is not None]
+        return min(values) + self.criterion_margin if values else None
+
+    def run(self, progress: Optional[Callable[[Dict], None]] = None) -> List[Dict]:
+        """
+        Запускает перебор кандидатов в пуле процессов.
+
+        Parameters
+        ----------
+        progress : callable, optional
+            Функция, вызываемая с записью каждого оценённого кандидата.
+
+        Returns
+        -------
+        list of dict
+            Записи всех оценённых кандидатов (включая загруженные из файла результатов).
+        """
+        done = self._load_results()
+        self.results = list(done.values())
+        pending = [
+            c for c in self.candidates() if candidate_key(*c) not in done
+        ]
+        if not pending:
+            return self.results
+
+        results_file = None
+        if self.results_path:
+            self.results_path.parent.mkdir(parents=True, exist_ok=True)
+            results_file = open(self.results_path, "a")
+
+        try:
+            with ProcessPoolExecutor(self.max_workers) as pool:
+                in_flight = set()
+                pending_iter = iter(pending)
+                while True:
+                    # Ограничиваем число задач в очереди, чтобы граница отсечения успевала уточняться
+                    while len(in_flight) < self.max_workers * 2:
+                        candidate = next(pending_iter, None)
+                        if candidate is None:
+                            break
+                        in_flight.add(pool.submit(
+                            evaluate_candidate,
+                            self.train,
+                            self.test_endog,
+                            candidate[0],
+                            candidate[1],
+                            self.settings,
+                            self.criterion,
+                            self._criterion_bound(),
+                            self.maxiter,
+                        ))
+                    if not in_flight:
+                        break
+
+                    completed, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in completed:
+                        record = future.result()
+                        self.results.append(record)
+                        if results_file:
+                            results_file.write(json.dumps(record) + "\n")
+                            results_file.flush()
+                        if progress:
+                            progress(record)
+        finally:
+            if results_file:
+                results_file.close()
+
+        return self.results
+
+    def best(self, metric: str = "rmse") -> Optional[Dict]:
+        """
+        Parameters
+        ----------
+        metric : str, optional
+            Метрика выбора лучшего кандидата ("rmse", "aic" или "bic").
+
+        Returns
+        -------
+        dict or None
+            Запись лучшего кандидата или None, если ни один кандидат не прошёл отбор.
+        """
+        valid = [r for r in self.results if r["rmse"] is not None]
+        if not valid:
+            return None
+        return min(valid, key=lambda r: r[metric])
+
+
+def record_to_params(record: Dict) -> Dict[str, int]:
+    """
+    Преобразует запись кандидата в параметры модели в формате `scheduler_config.yml`.
+
+    Parameters
+    ----------
+    record : dict
+        Запись кандидата с ключами "order" и "seasonal_order".
+
+    Returns
+    -------
+    dict
+        Параметры p, d, q, P, D, Q, s.
+    """
+    p, d, q = record["order"]
+    P, D, Q, s = record["seasonal_order"]
+    return {"p": p, "d": d, "q": q, "P": P, "D": D, "Q": Q, "s": s}
+
+
+def neighbour_start_params(model: SARIMAXModel, data: TimeSeries, neighbour_fit) -> np.ndarray:
+    """
+    Строит начальный вектор параметров модели по параметрам обученной соседней модели.
+
+    Совпадающие по имени параметры (коэффициенты AR/MA, тренд, дисперсия) берутся у соседа,
+    недостающие коэффициенты AR/MA обнуляются, остальные берутся из стартовых параметров statsmodels.
+
+    Parameters
+    ----------
+    model : SARIMAXModel
+        Обёртка модели, для которой строятся начальные параметры.
+    data : TimeSeries
+        Данные временного ряда.
+    neighbour_fit : SARIMAXResultsWrapper
+        Обученная соседняя модель.
+
+    Returns
+    -------
+    ndarray
+        Начальный вектор параметров.
+    """
+    sarimax = SARIMAX(**data.model_data(), **model.settings)
+    neighbour_params = dict(zip(neighbour_fit.model.param_names, np.asarray(neighbour_fit.params)))
+    start_params = np.asarray(sarimax.start_params, dtype=np.float64).copy()
+    for i, name in enumerate(sarimax.param_names):
+        if name in neighbour_params:
+            start_params[i] = neighbour_params[name]
+        elif name.startswith(("ar.", "ma.")):
+            start_params[i] = 0.0
+    return start_params
+
+
+class SearchTimeLimitError(Exception):
+    """Обучение кандидата прервано: истекло время пошагового поиска порядков."""
+
+
+def stepwise_search(
+    data: Union[TimeSeries, Dict],
+    d: int = 0,
+    D: int = 0,
+    s: int = 0,
+    settings: Optional[Dict] = None,
+    max_p: int = 3,
+    max_q: int = 3,
+    max_P: int = 2,
+    max_Q: int = 2,
+    max_candidates: int = 30,
+    time_limit: float = 60.0,
+    criterion: str = "aic",
+) -> Tuple[SARIMAXModel, Dict]:
+    """
+    Пошаговый поиск порядков SARIMA-модели с ограничением по времени и числу кандидатов.
+
+    Начиная с набора стартовых моделей, на каждом шаге перебираются соседние порядки
+    лучшей модели (изменение p, q, P, Q на единицу по отдельности и попарно) до тех пор,
+    пока информационный критерий улучшается и не исчерпан бюджет. Порядки дифференцирования
+    d и D фиксированы. Каждый кандидат обучается не более одного раза (в том числе
+    неудачный); лучшая модель выбирается среди сошедшихся, а не сошедшиеся используются,
+    только если не сошёлся ни один кандидат.
+
+    Parameters
+    ----------
+    data : TimeSeries or dict
+        Данные временного ряда.
+    d, D : int, optional
+        Несезонная и сезонная степени дифференцирования.
+    s : int, optional
+        Количество периодов в сезоне (0 — несезонная модель).
+    settings : dict, optional
+        Прочие параметры `SARIMAXModel` (trend, enforce_stationarity, enforce_invertibility).
+    max_p, max_q, max_P, max_Q : int, optional
+        Максимальные значения перебираемых порядков.
+    max_candidates : int, optional
+        Максимальное количество обучаемых кандидатов.
+    time_limit : float, optional
+        Ограничение времени поиска в секундах. Проверяется перед обучением каждого кандидата
+        и на каждой итерации оптимизатора: обучение, не уложившееся в оставшееся время,
+        прерывается, а кандидат попадает в трассу с ошибкой. Превышение ограничения не больше
+        длительности одной итерации оптимизатора; исключение — первая обученная модель,
+        обучение которой не прерывается (ограничено только крайним сроком прогноза).
+    criterion : str, optional
+        Информационный критерий выбора модели ("aic" или "bic").
+
+    Returns
+    -------
+    tuple
+        Обёртка лучшей обученной модели и словарь с порядками лучшей модели и трассой поиска.
+
+    Raises
+    ------
+    ValueError
+        Если ни один кандидат не удалось обучить.
+    """
+
+    data = as_series(data)
+    settings = settings or {}
+    seasonal = s > 1
+    if not seasonal:
+        D, max_P, max_Q = 0, 0, 0
+
+    started_at = time.monotonic()
+    visited = set()
+    fitted = {}
+    unconverged = {}
+    trace = []
+
+    def budget_left() -> bool:
+        return len(trace) < max_candidates and time.monotonic() - started_at < time_limit
+
+    def check_budget(*_) -> None:
+        # Вызывается оптимизатором на каждой итерации вместо `check_cancelled`.
+        # Пока не обучена ни одна модель, обучение не прерывается (иначе поиску нечего вернуть)
+        check_cancelled()
+        if (fitted or unconverged) and time.monotonic() - started_at >= time_limit:
+            raise SearchTimeLimitError("Превышено время подбора порядков модели")
+
+    def evaluate(p: int, q: int, P: int, Q: int, neighbour_key=None):
+        key = (p, q, P, Q)
+        if key in visited or not budget_left():
+            return
+        if not (0 <= p <= max_p and 0 <= q <= max_q and 0 <= P <= max_P and 0 <= Q <= max_Q):
+            return
+        visited.add(key)
+
+        model = SARIMAXModel(p=p, d=d, q=q, P=P, D=D, Q=Q, s=s if seasonal else 0, **settings)
+        record = {
+            "order": [p, d, q],
+            "seasonal_order": [P, D, Q, s if seasonal else 0],
+            criterion: None,
+            "converged": False,
+            "warm_start": False,
+            "fit_time": None,
+            "error": None,
+        }
+        fit_started_at = time.monotonic()
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            fitted_model = None
+            try:
+                if neighbour_key is not None:
+                    try:
+                        start_params = neighbour_start_params(model, data, fitted[neighbour_key][1].model)
+                        fitted_model = model.fit(data, start_params=start_params, disp=False, callback=check_budget)
+                        record["warm_start"] = True
+                    except (ForecastCancelledError, SearchTimeLimitError):
+                        raise
+                    except Exception:
+                        fitted_model = None
+                if fitted_model is None or not fitted_model.mle_retvals.get("converged", True):
+                    fitted_model = model.fit(data, disp=False, callback=check_budget)
+                    record["warm_start"] = False
+                record[criterion] = float(getattr(fitted_model, criterion))
+                record["converged"] = bool(fitted_model.mle_retvals.get("converged", True))
+            except ForecastCancelledError:
+                raise
+            except Exception as e:
+                record["error"] = str(e)
+        record["fit_time"] = round(time.monotonic() - fit_started_at, 4)
+        trace.append(record)
+
+        if record[criterion] is not None and np.isfinite(record[criterion]):
+            (fitted if record["converged"] else unconverged)[key] = (record, model)
+
+    def best_key(models: Optional[Dict] = None):
+        models = fitted if models is None else models
+        return min(models, key=lambda k: models[k][0][criterion]) if models else None
+
+    initial = [(2, 2, 1, 1), (0, 0, 0, 0), (1, 0, 1, 0), (0, 1, 0, 1)]
+    for p, q, P, Q in initial:
+        if not seasonal:
+            P, Q = 0, 0
+        evaluate(min(p, max_p), min(q, max_q), min(P, max_P), min(Q, max_Q), neighbour_key=best_key())
+
+    current = best_key()
+    improved = current is not None
+    while improved and budget_left():
+        improved = False
+        p, q, P, Q = current
+        neighbours = [
+            (p - 1, q, P, Q), (p + 1, q, P, Q), (p, q - 1, P, Q), (p, q + 1, P, Q),
+            (p - 1, q - 1, P, Q), (p + 1, q + 1, P, Q),
+        ]
+        if seasonal:
+            neighbours += [
+                (p, q, P - 1, Q), (p, q, P + 1, Q), (p, q, P, Q - 1), (p, q, P, Q + 1),
+                (p, q, P - 1, Q - 1), (p, q, P + 1, Q + 1),
+            ]
+        for neighbour in neighbours:
+            evaluate(*neighbour, neighbour_key=current)
+            candidate = best_key()
+            if candidate != current:
+                current = candidate
+                improved = True
+                break
+
+    models = fitted
+    if current is None:
+        # Ни один кандидат не сошёлся: выбирается лучший из не сошедшихся
+        models = unconverged
+        current = best_key(models)
+    if current is None:
+        raise ValueError("Не удалось обучить ни одну модель в ходе автоматического подбора порядков")
+
+    best_record, best_model = models[current]
+    search = {
+        "best_order": best_record["order"],
+        "best_seasonal_order": best_record["seasonal_order"],
+        "criterion": criterion,
+        "candidates": len(trace),
+        "elapsed": round(time.monotonic() - started_at, 4),
+        "budget_exhausted": not budget_left(),
+        "trace": trace,
+    }
+    return best_model, search
@@ -1,48 +1,14 @@
 """
 Утилиты для обработки параметров и временных рядов.
 
-Содержит функции для расширения дат, проверки NaN, преобразования camelCase и валидации входных данных.
+Содержит функции для проверки NaN, преобразования camelCase, валидации входных данных
+и построения саммари обученных моделей.
 """
 
 import re
 import numpy as np
-from typing import List, Dict
 
 
-def extend_dates(data: Dict, steps: int) -> List:
-    """
-    Расширяет список дат на заданное количество шагов вперёд.
-
-    Если "dates" отсутствует или равен None, возвращается список числовых индексов.
-
-    Parameters
-    ----------
-    data : dict
-        Словарь с данными временного ряда. Ожидаемые ключи:
-            - "dates" (Optional[List[datetime]]): Список дат или None.
-            - "endog" (List[float]): Значения временного ряда.
-    steps : int
-        Количество шагов для расширения вперёд.
-
-    Returns
-    -------
-    List
-        Расширенный список дат или числовых индексов.
-    """
-
-    dates = data["dates"]
-   
-    if dates:
-        if len(dates) < 2:
-            raise ValueError("Список дат должен состоять хотя бы из 2ух элементов.")  
-        delta = dates[-1] - dates[-2]
-        last_date = dates[-1]
-        new_dates = [last_date + i*delta for i in range(1, steps + 1)]
-        return dates + new_dates
-    else:
-        return list(range(len(data["endog"]) + steps))
-    
-
 def is_camel_case(s: str) -> bool:
     """
     Проверяет, написана ли строка в стиле camelCase.
@@ -108,4 +74,53 @@ def validate_no_nans(data: np.ndarray, message: str) -> None:
     if np.isnan(data).any():
         raise ValueError(message)
     return
-    
\ No newline at end of file
+    
+
+
+SUMMARY_MODES = ("full", "light", "none")
+
+
+def build_summary(fitted_model, mode: str = "full") -> str:
+    """
+    Формирует текстовое саммари обученной модели.
+
+    Parameters
+    ----------
+    fitted_model : ResultsWrapper
+        Обученная модель statsmodels.
+    mode : str, optional
+        Режим саммари:
+        - "full": полная таблица statsmodels (стандартные ошибки и статистические тесты),
+        - "light": только оценки параметров и информационные критерии,
+        - "none": саммари не формируется.
+
+    Returns
+    -------
+    str
+        Текст саммари (пустая строка для режима "none").
+
+    Raises
+    ------
+    ValueError
+        При неизвестном режиме саммари.
+    """
+
+    if mode not in SUMMARY_MODES:
+        raise ValueError(f"Неизвестный режим саммари: {mode}")
+    if mode == "none":
+        return ""
+    if mode == "full":
+        return fitted_model.summary().as_text()
+
+    params = fitted_model.params
+    if isinstance(params, dict):
+        items = [(name, value) for name, value in params.items() if np.isscalar(value)]
+    else:
+        items = list(zip(fitted_model.model.param_names, np.asarray(params)))
+
+    lines = [f"{name:<24} {float(value): .6g}" for name, value in items]
+    for criterion in ("aic", "bic"):
+        value = getattr(fitted_model, criterion, None)
+        if value is not None:
+            lines.append(f"{criterion.upper():<24} {float(value): .6g}")
+    return "\n".join(lines)
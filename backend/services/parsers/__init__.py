@@ -5,10 +5,11 @@
 """
 
 from typing import Dict
+from services.timeseries import TimeSeries
 from .parsers import OpenMeteoParser
 
 
-def parse(parser_type: str, params: Dict) -> Dict:
+def parse(parser_type: str, params: Dict) -> TimeSeries:
     """
     Унифицированный интерфейс для получения данных от внешних API.
     
@@ -23,8 +24,8 @@ def parse(parser_type: str, params: Dict) -> Dict:
 
     Returns
     -------
-    Dict
-        Данные временного ряда с ключами "endog" и "dates".
+    TimeSeries
+        Данные временного ряда.
 
     Raises
     ------
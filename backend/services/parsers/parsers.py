@@ -11,6 +11,7 @@ import requests
 
 import httpx
 
+from services.timeseries import TimeSeries
 from .utils import convert_to_datetime
 
 
@@ -25,17 +26,17 @@ class BaseParser(ABC):
 
     Methods
     -------
-    fetch(params: Dict) -> Dict
+    fetch(params: Dict) -> TimeSeries
         Асинхронное получение и парсинг данных.
-    fetch_sync(params: Dict) -> Dict
+    fetch_sync(params: Dict) -> TimeSeries
         Синхронное получение и парсинг данных.
-    parse(raw_data: Dict) -> Dict
+    parse(raw_data: Dict) -> TimeSeries
         Преобразование сырых данных в единый формат (абстрактный метод).
     """
 
     URL = None
 
-    async def fetch(self, params: Dict) -> Dict:
+    async def fetch(self, params: Dict) -> TimeSeries:
         """
         Асинхронный метод запроса данных с API.
 
@@ -46,8 +47,8 @@ class BaseParser(ABC):
 
         Returns
         -------
-        Dict
-            Обработанные данные в формате словаря.
+        TimeSeries
+            Обработанные данные временного ряда.
 
         Raises
         ------
@@ -62,7 +63,7 @@ class BaseParser(ABC):
             response.raise_for_status()
             return self.parse(response.json())
     
-    def fetch_sync(self, params: Dict) -> Dict:
+    def fetch_sync(self, params: Dict) -> TimeSeries:
         """
         Синхронный метод запроса данных с API.
 
@@ -73,8 +74,8 @@ class BaseParser(ABC):
 
         Returns
         -------
-        Dict
-            Обработанные данные в формате словаря.
+        TimeSeries
+            Обработанные данные временного ряда.
 
         Raises
         ------
@@ -90,7 +91,7 @@ class BaseParser(ABC):
         return self.parse(response.json())
     
     @abstractmethod
-    def parse(self, raw_data: Dict) -> Dict:
+    def parse(self, raw_data: Dict) -> TimeSeries:
         """
         *Абстрактный* метод преобразования сырых данных в единый формат.
 
@@ -101,8 +102,8 @@ class BaseParser(ABC):
 
         Returns
         -------
-        Dict
-            Обработанные данные с ключами 'endog' и 'dates'.
+        TimeSeries
+            Обработанные данные временного ряда.
         """
         raise NotImplementedError
 
@@ -118,15 +119,15 @@ class OpenMeteoParser(BaseParser):
 
     Methods
     -------
-    parse(raw_data: Dict) -> Dict
+    parse(raw_data: Dict) -> TimeSeries
         Преобразование ответа Open-Meteo в стандартный формат.
     """
     # SOURCE_NAME = "openmeteo"
     URL = "https://archive-api.open-meteo.com/v1/archive"
 
-    def parse(self, raw_data: Dict) -> Dict:
+    def parse(self, raw_data: Dict) -> TimeSeries:
         """
-        Преобразование сырых данных Open-Meteo в формат с 'endog' и 'dates'.
+        Преобразование сырых данных Open-Meteo во временной ряд.
 
         Parameters
         ----------
@@ -135,10 +136,8 @@ class OpenMeteoParser(BaseParser):
 
         Returns
         -------
-        Dict
-            Данные временного ряда с ключами:
-            - 'endog': список значений
-            - 'dates': список datetime объектов
+        TimeSeries
+            Значения (пропуски API — NaN) и даты временного ряда.
 
         Raises
         ------
@@ -153,10 +152,7 @@ class OpenMeteoParser(BaseParser):
         if not param_name: 
             raise ValueError(f"No weather parameters found in {freq} data or your request is in incorrect format.")
         
-        return {
-            "endog": raw_data[freq][param_name],
-            "dates": convert_to_datetime(raw_data[freq]["time"]),
-        }
+        return TimeSeries(raw_data[freq][param_name], convert_to_datetime(raw_data[freq]["time"]))
 
 
 # Тестирование
@@ -1,16 +1,18 @@
 """
 Утилиты для преобразования данных с парсеров.
 
-Включает функции для конвертации строковых дат в datetime объекты.
+Включает функции для конвертации строковых дат в массив datetime64.
 """
 
-from datetime import datetime
 from typing import List
 
+import numpy as np
+import pandas as pd
 
-def convert_to_datetime(date_strings: List[str]) -> List[datetime]:
+
+def convert_to_datetime(date_strings: List[str]) -> np.ndarray:
     """
-    Конвертирует список строк в datetime объекты.
+    Конвертирует список строк в массив дат datetime64 (векторно, без цикла по строкам).
 
     Parameters
     ----------
@@ -19,7 +21,7 @@ def convert_to_datetime(date_strings: List[str]) -> List[datetime]:
 
     Returns
     -------
-    List[datetime]
-        Список datetime объектов.
+    np.ndarray
+        Даты в формате datetime64[ns].
     """
-    return [datetime.strptime(d, "%Y-%m-%dT%H:%M") for d in date_strings]
+    return pd.to_datetime(date_strings, format="%Y-%m-%dT%H:%M").to_numpy(dtype="datetime64[ns]")
@@ -0,0 +1,191 @@
+"""
+Компактное представление временного ряда.
+
+Ряд передаётся между конвертерами, парсерами, пулами процессов, моделями прогнозирования
+и сериализатором ответов API как массив значений float64 и массив дат datetime64[ns]
+вместо списков float и datetime. Такой ряд сериализуется (pickle) несколькими непрерывными
+буферами, передаётся в statsmodels без поэлементных преобразований и расширяется датами
+прогноза векторно.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+
+class TimeSeries:
+    """
+    Временной ряд: значения, даты наблюдений и частота.
+
+    Attributes
+    ----------
+    endog : np.ndarray
+        Значения ряда (float64); пропуски представлены значениями NaN.
+    dates : np.ndarray or None
+        Даты наблюдений (datetime64[ns]) или None для ряда без дат.
+    freq : str or None
+        Частота ряда в обозначениях pandas (например, "h", "D", "MS"), если её удалось определить.
+
+    Methods
+    -------
+    model_data()
+        Аргументы данных для моделей statsmodels.
+    extended_dates(steps)
+        Даты ряда, продолженные на горизонт прогноза.
+    to_datetimes()
+        Даты ряда в виде списка datetime.
+    """
+
+    def __init__(self, endog: Any, dates: Any = None, freq: Optional[str] = None):
+        """
+        Parameters
+        ----------
+        endog : array_like
+            Значения ряда. Значения None преобразуются в NaN.
+        dates : array_like, optional
+            Даты наблюдений (datetime, datetime64 или строки ISO 8601) той же длины, что и значения.
+            Пустой список равнозначен отсутствию дат.
+        freq : str, optional
+            Частота ряда. Если не задана, определяется по датам.
+
+        Raises
+        ------
+        ValueError
+            Если количество дат не совпадает с количеством значений.
+        """
+        self.endog = np.ascontiguousarray(np.asarray(endog, dtype=np.float64).reshape(-1))
+        if dates is None or len(dates) == 0:
+            self.dates = None
+            self.freq = None
+            return
+
+        self.dates = np.ascontiguousarray(pd.DatetimeIndex(dates).to_numpy(dtype="datetime64[ns]"))
+        if len(self.dates) != len(self.endog):
+            raise ValueError(
+                f"Количество дат ({len(self.dates)}) не совпадает с количеством значений ({len(self.endog)})"
+            )
+        self.freq = freq if freq is not None else self._infer_freq(self.dates)
+
+    @staticmethod
+    def _infer_freq(dates: np.ndarray) -> Optional[str]:
+        # Для определения частоты нужно не менее трёх дат с постоянным шагом
+        if len(dates) < 3:
+            return None
+        try:
+            return pd.infer_freq(pd.DatetimeIndex(dates))
+        except (TypeError, ValueError):
+            return None
+
+    def __len__(self) -> int:
+        return len(self.endog)
+
+    def __getitem__(self, key: slice) -> "TimeSeries":
+        if not isinstance(key, slice):
+            raise TypeError("TimeSeries поддерживает только срезы")
+        dates = self.dates[key] if self.dates is not None else None
+        freq = self.freq if key.step in (None, 1) else None
+        return TimeSeries(self.endog[key], dates, freq=freq)
+
+    def __repr__(self) -> str:
+        return f"TimeSeries(length={len(self)}, freq={self.freq!r}, dates={self.dates is not None})"
+
+    @property
+    def index(self) -> Optional[pd.DatetimeIndex]:
+        """Даты ряда в виде DatetimeIndex с частотой (или None для ряда без дат)."""
+        if self.dates is None:
+            return None
+        return pd.DatetimeIndex(self.dates, freq=self.freq)
+
+    def model_data(self) -> Dict[str, Any]:
+        """
+        Возвращает аргументы данных для моделей statsmodels (SARIMAX, ExponentialSmoothing).
+
+        Returns
+        -------
+        dict
+            Ключи endog, dates и freq.
+        """
+        return {"endog": self.endog, "dates": self.index, "freq": self.freq}
+
+    def extended_dates(self, steps: int) -> np.ndarray:
+        """
+        Продлевает даты ряда на заданное количество шагов вперёд.
+
+        Шаг определяется частотой ряда, а если она неизвестна — разностью двух последних дат.
+        Для ряда без дат возвращаются числовые индексы.
+
+        Parameters
+        ----------
+        steps : int
+            Количество шагов прогноза.
+
+        Returns
+        -------
+        np.ndarray
+            Даты ряда и прогноза (datetime64[ns]) или индексы 0..len+steps-1.
+
+        Raises
+        ------
+        ValueError
+            Если у ряда меньше двух дат.
+        """
+        if self.dates is None:
+            return np.arange(len(self) + steps)
+        if len(self.dates) < 2:
+            raise ValueError("Список дат должен состоять хотя бы из 2ух элементов.")
+
+        if self.freq is not None:
+            future = pd.date_range(self.dates[-1], periods=steps + 1, freq=self.freq)[1:].to_numpy()
+        else:
+            delta = self.dates[-1] - self.dates[-2]
+            future = self.dates[-1] + delta * np.arange(1, steps + 1)
+        return np.concatenate([self.dates, future.astype("datetime64[ns]")])
+
+    def to_datetimes(self) -> List[datetime]:
+        """
+        Возвращает даты ряда в виде списка datetime (например, для записи в БД).
+
+        Returns
+        -------
+        list of datetime
+            Даты ряда (пустой список для ряда без дат).
+        """
+        return to_datetimes(self.dates) if self.dates is not None else []
+
+
+def to_datetimes(dates: np.ndarray) -> List[datetime]:
+    """
+    Преобразует массив datetime64 в список datetime.
+
+    Parameters
+    ----------
+    dates : np.ndarray
+        Даты в формате datetime64.
+
+    Returns
+    -------
+    list of datetime
+        Даты в виде объектов datetime.
+    """
+    return pd.DatetimeIndex(dates).to_pydatetime().tolist()
+
+
+def as_series(data: Union[TimeSeries, Dict]) -> TimeSeries:
+    """
+    Приводит данные временного ряда к `TimeSeries`.
+
+    Parameters
+    ----------
+    data : TimeSeries or dict
+        Ряд или словарь с ключами "endog" и, опционально, "dates".
+
+    Returns
+    -------
+    TimeSeries
+        Ряд (тот же объект, если передан `TimeSeries`).
+    """
+    if isinstance(data, TimeSeries):
+        return data
+    return TimeSeries(data["endog"], data.get("dates"))
@@ -0,0 +1,10 @@
+"""
+Пулы процессов прогнозирования и преобразования файлов, очередь асинхронных задач backend-приложения.
+"""
+
+from .pool import ForecastingPool
+from .config import WorkersConfig
+from .jobs import ForecastJobQueue, QueueFullError
+from .deadlines import forecast_timeout, run_with_deadline
+from .admission import AdmissionController, AdmissionRejectedError
+from .conversion import ConversionPool, ConversionRejectedError
@@ -0,0 +1,303 @@
+"""
+Контроль допуска задач прогнозирования в пул процессов.
+
+Модели разделены на семейства с разной стоимостью обучения (SARIMA-модели и модели
+экспоненциального сглаживания). Для каждого семейства ограничено количество одновременно
+выполняемых прогнозов и длина очереди ожидания. Очередь семейства справедливая: свободный
+слот по кругу передаётся следующему клиенту, поэтому один пользователь с множеством тяжёлых
+моделей не задерживает остальных. Если очередь заполнена, запрос сразу отклоняется
+с рекомендуемым временем повтора.
+"""
+
+import math
+import time
+import asyncio
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, Optional
+
+from services.forecasting import ForecastCancelledError
+from logger import Logger
+from metrics import ADMISSION_QUEUED, ADMISSION_RUNNING
+
+
+logger = Logger(name="backend", log_dir="logs", log_file="backend.log").get_logger()
+
+
+class AdmissionRejectedError(Exception):
+    """
+    Прогноз не допущен к выполнению: очередь семейства моделей заполнена.
+
+    Attributes
+    ----------
+    retry_after : int
+        Рекомендуемая пауза перед повтором запроса в секундах.
+    """
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class _FamilyState:
+    """Состояние семейства моделей: выполняемые задачи и очереди ожидания клиентов."""
+
+    def __init__(self, name: str, concurrency: int, max_queued: int):
+        self.name = name
+        self.concurrency = concurrency
+        self.max_queued = max_queued
+        self.running = 0
+        self.queued = 0
+        self.queues: "OrderedDict[str, Deque[asyncio.Future]]" = OrderedDict()
+        self.avg_duration: Optional[float] = None
+
+    def publish(self) -> None:
+        """Обновляет метрики загрузки семейства."""
+        ADMISSION_RUNNING.labels(family=self.name).set(self.running)
+        ADMISSION_QUEUED.labels(family=self.name).set(self.queued)
+
+
+class AdmissionController:
+    """
+    Справедливая очередь допуска прогнозов с ограничениями по семействам моделей.
+
+    Работает в цикле событий одного воркера приложения и ограничивает задачи его пула.
+
+    Methods
+    -------
+    family(model_type)
+        Семейство, к которому относится тип модели.
+    check(model_type, client_id)
+        Проверка, что прогноз будет поставлен в очередь семейства, а не отклонён.
+    admit(model_type, client_id, bounded, is_disconnected)
+        Асинхронный контекстный менеджер, удерживающий слот семейства на время прогноза.
+    stats()
+        Текущая загрузка и глубина очередей по семействам.
+    """
+
+    # Вес нового замера в скользящем среднем длительности прогноза
+    DURATION_SMOOTHING = 0.2
+
+    def __init__(
+        self,
+        families: Dict[str, str],
+        default_family: str,
+        concurrency: Dict[str, int],
+        max_queued: Dict[str, int],
+        max_queued_per_client: int,
+        poll_interval: float = 0.5,
+    ):
+        """
+        Parameters
+        ----------
+        families : dict
+            Соответствие типов моделей семействам (например, {"SARIMA": "sarima", "HWES": "smoothing"}).
+        default_family : str
+            Семейство для типов моделей, отсутствующих в `families`.
+        concurrency : dict
+            Количество одновременно выполняемых прогнозов по семействам.
+        max_queued : dict
+            Максимальная длина очереди ожидания по семействам.
+        max_queued_per_client : int
+            Максимальное количество ожидающих прогнозов одного клиента в очереди семейства.
+        poll_interval : float, optional
+            Период проверки отключения клиента во время ожидания в секундах.
+        """
+        self.families = families
+        self.default_family = default_family
+        self.max_queued_per_client = max_queued_per_client
+        self.poll_interval = poll_interval
+        self._states = {
+            name: _FamilyState(name, concurrency[name], max_queued[name]) for name in concurrency
+        }
+
+    def family(self, model_type: str) -> str:
+        """
+        Возвращает семейство, к которому относится тип модели.
+
+        Parameters
+        ----------
+        model_type : str
+            Тип модели (например, "SARIMA", "HWES").
+
+        Returns
+        -------
+        str
+            Имя семейства.
+        """
+        return self.families.get(model_type, self.default_family)
+
+    def _retry_after(self, state: _FamilyState) -> int:
+        # Оценка времени, за которое очередь семейства продвинется на одну позицию
+        avg_duration = state.avg_duration or 1.0
+        return max(1, math.ceil(avg_duration * (state.queued + 1) / state.concurrency))
+
+    def _check_capacity(self, name: str, state: _FamilyState, client_id: str) -> None:
+        if state.queued >= state.max_queued:
+            raise AdmissionRejectedError(
+                f"Forecast queue for '{name}' models is full: {state.queued} queued",
+                self._retry_after(state),
+            )
+        client_queued = len(state.queues.get(client_id, ()))
+        if client_queued >= self.max_queued_per_client:
+            raise AdmissionRejectedError(
+                f"Too many queued '{name}' forecasts from this client: {client_queued}",
+                self._retry_after(state),
+            )
+
+    async def _acquire(
+        self,
+        state: _FamilyState,
+        client_id: str,
+        is_disconnected: Optional[Callable[[], Awaitable[bool]]],
+    ) -> None:
+        waiter = asyncio.get_running_loop().create_future()
+        state.queues.setdefault(client_id, deque()).append(waiter)
+        state.queued += 1
+        state.publish()
+        try:
+            while True:
+                done, _ = await asyncio.wait({waiter}, timeout=self.poll_interval)
+                if done:
+                    return  # Слот передан освободившей его задачей
+                if is_disconnected is not None and await is_disconnected():
+                    raise ForecastCancelledError("Client disconnected")
+        except BaseException:
+            if waiter.done() and not waiter.cancelled():
+                self._release(state)
+            else:
+                waiter.cancel()
+                self._remove_waiter(state, client_id, waiter)
+            raise
+
+    @staticmethod
+    def _remove_waiter(state: _FamilyState, client_id: str, waiter: asyncio.Future) -> None:
+        queue = state.queues.get(client_id)
+        if queue is None or waiter not in queue:
+            return
+        queue.remove(waiter)
+        state.queued -= 1
+        if not queue:
+            del state.queues[client_id]
+        state.publish()
+
+    @staticmethod
+    def _release(state: _FamilyState) -> None:
+        # Слот передаётся первому ожидающему следующего по кругу клиента
+        while state.queues:
+            client_id, queue = next(iter(state.queues.items()))
+            waiter = queue.popleft()
+            state.queued -= 1
+            if queue:
+                state.queues.move_to_end(client_id)
+            else:
+                del state.queues[client_id]
+            if not waiter.done():
+                waiter.set_result(None)
+                state.publish()
+                return
+        state.running -= 1
+        state.publish()
+
+    def _record_duration(self, state: _FamilyState, duration: float) -> None:
+        if state.avg_duration is None:
+            state.avg_duration = duration
+        else:
+            state.avg_duration += self.DURATION_SMOOTHING * (duration - state.avg_duration)
+
+    def check(self, model_type: str, client_id: str) -> None:
+        """
+        Проверяет, что прогноз будет допущен к выполнению или поставлен в очередь семейства.
+
+        Используется, когда прогноз ждёт слота в фоновой задаче (`admit` с bounded=False),
+        а отказ нужно вернуть клиенту сразу.
+
+        Parameters
+        ----------
+        model_type : str
+            Тип модели.
+        client_id : str
+            Идентификатор клиента.
+
+        Raises
+        ------
+        AdmissionRejectedError
+            Если очередь семейства или очередь клиента заполнена.
+        """
+        name = self.family(model_type)
+        state = self._states[name]
+        if state.running < state.concurrency and not state.queued:
+            return
+        self._check_capacity(name, state, client_id)
+
+    @asynccontextmanager
+    async def admit(
+        self,
+        model_type: str,
+        client_id: str,
+        bounded: bool = True,
+        is_disconnected: Optional[Callable[[], Awaitable[bool]]] = None,
+    ) -> AsyncIterator[None]:
+        """
+        Удерживает слот семейства модели на время построения прогноза.
+
+        Если свободного слота нет, запрос ждёт в очереди своего клиента.
+
+        Parameters
+        ----------
+        model_type : str
+            Тип модели.
+        client_id : str
+            Идентификатор клиента (например, IP-адрес) для справедливого распределения слотов.
+        bounded : bool, optional
+            Проверять ограничения длины очереди. Без проверки запрос всегда ставится в очередь
+            (для задач, количество которых уже ограничено, например, прогнозов одного пакета).
+        is_disconnected : Callable, optional
+            Корутина-функция, проверяющая отключение клиента во время ожидания.
+
+        Raises
+        ------
+        AdmissionRejectedError
+            Если очередь семейства или очередь клиента заполнена.
+        ForecastCancelledError
+            Если клиент отключился, не дождавшись слота.
+        """
+        name = self.family(model_type)
+        state = self._states[name]
+        if state.running < state.concurrency and not state.queued:
+            state.running += 1
+            state.publish()
+        else:
+            if bounded:
+                self._check_capacity(name, state, client_id)
+            await self._acquire(state, client_id, is_disconnected)
+
+        started_at = time.monotonic()
+        try:
+            yield
+        finally:
+            self._record_duration(state, time.monotonic() - started_at)
+            self._release(state)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Возвращает текущую загрузку и глубину очередей по семействам моделей.
+
+        Returns
+        -------
+        dict
+            Для каждого семейства: running, concurrency, queued, maxQueued, clients
+            (количество клиентов в очереди) и avgDuration (скользящее среднее длительности
+            прогноза в секундах).
+        """
+        return {
+            name: {
+                "running": state.running,
+                "concurrency": state.concurrency,
+                "queued": state.queued,
+                "maxQueued": state.max_queued,
+                "clients": len(state.queues),
+                "avgDuration": round(state.avg_duration, 3) if state.avg_duration is not None else None,
+            }
+            for name, state in self._states.items()
+        }
@@ -0,0 +1,125 @@
+"""Константы конфигурации пулов процессов прогнозирования и преобразования файлов."""
+
+import os
+
+
+class WorkersConfig:
+    """Конфигурация пулов процессов прогнозирования и преобразования файлов.
+
+    Значения могут быть переопределены переменными окружения с теми же именами.
+
+    Attributes
+    ----------
+    FORECASTING_POOL_SIZE : int
+        Количество процессов в пуле прогнозирования одного воркера приложения.
+
+    FORECASTING_MAX_TASKS_PER_CHILD : int
+        Количество задач, после выполнения которых процесс пула перезапускается (0 - без ограничения).
+
+    FORECASTING_MAX_WORKER_RSS_MB : int
+        Предельный объём резидентной памяти процесса пула в мегабайтах; при его превышении
+        пул заменяется новым, прогретым в фоне, а старый завершается после выполнения
+        переданных ему задач (0 - без ограничения).
+
+    FORECASTING_CANCEL_SLOTS : int
+        Количество одновременно отменяемых задач пула (в очереди и в работе).
+
+    FORECASTING_SHARED_MIN_KB : int
+        Минимальный объём временного ряда в килобайтах, начиная с которого ряд передаётся процессам
+        пула прогнозирования через разделяемую память, а не сериализуется (0 - всегда сериализуется).
+
+    FORECASTING_SHARED_MAX_MB : int
+        Предельный объём разделяемой памяти незавершённых задач одного воркера приложения в мегабайтах;
+        сверх него ряды сериализуются (0 - без ограничения). Суммарный объём по всем воркерам
+        не должен превышать размер /dev/shm контейнера.
+
+    FORECAST_TIMEOUTS : dict
+        Крайний срок построения прогноза в секундах (с момента получения запроса) по типам моделей.
+
+    FORECAST_DEFAULT_TIMEOUT : float
+        Крайний срок построения прогноза для типов моделей, отсутствующих в FORECAST_TIMEOUTS.
+
+    DISCONNECT_POLL_INTERVAL : float
+        Период проверки отключения клиента во время построения прогноза в секундах.
+
+    MODEL_FAMILIES : dict
+        Соответствие типов моделей семействам, для которых раздельно ограничивается
+        количество одновременно выполняемых прогнозов.
+
+    DEFAULT_MODEL_FAMILY : str
+        Семейство для типов моделей, отсутствующих в MODEL_FAMILIES.
+
+    ADMISSION_CONCURRENCY : dict
+        Количество одновременно выполняемых прогнозов одного воркера приложения по семействам.
+        SARIMA-моделям по умолчанию не достаётся весь пул, чтобы быстрые модели сглаживания
+        не ждали тяжёлых.
+
+    ADMISSION_MAX_QUEUED : dict
+        Максимальная длина очереди ожидания прогнозов по семействам; при её превышении
+        запрос отклоняется с кодом 429.
+
+    ADMISSION_MAX_QUEUED_PER_CLIENT : int
+        Максимальное количество ожидающих прогнозов одного клиента в очереди семейства.
+
+    CONVERSION_POOL_SIZE : int
+        Количество процессов в пуле преобразования загруженных файлов одного воркера приложения.
+
+    CONVERSION_MAX_PENDING : int
+        Максимальное количество незавершённых преобразований файлов (в очереди и в работе);
+        при превышении запрос отклоняется с кодом 429.
+
+    CONVERSION_MAX_PENDING_MB : int
+        Максимальный суммарный размер файлов незавершённых преобразований в мегабайтах.
+
+    CONVERSION_CHUNK_SIZE : int
+        Размер части, которыми загруженный файл копируется на диск для пула преобразования, в байтах.
+
+    CONVERSION_MAX_TASKS_PER_CHILD : int
+        Количество преобразований, после которых процесс пула перезапускается (0 - без ограничения).
+    """
+
+    FORECASTING_POOL_SIZE = int(os.getenv("FORECASTING_POOL_SIZE", os.cpu_count()))
+    FORECASTING_MAX_TASKS_PER_CHILD = int(os.getenv("FORECASTING_MAX_TASKS_PER_CHILD", 200))
+    FORECASTING_MAX_WORKER_RSS_MB = int(os.getenv("FORECASTING_MAX_WORKER_RSS_MB", 1024))
+    FORECASTING_CANCEL_SLOTS = int(os.getenv("FORECASTING_CANCEL_SLOTS", 256))
+    FORECASTING_SHARED_MIN_KB = int(os.getenv("FORECASTING_SHARED_MIN_KB", 512))
+    FORECASTING_SHARED_MAX_MB = int(os.getenv("FORECASTING_SHARED_MAX_MB", 64))
+    FORECAST_TIMEOUTS = {
+        "SES": 10.0,
+        "HES": 10.0,
+        "HWES": 30.0,
+        "AR": 30.0,
+        "MA": 30.0,
+        "ARMA": 30.0,
+        "ARIMA": 45.0,
+        "SARIMA": 90.0,
+        "AUTO_SARIMA": 120.0,
+    }
+    FORECAST_DEFAULT_TIMEOUT = float(os.getenv("FORECAST_DEFAULT_TIMEOUT", 60))
+    DISCONNECT_POLL_INTERVAL = 0.5
+    MODEL_FAMILIES = {
+        "SARIMA": "sarima",
+        "ARIMA": "sarima",
+        "ARMA": "sarima",
+        "AR": "sarima",
+        "MA": "sarima",
+        "AUTO_SARIMA": "sarima",
+        "HWES": "smoothing",
+        "HES": "smoothing",
+        "SES": "smoothing",
+    }
+    DEFAULT_MODEL_FAMILY = "smoothing"
+    ADMISSION_CONCURRENCY = {
+        "sarima": int(os.getenv("ADMISSION_SARIMA_CONCURRENCY", max(1, FORECASTING_POOL_SIZE - 1))),
+        "smoothing": int(os.getenv("ADMISSION_SMOOTHING_CONCURRENCY", FORECASTING_POOL_SIZE)),
+    }
+    ADMISSION_MAX_QUEUED = {
+        "sarima": int(os.getenv("ADMISSION_SARIMA_MAX_QUEUED", 16)),
+        "smoothing": int(os.getenv("ADMISSION_SMOOTHING_MAX_QUEUED", 64)),
+    }
+    ADMISSION_MAX_QUEUED_PER_CLIENT = int(os.getenv("ADMISSION_MAX_QUEUED_PER_CLIENT", 4))
+    CONVERSION_POOL_SIZE = int(os.getenv("CONVERSION_POOL_SIZE", max(1, os.cpu_count() // 4)))
+    CONVERSION_MAX_PENDING = int(os.getenv("CONVERSION_MAX_PENDING", 8))
+    CONVERSION_MAX_PENDING_MB = int(os.getenv("CONVERSION_MAX_PENDING_MB", 256))
+    CONVERSION_CHUNK_SIZE = 1024 * 1024
+    CONVERSION_MAX_TASKS_PER_CHILD = int(os.getenv("CONVERSION_MAX_TASKS_PER_CHILD", 50))
@@ -0,0 +1,196 @@
+"""
+Пул процессов преобразования загруженных файлов.
+
+Разбор CSV и Excel-файлов выполняется вне цикла событий воркера приложения, в отдельном
+небольшом пуле процессов, поэтому преобразование большого файла не задерживает обработку
+остальных запросов и не конкурирует с ними за GIL. Загруженный файл по частям копируется
+во временный файл на диске, путь к которому передаётся процессу пула; процесс читает
+файл потоково, не загружая его в память целиком.
+
+Количество незавершённых преобразований и их суммарный размер ограничены: при превышении
+ограничений запрос сразу отклоняется.
+"""
+
+import os
+import shutil
+import asyncio
+import tempfile
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, wait
+from typing import Optional
+
+from starlette.datastructures import UploadFile
+
+from converters import convert_file
+from .initializer import init_conversion_worker, ping
+from logger import Logger
+from metrics import POOL_BUSY_WORKERS, POOL_PENDING_TASKS
+
+
+logger = Logger(name="backend", log_dir="logs", log_file="backend.log").get_logger()
+
+
+class ConversionRejectedError(Exception):
+    """
+    Преобразование файла не допущено: превышено количество или суммарный размер
+    незавершённых преобразований.
+
+    Attributes
+    ----------
+    retry_after : int
+        Рекомендуемая пауза перед повтором запроса в секундах.
+    """
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class ConversionPool:
+    """
+    Ограниченный пул процессов преобразования загруженных файлов одного воркера приложения.
+
+    Methods
+    -------
+    convert(file, settings)
+        Преобразование загруженного файла в словарь.
+    warm_up()
+        Запуск и прогрев всех процессов пула.
+    shutdown(wait)
+        Остановка пула.
+    """
+
+    # Рекомендуемая пауза перед повтором отклонённого запроса в секундах
+    RETRY_AFTER = 2
+
+    def __init__(
+        self,
+        max_workers: int,
+        max_pending: int,
+        max_pending_bytes: int,
+        chunk_size: int = 1024 * 1024,
+        max_tasks_per_child: int = 0,
+        spool_dir: Optional[str] = None,
+    ):
+        """
+        Parameters
+        ----------
+        max_workers : int
+            Количество процессов в пуле.
+        max_pending : int
+            Максимальное количество незавершённых преобразований (в очереди и в работе).
+        max_pending_bytes : int
+            Максимальный суммарный размер файлов незавершённых преобразований в байтах.
+        chunk_size : int, optional
+            Размер части, которыми загруженный файл копируется на диск, в байтах.
+        max_tasks_per_child : int, optional
+            Количество задач, после которых процесс перезапускается (0 - без ограничения).
+        spool_dir : str, optional
+            Каталог временных файлов (по умолчанию системный каталог временных файлов).
+        """
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.max_pending_bytes = max_pending_bytes
+        self.chunk_size = chunk_size
+        self.spool_dir = spool_dir
+        self._pending = 0
+        self._pending_bytes = 0
+        self._lock = threading.Lock()
+        self._executor = ProcessPoolExecutor(
+            max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=init_conversion_worker,
+            max_tasks_per_child=max_tasks_per_child or None,
+        )
+
+    def _publish_load(self) -> None:
+        POOL_BUSY_WORKERS.labels(pool="conversion").set(min(self._pending, self.max_workers))
+        POOL_PENDING_TASKS.labels(pool="conversion").set(max(0, self._pending - self.max_workers))
+
+    def _reserve(self, size: int) -> None:
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise ConversionRejectedError(
+                    f"Too many files are being processed: {self._pending} pending", self.RETRY_AFTER
+                )
+            if self._pending and self._pending_bytes + size > self.max_pending_bytes:
+                raise ConversionRejectedError(
+                    f"Too much data is being processed: {self._pending_bytes} bytes pending", self.RETRY_AFTER
+                )
+            self._pending += 1
+            self._pending_bytes += size
+            self._publish_load()
+
+    def _release(self, size: int) -> None:
+        with self._lock:
+            self._pending -= 1
+            self._pending_bytes -= size
+            self._publish_load()
+
+    def _spool(self, file: UploadFile) -> str:
+        # Копирование по частям: содержимое загруженного файла не читается в память целиком
+        suffix = os.path.splitext(file.filename or "")[1]
+        file.file.seek(0)
+        with tempfile.NamedTemporaryFile(
+            "wb", prefix="upload_", suffix=suffix, dir=self.spool_dir, delete=False
+        ) as spooled:
+            shutil.copyfileobj(file.file, spooled, self.chunk_size)
+        file.file.seek(0)
+        return spooled.name
+
+    async def convert(self, file: UploadFile, settings: dict) -> dict:
+        """
+        Преобразует загруженный файл в словарь в процессе пула.
+
+        Parameters
+        ----------
+        file : UploadFile
+            Загруженный пользователем файл данных.
+        settings : dict
+            Параметры преобразования (см. `converters.convert_to_dict`).
+
+        Returns
+        -------
+        dict
+            Словарь, содержащий данные из файла.
+
+        Raises
+        ------
+        ConversionRejectedError
+            Если превышено количество или суммарный размер незавершённых преобразований.
+        ValueError
+            Если файл не удалось преобразовать.
+        """
+        size = file.size or 0
+        self._reserve(size)
+        path = None
+        try:
+            path = await asyncio.to_thread(self._spool, file)
+            future = self._executor.submit(convert_file, path, file.filename, settings)
+            try:
+                return await asyncio.wrap_future(future)
+            except asyncio.CancelledError:
+                future.cancel()
+                raise
+        finally:
+            # Процесс, уже открывший файл, дочитает его и после удаления
+            if path is not None:
+                os.unlink(path)
+            self._release(size)
+
+    def warm_up(self) -> None:
+        """Запускает все процессы пула и дожидается их инициализации."""
+        wait([self._executor.submit(ping) for _ in range(self.max_workers)])
+        logger.info(f"Пул преобразования файлов запущен (процессов: {self.max_workers})")
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Останавливает пул.
+
+        Parameters
+        ----------
+        wait : bool, optional
+            Дождаться завершения выполняющихся преобразований.
+        """
+        self._executor.shutdown(wait=wait, cancel_futures=True)
@@ -0,0 +1,95 @@
+"""
+Выполнение прогнозов в пуле процессов с крайним сроком и отменой.
+
+Если клиент отключился или истёк крайний срок, задача отменяется в пуле: ожидающая задача
+снимается с очереди, а выполняющееся обучение прерывается на ближайшей итерации оптимизатора,
+поэтому брошенные запросы не занимают процессы, нужные другим клиентам.
+"""
+
+import time
+import asyncio
+from typing import Any, Awaitable, Callable, Optional
+
+from services.forecasting import ForecastCancelledError, ForecastTimeoutError
+from .config import WorkersConfig
+from .pool import ForecastingPool
+from logger import Logger
+
+
+logger = Logger(name="backend", log_dir="logs", log_file="backend.log").get_logger()
+
+
+def forecast_timeout(model_type: str) -> float:
+    """
+    Возвращает крайний срок построения прогноза для типа модели.
+
+    Parameters
+    ----------
+    model_type : str
+        Тип модели (например, "SARIMA", "HWES").
+
+    Returns
+    -------
+    float
+        Отведённое время в секундах.
+    """
+
+    return WorkersConfig.FORECAST_TIMEOUTS.get(model_type, WorkersConfig.FORECAST_DEFAULT_TIMEOUT)
+
+
+async def run_with_deadline(
+    pool: ForecastingPool,
+    model_type: str,
+    fn: Callable,
+    *args,
+    is_disconnected: Optional[Callable[[], Awaitable[bool]]] = None,
+) -> Any:
+    """
+    Выполняет функцию прогнозирования в пуле с крайним сроком по типу модели.
+
+    Parameters
+    ----------
+    pool : ForecastingPool
+        Пул процессов прогнозирования.
+    model_type : str
+        Тип модели (определяет крайний срок).
+    fn : Callable
+        Функция, выполняемая в процессе пула.
+    *args
+        Аргументы функции.
+    is_disconnected : Callable, optional
+        Корутина-функция, проверяющая отключение клиента (например, `request.is_disconnected`).
+
+    Returns
+    -------
+    Any
+        Результат функции.
+
+    Raises
+    ------
+    ForecastTimeoutError
+        Если прогноз не построен за отведённое время.
+    ForecastCancelledError
+        Если клиент отключился до завершения прогноза.
+    """
+
+    timeout = forecast_timeout(model_type)
+    deadline = time.time() + timeout
+    future = pool.submit_cancellable(deadline, fn, *args)
+    wrapped = asyncio.wrap_future(future)
+    try:
+        while True:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                raise ForecastTimeoutError(f"Forecast deadline exceeded ({timeout:g} s for {model_type})")
+            done, _ = await asyncio.wait({wrapped}, timeout=min(WorkersConfig.DISCONNECT_POLL_INTERVAL, remaining))
+            if done:
+                return wrapped.result()
+            if is_disconnected is not None and await is_disconnected():
+                raise ForecastCancelledError("Client disconnected")
+    except (ForecastCancelledError, asyncio.CancelledError) as e:
+        if not wrapped.done():
+            pool.cancel(future)
+            wrapped.cancel()
+            logger.warning(f"Прогноз {model_type} отменён: {e or 'запрос прерван'}")
+        raise
@@ -0,0 +1,88 @@
+"""
+Инициализация процессов пулов прогнозирования и преобразования файлов.
+
+Процесс пула заранее импортирует тяжёлые модули (statsmodels, scipy, pandas) и выполняет
+пробное обучение маленькой SARIMAX-модели, чтобы первый пользовательский запрос
+не платил за импорт и первичную инициализацию библиотек. Процесс пула преобразования
+аналогично импортирует конвертеры и их зависимости.
+"""
+
+import os
+import time
+import warnings
+
+from services.forecasting.cache import init_cache_counters
+from services.forecasting.cancellation import init_cancel_flags
+from logger import Logger
+
+
+logger = Logger(name='forecasting', log_dir='logs', log_file='forecasting.log').get_logger()
+
+
+def init_worker(cache_hits, cache_misses, cancel_flags) -> None:
+    """
+    Инициализатор процесса пула прогнозирования.
+
+    Parameters
+    ----------
+    cache_hits : multiprocessing.Value
+        Общий счётчик попаданий кэша обученных моделей.
+    cache_misses : multiprocessing.Value
+        Общий счётчик промахов кэша обученных моделей.
+    cancel_flags : multiprocessing.RawArray
+        Общий массив флагов отмены задач.
+    """
+
+    started_at = time.perf_counter()
+    init_cache_counters(cache_hits, cache_misses)
+    init_cancel_flags(cancel_flags)
+
+    import numpy as np
+    import pandas  # noqa: F401
+    import scipy.optimize  # noqa: F401
+    from services.forecasting.models import SARIMAXModel, ExponentialSmoothingModel
+    from services.timeseries import TimeSeries
+
+    # Пробное обучение прогревает statsmodels (cython-фильтры Калмана, оптимизатор scipy и т.д.)
+    endog = np.sin(np.linspace(0, 8 * np.pi, 48)) + np.linspace(0, 1, 48)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        model = SARIMAXModel(p=1, q=1, P=1, s=12)
+        model.fit(TimeSeries(endog), disp=False, maxiter=5)
+        model.detailed_forecast(2).conf_int()
+        ExponentialSmoothingModel(trend="add").fit(TimeSeries(endog + 2))
+
+    logger.info(f"Процесс пула {os.getpid()} прогрет за {time.perf_counter() - started_at:.3f} с")
+
+
+def init_conversion_worker() -> None:
+    """Инициализатор процесса пула преобразования загруженных файлов."""
+
+    started_at = time.perf_counter()
+    import openpyxl  # noqa: F401
+    import pyarrow.parquet  # noqa: F401
+    import converters  # noqa: F401
+
+    logger.info(f"Процесс пула преобразования {os.getpid()} прогрет за {time.perf_counter() - started_at:.3f} с")
+
+
+def ping(hold: float = 0.1) -> int:
+    """
+    Пустая задача для прогрева пула.
+
+    Задача занимает процесс на короткое время, чтобы задачи прогрева распределились
+    по всем процессам пула.
+
+    Parameters
+    ----------
+    hold : float, optional
+        Время удержания процесса в секундах.
+
+    Returns
+    -------
+    int
+        PID процесса пула.
+    """
+
+    time.sleep(hold)
+    return os.getpid()
@@ -0,0 +1,285 @@
+"""
+Очередь асинхронных задач прогнозирования.
+
+Задачи выполняются в пуле процессов прогнозирования, а их статус и результат хранятся в БД,
+поэтому результат может получить любой воркер приложения. Количество незавершённых задач
+одного воркера ограничено: при заполнении очереди новые задачи отклоняются. Как и синхронные
+прогнозы, задачи допускаются в пул через контроль допуска по семействам моделей.
+"""
+
+import uuid
+import asyncio
+import datetime
+import traceback
+import time
+from typing import Callable, Dict, Optional, Set
+
+from api.responses import to_jsonable
+from database import SessionLocal
+from database.crud import forecast_job_crud
+from .admission import AdmissionController
+from .deadlines import forecast_timeout
+from .pool import ForecastingPool
+from logger import Logger
+
+
+logger = Logger(name="backend", log_dir="logs", log_file="backend.log").get_logger()
+
+
+class QueueFullError(Exception):
+    """Очередь задач прогнозирования заполнена."""
+
+
+class ForecastJobQueue:
+    """
+    Ограниченная очередь асинхронных задач прогнозирования одного воркера приложения.
+
+    Methods
+    -------
+    submit(selected_model, client_id, fn, *args)
+        Постановка задачи в очередь.
+    get(job_id)
+        Получение статуса и результата задачи.
+    cleanup()
+        Удаление задач с истёкшим сроком хранения и потерянных незавершённых задач.
+    start_cleanup()
+        Запуск периодической очистки устаревших задач.
+    shutdown()
+        Остановка очистки и отмена незавершённых задач.
+    """
+
+    STATUS_POLL_INTERVAL = 0.05
+
+    def __init__(
+        self,
+        executor: ForecastingPool,
+        admission: AdmissionController,
+        max_pending: int,
+        result_ttl: int,
+        stale_ttl: int,
+        cleanup_interval: int,
+    ):
+        """
+        Parameters
+        ----------
+        executor : ForecastingPool
+            Пул процессов, в котором выполняются задачи (с крайним сроком по типу модели).
+        admission : AdmissionController
+            Контроль допуска прогнозов в пул, общий с синхронными прогнозами.
+        max_pending : int
+            Максимальное количество незавершённых задач (в очереди и в работе).
+        result_ttl : int
+            Время хранения результата задачи в секундах (отсчитывается от завершения задачи).
+        stale_ttl : int
+            Время в секундах от постановки в очередь, после которого незавершённая задача
+            считается потерянной (воркер приложения завершился аварийно) и удаляется.
+        cleanup_interval : int
+            Период удаления устаревших задач из БД в секундах.
+        """
+        self.executor = executor
+        self.admission = admission
+        self.max_pending = max_pending
+        self.result_ttl = datetime.timedelta(seconds=result_ttl)
+        self.stale_ttl = datetime.timedelta(seconds=stale_ttl)
+        self.cleanup_interval = cleanup_interval
+        self._tasks: Set[asyncio.Task] = set()
+        # Задачи, прошедшие проверку очереди, но ещё не записанные в БД
+        self._reserved = 0
+        self._cleanup_task: Optional[asyncio.Task] = None
+
+    @property
+    def pending(self) -> int:
+        """Количество незавершённых задач воркера (включая ставящиеся в очередь)."""
+        return len(self._tasks) + self._reserved
+
+    @staticmethod
+    def _now() -> datetime.datetime:
+        return datetime.datetime.now()
+
+    def _update_job(self, job_id: str, job_data: Dict) -> None:
+        db_session = SessionLocal()
+        try:
+            job = forecast_job_crud.get(db_session, job_id)
+            if job is not None:
+                forecast_job_crud.update(db_session, job, job_data)
+        finally:
+            db_session.close()
+
+    def _create_job(self, job_id: str, selected_model: str) -> None:
+        db_session = SessionLocal()
+        try:
+            forecast_job_crud.create(db_session, {
+                "id": job_id,
+                "status": "queued",
+                "selected_model": selected_model,
+                # Время создания задаётся приложением: с ним сравнивается срок устаревания задачи
+                "created_at": self._now(),
+            })
+        finally:
+            db_session.close()
+
+    async def submit(self, selected_model: str, client_id: str, fn: Callable, *args) -> str:
+        """
+        Ставит задачу прогнозирования в очередь.
+
+        Parameters
+        ----------
+        selected_model : str
+            Имя модели прогнозирования (сохраняется вместе с задачей).
+        client_id : str
+            Идентификатор клиента для справедливого распределения слотов пула.
+        fn : Callable
+            Функция, выполняемая в пуле процессов.
+        *args
+            Аргументы функции.
+
+        Returns
+        -------
+        str
+            Идентификатор задачи.
+
+        Raises
+        ------
+        QueueFullError
+            Если количество незавершённых задач достигло предела.
+        AdmissionRejectedError
+            Если очередь семейства модели или очередь клиента в контроле допуска заполнена.
+        """
+        if self.pending >= self.max_pending:
+            raise QueueFullError(f"Forecast queue is full: {self.pending} pending jobs")
+        self.admission.check(selected_model, client_id)
+
+        # Место в очереди занимается до первого ожидания, чтобы одновременные запросы
+        # не превысили предел, пока задача записывается в БД
+        self._reserved += 1
+        job_id = uuid.uuid4().hex
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(None, self._create_job, job_id, selected_model)
+        finally:
+            self._reserved -= 1
+
+        task = asyncio.create_task(self._run(job_id, selected_model, client_id, fn, *args))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        logger.info(f"Задача прогнозирования {job_id} поставлена в очередь (в очереди: {self.pending})")
+        return job_id
+
+    async def _execute(self, job_id: str, selected_model: str, fn: Callable, *args) -> Dict:
+        loop = asyncio.get_running_loop()
+        # Крайний срок отсчитывается от постановки в очередь пула
+        deadline = time.time() + forecast_timeout(selected_model)
+        future = self.executor.submit_cancellable(deadline, fn, *args)
+        try:
+            # Статус "running" выставляется, когда пул процессов забрал задачу на выполнение
+            while not future.running() and not future.done():
+                await asyncio.sleep(self.STATUS_POLL_INTERVAL)
+            if not future.done():
+                await loop.run_in_executor(
+                    None, self._update_job, job_id, {"status": "running", "started_at": self._now()}
+                )
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            self.executor.cancel(future)
+            raise
+
+    async def _run(self, job_id: str, selected_model: str, client_id: str, fn: Callable, *args) -> None:
+        try:
+            # Количество задач ограничено очередью, поэтому задача ждёт слота семейства
+            # без ограничения длины его очереди (допуск проверен при постановке задачи)
+            async with self.admission.admit(selected_model, client_id, bounded=False):
+                result = await self._execute(job_id, selected_model, fn, *args)
+            job_data = {"status": "done", "result": to_jsonable(result)}
+            logger.info(f"Задача прогнозирования {job_id} выполнена")
+        except asyncio.CancelledError:
+            # Задача отменена при остановке воркера: запись в БД не должна остаться незавершённой
+            logger.warning(f"Задача прогнозирования {job_id} отменена при остановке воркера")
+            await self._finish(job_id, {"status": "failed", "error": "Forecast job was cancelled: server is shutting down"})
+            raise
+        except Exception as e:
+            logger.error(f"Ошибка при выполнении задачи прогнозирования {job_id}: {e}\n{traceback.format_exc()}")
+            job_data = {"status": "failed", "error": f"Error creating forecast: {str(e)}"}
+
+        await self._finish(job_id, job_data)
+
+    async def _finish(self, job_id: str, job_data: Dict) -> None:
+        finished_at = self._now()
+        job_data.update({"finished_at": finished_at, "expires_at": finished_at + self.result_ttl})
+        await asyncio.get_running_loop().run_in_executor(None, self._update_job, job_id, job_data)
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """
+        Возвращает статус и результат задачи.
+
+        Parameters
+        ----------
+        job_id : str
+            Идентификатор задачи.
+
+        Returns
+        -------
+        dict or None
+            Словарь с ключами id, status, selectedModel, createdAt, startedAt, finishedAt,
+            expiresAt (None для незавершённой задачи), result и error, либо None, если задача
+            не найдена или устарела.
+        """
+        db_session = SessionLocal()
+        try:
+            now = self._now()
+            job = forecast_job_crud.get_active(db_session, job_id, now, now - self.stale_ttl)
+            if job is None:
+                return None
+            return {
+                "id": job.id,
+                "status": job.status,
+                "selectedModel": job.selected_model,
+                "createdAt": job.created_at,
+                "startedAt": job.started_at,
+                "finishedAt": job.finished_at,
+                "expiresAt": job.expires_at,
+                "result": job.result,
+                "error": job.error,
+            }
+        finally:
+            db_session.close()
+
+    def cleanup(self) -> int:
+        """
+        Удаляет из БД завершённые задачи с истёкшим сроком хранения и потерянные незавершённые задачи.
+
+        Returns
+        -------
+        int
+            Количество удалённых задач.
+        """
+        db_session = SessionLocal()
+        try:
+            now = self._now()
+            count = forecast_job_crud.delete_expired(db_session, now, now - self.stale_ttl)
+        finally:
+            db_session.close()
+        if count:
+            logger.info(f"Удалено устаревших задач прогнозирования: {count}")
+        return count
+
+    async def _cleanup_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                await loop.run_in_executor(None, self.cleanup)
+            except Exception as e:
+                logger.error(f"Ошибка при удалении устаревших задач прогнозирования: {e}")
+            await asyncio.sleep(self.cleanup_interval)
+
+    def start_cleanup(self) -> None:
+        """Запускает периодическое удаление устаревших задач в текущем цикле событий."""
+        self._cleanup_task = asyncio.create_task(self._cleanup_loop())
+
+    async def shutdown(self) -> None:
+        """Останавливает очистку и отменяет незавершённые задачи воркера (их записи в БД помечаются как неудачные)."""
+        tasks = list(self._tasks)
+        if self._cleanup_task is not None:
+            tasks.append(self._cleanup_task)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
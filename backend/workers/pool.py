@@ -0,0 +1,469 @@
+"""
+Пул процессов прогнозирования с прогревом и перезапуском процессов.
+
+`ForecastingPool` реализует интерфейс `concurrent.futures.Executor`, поэтому может
+передаваться в `loop.run_in_executor` так же, как обычный `ProcessPoolExecutor`.
+
+Длинные временные ряды из аргументов задач передаются процессам пула через разделяемую
+память (см. `workers.transport`), а не сериализуются в канал пула.
+"""
+
+import time
+import threading
+import multiprocessing
+from concurrent.futures import Executor, Future, InvalidStateError, ProcessPoolExecutor, wait
+from typing import Dict, List, Optional, Set, Tuple
+
+from services.forecasting.cancellation import run_cancellable
+from services.timeseries import TimeSeries
+from .initializer import init_worker, ping
+from .transport import SharedSeries, call_with_shared, receive_result
+from logger import Logger
+from metrics import POOL_BUSY_WORKERS, POOL_PENDING_TASKS
+
+
+logger = Logger(name="backend", log_dir="logs", log_file="backend.log").get_logger()
+
+
+def get_process_rss_mb(pid: int) -> Optional[float]:
+    """
+    Возвращает объём резидентной памяти процесса в мегабайтах (только Linux).
+
+    Parameters
+    ----------
+    pid : int
+        Идентификатор процесса.
+
+    Returns
+    -------
+    float or None
+        Объём резидентной памяти или None, если его не удалось определить.
+    """
+
+    try:
+        with open(f"/proc/{pid}/status", "r") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except (OSError, ValueError, IndexError):
+        return None
+    return None
+
+
+class PoolTaskFuture(Future):
+    """
+    Future задачи пула прогнозирования, не привязанный к конкретному `ProcessPoolExecutor`.
+
+    Задача, ещё не переданная процессу, при пересоздании пула переносится в очередь нового
+    пула; Future завершается результатом той попытки, которая выполнилась. Отмена и состояние
+    выполнения делегируются Future текущей попытки.
+    """
+
+    def __init__(self, fn, args: tuple, kwargs: dict):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.executor: Optional[ProcessPoolExecutor] = None
+        # None, пока задача переносится в новый пул
+        self.task: Optional[Future] = None
+
+    def cancel(self) -> bool:
+        # Снять с очереди можно только ещё не начавшую выполняться задачу;
+        # сам Future отменяется обработчиком завершения попытки
+        task = self.task
+        return task is not None and task.cancel() and self.cancelled()
+
+    def running(self) -> bool:
+        task = self.task
+        return task is not None and task.running() and not self.done()
+
+
+class SharedTaskFuture(Future):
+    """
+    Future задачи, ряды которой переданы через разделяемую память.
+
+    Завершается после того, как результат задачи получен из разделяемой памяти.
+    Отмена и состояние выполнения делегируются Future задачи пула.
+    """
+
+    def __init__(self, task: Future):
+        super().__init__()
+        self.task = task
+
+    def cancel(self) -> bool:
+        # Снять с очереди можно только ещё не начавшую выполняться задачу
+        return self.task.cancel()
+
+    def running(self) -> bool:
+        return self.task.running() and not self.done()
+
+
+class ForecastingPool(Executor):
+    """
+    Пул процессов прогнозирования.
+
+    Процессы пула прогреваются инициализатором и перезапускаются после заданного числа задач.
+    Если какой-либо процесс превысил предельный объём памяти, пул пересоздаётся в фоне:
+    `ProcessPoolExecutor` не позволяет заменить отдельный процесс (процесс, завершившийся
+    вне `max_tasks_per_child`, ломает весь пул), поэтому новый пул сначала прогревается,
+    пока задачи выполняет старый, и только затем получает новые задачи. Задачи, ещё
+    не переданные процессам старого пула, переносятся в очередь нового; старый пул
+    завершается после выполнения переданных задач. Число одновременно выполняемых задач
+    ограничено контролем допуска, поэтому на время замены добавляются лишь простаивающие
+    процессы старого пула.
+
+    Задачи, отправленные через `submit_cancellable`, получают крайний срок и ячейку в общем
+    массиве флагов отмены: `cancel` прерывает уже выполняющееся обучение модели.
+
+    Ряды (`TimeSeries`) из позиционных аргументов задачи, объём которых не меньше `shared_min_bytes`,
+    передаются через разделяемую память, пока суммарный объём сегментов незавершённых задач
+    не превышает `shared_max_bytes`; сверх этого ряды сериализуются как обычно. Сегменты
+    удаляются по завершении задачи, в том числе при ошибке и отмене.
+
+    Methods
+    -------
+    submit(fn, *args, **kwargs)
+        Отправка задачи в пул.
+    submit_cancellable(deadline, fn, *args)
+        Отправка задачи с крайним сроком и возможностью отмены.
+    cancel(future)
+        Отмена задачи, отправленной через `submit_cancellable`.
+    warm_up()
+        Запуск и прогрев всех процессов пула.
+    shutdown(wait)
+        Остановка пула.
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        max_tasks_per_child: int = 0,
+        max_worker_rss_mb: int = 0,
+        cancel_slots: int = 256,
+        shared_min_bytes: int = 0,
+        shared_max_bytes: int = 0,
+    ):
+        """
+        Parameters
+        ----------
+        max_workers : int
+            Количество процессов в пуле.
+        max_tasks_per_child : int, optional
+            Количество задач, после которых процесс перезапускается (0 - без ограничения).
+        max_worker_rss_mb : int, optional
+            Предельный объём резидентной памяти процесса в мегабайтах (0 - без ограничения).
+        cancel_slots : int, optional
+            Количество ячеек массива флагов отмены, т.е. одновременно отменяемых задач
+            (в очереди и в работе). Сверх этого задачи отменяются только по крайнему сроку.
+        shared_min_bytes : int, optional
+            Минимальный объём ряда, передаваемого через разделяемую память, в байтах
+            (0 - ряды всегда сериализуются).
+        shared_max_bytes : int, optional
+            Предельный суммарный объём сегментов разделяемой памяти незавершённых задач в байтах
+            (0 - без ограничения).
+        """
+        self.max_workers = max_workers
+        self.max_tasks_per_child = max_tasks_per_child or None
+        self.max_worker_rss_mb = max_worker_rss_mb
+        self.shared_min_bytes = shared_min_bytes
+        self.shared_max_bytes = shared_max_bytes
+        # max_tasks_per_child несовместим с fork, поэтому процессы всегда создаются через spawn
+        self._mp_context = multiprocessing.get_context("spawn")
+        self.cache_hits = self._mp_context.Value("L", 0)
+        self.cache_misses = self._mp_context.Value("L", 0)
+        self.cancel_flags = self._mp_context.RawArray("b", cancel_slots)
+        self.recycles = 0
+        self._lock = threading.Lock()
+        self._tasks: Set[PoolTaskFuture] = set()
+        self._recycle_thread: Optional[threading.Thread] = None
+        self._shutdown = False
+        self._free_slots: List[int] = list(range(cancel_slots))
+        self._future_slots: Dict[Future, int] = {}
+        self._in_flight = 0
+        self._shared_bytes = 0
+        self._executor = self._create_executor()
+
+    def _create_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            self.max_workers,
+            mp_context=self._mp_context,
+            initializer=init_worker,
+            initargs=(self.cache_hits, self.cache_misses, self.cancel_flags),
+            max_tasks_per_child=self.max_tasks_per_child,
+        )
+
+    def submit(self, fn, /, *args, **kwargs):
+        shared, args = self._share(args)
+        if not shared:
+            return self._submit(fn, *args, **kwargs)
+        try:
+            task = self._submit(call_with_shared, self.shared_min_bytes, fn, *args, **kwargs)
+        except BaseException:
+            self._release_shared(shared)
+            raise
+        future = SharedTaskFuture(task)
+        task.add_done_callback(lambda _: self._complete_shared(future, shared))
+        return future
+
+    def _submit(self, fn, /, *args, **kwargs) -> Future:
+        future = PoolTaskFuture(fn, args, kwargs)
+        with self._lock:
+            self._dispatch(future)
+            self._tasks.add(future)
+            self._in_flight += 1
+            self._publish_load()
+        future.add_done_callback(self._task_done)
+        return future
+
+    def _dispatch(self, future: PoolTaskFuture) -> None:
+        # Отправляет попытку задачи в текущий пул (вызывается под блокировкой)
+        executor = self._executor
+        task = executor.submit(future.fn, *future.args, **future.kwargs)
+        future.executor, future.task = executor, task
+        task.add_done_callback(lambda _: self._attempt_done(future, task))
+
+    def _attempt_done(self, future: PoolTaskFuture, task: Future) -> None:
+        if self.max_worker_rss_mb and not task.cancelled():
+            self._check_memory(future.executor)
+        if task is not future.task:
+            return  # Попытка снята с очереди старого пула при переносе задачи
+        if task.cancelled():
+            Future.cancel(future)
+            future.set_running_or_notify_cancel()
+            return
+        error = task.exception()
+        try:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(task.result())
+        except InvalidStateError:
+            pass
+
+    def _share(self, args: tuple) -> Tuple[List[SharedSeries], tuple]:
+        if not self.shared_min_bytes:
+            return [], args
+        shared = []
+        shared_args = []
+        for arg in args:
+            handle = None
+            if isinstance(arg, TimeSeries) and self._series_nbytes(arg) >= self.shared_min_bytes:
+                handle = self._share_series(arg)
+            if handle is not None:
+                shared.append(handle)
+            shared_args.append(handle if handle is not None else arg)
+        return shared, tuple(shared_args)
+
+    @staticmethod
+    def _series_nbytes(series: TimeSeries) -> int:
+        return series.endog.nbytes + (series.dates.nbytes if series.dates is not None else 0)
+
+    def _share_series(self, series: TimeSeries) -> Optional[SharedSeries]:
+        # Резервируется вдвое больший объём: процесс пула создаёт сегмент результата сопоставимого размера
+        reserved = 2 * self._series_nbytes(series)
+        with self._lock:
+            if self.shared_max_bytes and self._shared_bytes + reserved > self.shared_max_bytes:
+                return None
+            self._shared_bytes += reserved
+        try:
+            return SharedSeries.create(series)
+        except OSError as e:
+            logger.warning(f"Не удалось разместить ряд в разделяемой памяти, ряд будет сериализован: {e}")
+            with self._lock:
+                self._shared_bytes -= reserved
+            return None
+
+    def _release_shared(self, shared: List[SharedSeries]) -> None:
+        for handle in shared:
+            handle.release()
+        with self._lock:
+            self._shared_bytes -= sum(2 * handle.nbytes for handle in shared)
+
+    def _complete_shared(self, future: SharedTaskFuture, shared: List[SharedSeries]) -> None:
+        # Сегменты удаляются до завершения Future, чтобы ожидающий результат их уже не застал
+        self._release_shared(shared)
+        if future.task.cancelled():
+            Future.cancel(future)
+            return
+        # Сегмент результата удаляется, даже если результат уже не нужен
+        try:
+            result = receive_result(future.task.result())
+        except BaseException as e:
+            result, error = None, e
+        else:
+            error = None
+        try:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+        except InvalidStateError:
+            pass  # Future отменён, пока задача выполнялась
+
+    def _publish_load(self) -> None:
+        # Задачи сверх числа процессов ждут в очереди пула (вызывается под блокировкой)
+        POOL_BUSY_WORKERS.labels(pool="forecasting").set(min(self._in_flight, self.max_workers))
+        POOL_PENDING_TASKS.labels(pool="forecasting").set(max(0, self._in_flight - self.max_workers))
+
+    def _task_done(self, future: Future) -> None:
+        with self._lock:
+            self._tasks.discard(future)
+            self._in_flight -= 1
+            self._publish_load()
+
+    def submit_cancellable(self, deadline: Optional[float], fn, /, *args) -> Future:
+        """
+        Отправляет задачу с крайним сроком и возможностью отмены.
+
+        Parameters
+        ----------
+        deadline : float or None
+            Крайний срок выполнения (время UNIX); None — без ограничения.
+        fn : Callable
+            Функция, выполняемая в процессе пула.
+        *args
+            Аргументы функции.
+
+        Returns
+        -------
+        Future
+            Future задачи. При отмене или истечении срока завершается исключением
+            `ForecastCancelledError` или `ForecastTimeoutError`.
+        """
+        with self._lock:
+            slot = self._free_slots.pop() if self._free_slots else None
+        if slot is None:
+            logger.warning("Нет свободных ячеек флагов отмены, задача отменяется только по крайнему сроку")
+        future = self.submit(run_cancellable, slot, deadline, fn, *args)
+        if slot is not None:
+            with self._lock:
+                self._future_slots[future] = slot
+            future.add_done_callback(self._release_slot)
+        return future
+
+    def _release_slot(self, future: Future) -> None:
+        with self._lock:
+            slot = self._future_slots.pop(future, None)
+            if slot is not None:
+                self.cancel_flags[slot] = 0
+                self._free_slots.append(slot)
+
+    def cancel(self, future: Future) -> None:
+        """
+        Отменяет задачу: ожидающая задача снимается с очереди, а выполняющаяся прерывается
+        на ближайшей итерации оптимизатора.
+
+        Parameters
+        ----------
+        future : Future
+            Future задачи, отправленной через `submit_cancellable`.
+        """
+        if future.cancel():
+            return
+        with self._lock:
+            slot = self._future_slots.get(future)
+            if slot is not None:
+                self.cancel_flags[slot] = 1
+
+    def _check_memory(self, executor: ProcessPoolExecutor) -> None:
+        with self._lock:
+            if self._executor is not executor or self._recycle_thread is not None or self._shutdown:
+                return  # Пул уже пересоздаётся или остановлен
+        processes = dict(getattr(executor, "_processes", None) or {})
+        for pid in processes:
+            rss_mb = get_process_rss_mb(pid)
+            if rss_mb is not None and rss_mb > self.max_worker_rss_mb:
+                with self._lock:
+                    if self._recycle_thread is not None or self._shutdown:
+                        return
+                    # Прогрев нового пула выполняется в отдельном потоке, а не в потоке управления пула
+                    self._recycle_thread = threading.Thread(
+                        target=self._recycle, args=(executor,), name="forecasting-pool-recycle", daemon=True
+                    )
+                logger.warning(
+                    f"Процесс пула {pid} занимает {rss_mb:.0f} МБ (предел {self.max_worker_rss_mb} МБ), "
+                    "пул прогнозирования будет пересоздан"
+                )
+                self._recycle_thread.start()
+                return
+
+    def _recycle(self, executor: ProcessPoolExecutor) -> None:
+        try:
+            new_executor = self._create_executor()
+            elapsed = self._warm(new_executor)[1]
+            with self._lock:
+                if self._shutdown:
+                    new_executor.shutdown(wait=False)
+                    return
+                self._executor = new_executor
+                self.recycles += 1
+                queued = [future for future in self._tasks if future.executor is executor]
+            moved = sum(self._move(future) for future in queued)
+            executor.shutdown(wait=False)
+            logger.info(
+                f"Пул прогнозирования пересоздан: новый пул прогрет за {elapsed:.3f} с, "
+                f"из очереди старого пула перенесено задач: {moved}"
+            )
+        except Exception as e:
+            logger.error(f"Ошибка при пересоздании пула прогнозирования: {e}")
+        finally:
+            with self._lock:
+                self._recycle_thread = None
+
+    def _move(self, future: PoolTaskFuture) -> bool:
+        """Переносит задачу, ещё не переданную процессу старого пула, в очередь текущего пула."""
+        with self._lock:
+            task = future.task
+            if task is None or task.running() or task.done():
+                return False
+            future.task = None
+        if task.cancel():
+            with self._lock:
+                if not self._shutdown:
+                    self._dispatch(future)
+                    return True
+            future.task = task
+            self._attempt_done(future, task)
+            return False
+        # Процесс старого пула успел забрать задачу: попытка остаётся в нём
+        future.task = task
+        if task.done():
+            self._attempt_done(future, task)
+        return False
+
+    @property
+    def shared_bytes(self) -> int:
+        """Объём разделяемой памяти, зарезервированный незавершёнными задачами, в байтах."""
+        return self._shared_bytes
+
+    def warm_up(self) -> float:
+        """
+        Запускает все процессы пула и дожидается их инициализации.
+
+        Returns
+        -------
+        float
+            Время прогрева пула в секундах.
+        """
+        with self._lock:
+            executor = self._executor
+        pids, elapsed = self._warm(executor)
+        logger.info(f"Пул прогнозирования прогрет за {elapsed:.3f} с (процессов: {len(pids)})")
+        return elapsed
+
+    def _warm(self, executor: ProcessPoolExecutor) -> Tuple[Set[int], float]:
+        started_at = time.perf_counter()
+        futures = [executor.submit(ping) for _ in range(self.max_workers)]
+        wait(futures)
+        return {future.result() for future in futures}, time.perf_counter() - started_at
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        with self._lock:
+            self._shutdown = True
+            recycle_thread = self._recycle_thread
+        if recycle_thread is not None:
+            recycle_thread.join()
+        with self._lock:
+            executor = self._executor
+        executor.shutdown(wait=wait, cancel_futures=cancel_futures)
@@ -0,0 +1,286 @@
+"""
+Передача временных рядов и результатов прогнозов процессам пула через разделяемую память.
+
+Аргументы задачи пула сериализуются (pickle), передаются процессу через канал и десериализуются
+в нём, а результат проделывает обратный путь; для длинного ряда это несколько копий буферов
+значений и дат. Вместо этого буферы длинного ряда копируются в сегмент разделяемой памяти
+(`multiprocessing.shared_memory`), а процессу передаётся только его дескриптор (`SharedSeries`):
+имя сегмента, длина ряда и частота. Процесс пула подключается к сегменту, копирует из него
+ряд и сразу отключается. Крупные массивы результата (даты, значения ряда, прогноз) процесс пула
+так же помещает в собственный сегмент и возвращает дескриптор (`SharedResult`).
+
+Сегменты всегда удаляет родительский процесс: сегмент аргументов — по завершении задачи
+(успешном, с ошибкой или отменой), сегмент результата — сразу после копирования из него массивов.
+"""
+
+import uuid
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from services.timeseries import TimeSeries
+
+
+# Префикс имён сегментов (по нему оставшиеся сегменты можно найти в /dev/shm)
+SEGMENT_PREFIX = "predictify_"
+
+# Выравнивание массивов внутри сегмента в байтах
+_ALIGNMENT = 64
+
+
+class SharedArray:
+    """
+    Расположение массива в сегменте разделяемой памяти.
+
+    Attributes
+    ----------
+    offset : int
+        Смещение массива от начала сегмента в байтах.
+    dtype : str
+        Тип элементов массива.
+    shape : tuple of int
+        Форма массива.
+    """
+
+    __slots__ = ("offset", "dtype", "shape")
+
+    def __init__(self, offset: int, dtype: str, shape: Tuple[int, ...]):
+        self.offset = offset
+        self.dtype = dtype
+        self.shape = shape
+
+    def __getstate__(self):
+        return self.offset, self.dtype, self.shape
+
+    def __setstate__(self, state):
+        self.offset, self.dtype, self.shape = state
+
+
+def _create_segment(arrays: Sequence[np.ndarray]) -> Tuple[SharedMemory, List[SharedArray]]:
+    # Сегмент с копиями массивов; при ошибке записи сегмент удаляется
+    layout = []
+    size = 0
+    for array in arrays:
+        layout.append(SharedArray(size, array.dtype.str, array.shape))
+        size += -(-array.nbytes // _ALIGNMENT) * _ALIGNMENT
+    shm = SharedMemory(name=f"{SEGMENT_PREFIX}{uuid.uuid4().hex[:16]}", create=True, size=max(size, 1))
+    try:
+        for array, location in zip(arrays, layout):
+            np.ndarray(location.shape, location.dtype, buffer=shm.buf, offset=location.offset)[...] = array
+    except BaseException:
+        shm.close()
+        shm.unlink()
+        raise
+    return shm, layout
+
+
+def _read_segment(name: str, layout: Sequence[SharedArray], unlink: bool = False) -> List[np.ndarray]:
+    # Копии массивов сегмента: ссылки на память сегмента не должны пережить его отключение
+    shm = SharedMemory(name=name)
+    try:
+        return [
+            np.ndarray(location.shape, location.dtype, buffer=shm.buf, offset=location.offset).copy()
+            for location in layout
+        ]
+    finally:
+        shm.close()
+        if unlink:
+            shm.unlink()
+
+
+class SharedSeries:
+    """
+    Дескриптор временного ряда, размещённого в разделяемой памяти.
+
+    Создаётся в родительском процессе методом `create`, передаётся процессу пула вместо ряда
+    и восстанавливается в нём методом `load`. Сегмент принадлежит создавшему его процессу
+    и удаляется методом `release` (или при выходе из блока `with`).
+
+    Attributes
+    ----------
+    name : str
+        Имя сегмента разделяемой памяти.
+    layout : list of SharedArray
+        Расположение значений и (если есть) дат ряда в сегменте.
+    freq : str or None
+        Частота ряда.
+    nbytes : int
+        Объём данных ряда в байтах.
+
+    Methods
+    -------
+    create(series)
+        Размещение ряда в новом сегменте.
+    load()
+        Копия ряда из сегмента.
+    release()
+        Удаление сегмента.
+    """
+
+    def __init__(self, name: str, layout: List[SharedArray], freq: Optional[str], nbytes: int):
+        self.name = name
+        self.layout = layout
+        self.freq = freq
+        self.nbytes = nbytes
+        self._shm: Optional[SharedMemory] = None
+
+    @classmethod
+    def create(cls, series: TimeSeries) -> "SharedSeries":
+        """
+        Копирует ряд в новый сегмент разделяемой памяти.
+
+        Parameters
+        ----------
+        series : TimeSeries
+            Временной ряд.
+
+        Returns
+        -------
+        SharedSeries
+            Дескриптор ряда, владеющий сегментом.
+        """
+        arrays = [series.endog] if series.dates is None else [series.endog, series.dates.view(np.int64)]
+        shm, layout = _create_segment(arrays)
+        shared = cls(shm.name, layout, series.freq, sum(array.nbytes for array in arrays))
+        shared._shm = shm
+        return shared
+
+    def __getstate__(self):
+        # Процессу пула передаётся только дескриптор, без объекта сегмента
+        return {"name": self.name, "layout": self.layout, "freq": self.freq, "nbytes": self.nbytes}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._shm = None
+
+    def __enter__(self) -> "SharedSeries":
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.release()
+
+    def __repr__(self) -> str:
+        return f"SharedSeries(name={self.name!r}, nbytes={self.nbytes}, freq={self.freq!r})"
+
+    def load(self) -> TimeSeries:
+        """
+        Восстанавливает ряд из сегмента (вызывается в процессе пула).
+
+        Ряд копируется из сегмента: обученные модели, сохраняемые в кэше процесса,
+        ссылаются на данные ряда и после удаления сегмента.
+
+        Returns
+        -------
+        TimeSeries
+            Копия ряда.
+        """
+        arrays = _read_segment(self.name, self.layout)
+        dates = arrays[1].view("datetime64[ns]") if len(arrays) > 1 else None
+        return TimeSeries(arrays[0], dates, freq=self.freq)
+
+    def release(self) -> None:
+        """Удаляет сегмент (повторный вызов ничего не делает)."""
+        if self._shm is None:
+            return
+        shm, self._shm = self._shm, None
+        shm.close()
+        try:
+            shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class SharedResult:
+    """
+    Результат задачи пула, крупные массивы которого размещены в разделяемой памяти.
+
+    Attributes
+    ----------
+    name : str
+        Имя сегмента, созданного процессом пула.
+    result : dict
+        Результат, в котором перенесённые массивы заменены их расположением в сегменте (`SharedArray`).
+    """
+
+    def __init__(self, name: str, result: Dict[str, Any]):
+        self.name = name
+        self.result = result
+
+
+def export_result(result: Any, min_bytes: int) -> Any:
+    """
+    Переносит крупные массивы результата-словаря в сегмент разделяемой памяти.
+
+    Вызывается в процессе пула. Сегмент не удаляется: его удаляет родительский процесс
+    в `receive_result`.
+
+    Parameters
+    ----------
+    result : Any
+        Результат задачи.
+    min_bytes : int
+        Минимальный объём массива, переносимого в разделяемую память, в байтах.
+
+    Returns
+    -------
+    Any
+        `SharedResult` или исходный результат, если переносить нечего.
+    """
+    if not isinstance(result, dict):
+        return result
+    keys = [
+        key for key, value in result.items()
+        if isinstance(value, np.ndarray) and not value.dtype.hasobject and value.nbytes >= min_bytes
+    ]
+    if not keys:
+        return result
+    shm, layout = _create_segment([np.ascontiguousarray(result[key]) for key in keys])
+    shm.close()
+    return SharedResult(shm.name, {**result, **dict(zip(keys, layout))})
+
+
+def receive_result(result: Any) -> Any:
+    """
+    Восстанавливает результат задачи пула и удаляет сегмент его массивов.
+
+    Parameters
+    ----------
+    result : Any
+        Результат задачи (`SharedResult` или обычный результат).
+
+    Returns
+    -------
+    Any
+        Исходный результат задачи.
+    """
+    if not isinstance(result, SharedResult):
+        return result
+    keys = [key for key, value in result.result.items() if isinstance(value, SharedArray)]
+    arrays = _read_segment(result.name, [result.result[key] for key in keys], unlink=True)
+    return {**result.result, **dict(zip(keys, arrays))}
+
+
+def call_with_shared(result_min_bytes: Optional[int], fn: Callable, *args, **kwargs) -> Any:
+    """
+    Выполняет функцию, восстанавливая ряды из разделяемой памяти (вызывается в процессе пула).
+
+    Parameters
+    ----------
+    result_min_bytes : int or None
+        Минимальный объём массива результата, переносимого в разделяемую память
+        (None — результат возвращается как есть).
+    fn : Callable
+        Выполняемая функция.
+    *args, **kwargs
+        Аргументы функции; дескрипторы `SharedSeries` заменяются рядами.
+
+    Returns
+    -------
+    Any
+        Результат функции (при необходимости — `SharedResult`).
+    """
+    args = tuple(arg.load() if isinstance(arg, SharedSeries) else arg for arg in args)
+    kwargs = {key: value.load() if isinstance(value, SharedSeries) else value for key, value in kwargs.items()}
+    result = fn(*args, **kwargs)
+    return result if result_min_bytes is None else export_result(result, result_min_bytes)
@@ -216,7 +216,7 @@ const helpContentRu = `
 Здесь вы найдете краткую инструкцию по загрузке данных и использованию сервиса прогнозирования.
 
 1. Поддерживаемые форматы
-Вы можете загружать файлы в формате CSV или Excel (.xlsx/.xls). Файл должен иметь размер до 100 КБ.
+Вы можете загружать файлы в формате CSV, Excel (.xlsx/.xls), Parquet или Arrow IPC (.feather/.arrow). Файл должен иметь размер до 64 МБ и содержать не более 2 000 000 строк.
 
 2. Требования к структуре данных
 Для построения прогноза необходимо, чтобы данные содержали хотя бы один числовой столбец — endog (значения временного ряда). Для разметки данных по времени в файле может находится столбец с датами — date, но его наличие необязательно. Строка заголовков (названия столбцов) также необязательно должна присутствовать в файле. Для действительных чисел в качестве разделителя целой и дробной частей необходимо использовать точку.
@@ -234,7 +234,7 @@ Help
 Here you will find a brief guide on how to upload your data and use the forecasting service.
 
 1. Supported formats
-You can upload files in CSV or Excel (.xlsx/.xls) format. The file size must not exceed 100 KB.
+You can upload files in CSV, Excel (.xlsx/.xls), Parquet or Arrow IPC (.feather/.arrow) format. The file size must not exceed 64 MB and the file must contain no more than 2,000,000 rows.
 
 2. Data structure requirements
 To build a forecast, the data must contain at least one numerical column — endog (time series values). To associate data with time, a column with dates — date — can be included, but it is optional. A header row (with column names) is also optional. For real numbers, a dot must be used as the decimal separator between the integer and fractional parts.
@@ -228,7 +228,7 @@ function DataUploader({ onUpload, theme }) {
         type="file"
         className="hidden"
         onChange={handleFileChange}
-        accept=".csv, .xls, .xlsx" // Указываем допустимые форматы
+        accept=".csv, .xls, .xlsx, .parquet, .feather, .arrow" // Указываем допустимые форматы
       />
 
       {/* Если файл выбран, отображаем его имя и кнопку удаления */}
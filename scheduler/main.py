@@ -4,15 +4,18 @@
 Основные действия:
 - Инициализирует базу данных
 - Загружает конфигурацию задач из YAML-файла
+- Запускает сервер метрик Prometheus (порт задаётся переменной окружения METRICS_PORT)
 - Запускает планировщик задач с использованием пула процессов
 """
 
+import os
 import asyncio
 import signal
 from concurrent.futures import ProcessPoolExecutor
 
 from database import init_db
 from logger import Logger
+from metrics import clear_multiprocess_dir, start_metrics_server
 from scheduler import Scheduler
 from config_loader import ConfigLoader
 
@@ -26,9 +29,16 @@ async def main():
 
     - Инициализирует БД
     - Загружает конфиг задач
+    - Запускает сервер метрик
     - Создаёт экземпляр планировщика
     - Запускает планировщик в фоне
     """
+    # Каталог метрик очищается до запуска процессов пула, которые пишут в него значения
+    clear_multiprocess_dir()
+    metrics_port = int(os.getenv("METRICS_PORT", 9100))
+    start_metrics_server(metrics_port)
+    logger.info(f"Сервер метрик запущен на порту {metrics_port}")
+
     init_db()
 
     config_loader = ConfigLoader("scheduler/scheduler_config.yml")
@@ -6,7 +6,9 @@
 - Периодический запуск задач из конфигурационного файла
 - Парсинг новых данных
 - Обновление фактических значений в БД
-- Построение и сохранение прогнозов
+- Построение и сохранение прогнозов (с тёплым стартом обучения от параметров предыдущего запуска
+  и инкрементальным обновлением модели между полными переобучениями согласно `refit_policy`)
+- Запись длительности этапов задач в метрики
 """
 
 import asyncio
@@ -15,13 +17,16 @@ from concurrent.futures import ProcessPoolExecutor
 from typing import Dict, List
 from datetime import datetime
 
+import numpy as np
 from sqlalchemy import desc
 
-from database.crud import get_crud_for_table
+from database.crud import get_crud_for_table, model_state_crud, data_version_crud
 from database import get_db_session
 from services.parsers import parse
 from services.forecasting import forecast
+from services.timeseries import TimeSeries, to_datetimes
 from logger import Logger
+from metrics import SCHEDULER_PHASE_SECONDS, PhaseTimer
 
 
 logger = Logger(name='scheduler', log_dir='logs', log_file='scheduler.log').get_logger()
@@ -115,6 +120,7 @@ class Scheduler:
         logger.info(f"🔮 Model: {task_config['model']['type']}")
         logger.info(f"{'='*50}")
 
+        timer = PhaseTimer(SCHEDULER_PHASE_SECONDS, task=task_config['name'])
         session_generator = get_db_session() # Генератор должен жить все время работы функции, после выхода из области видимости сгенерится GeneratorExit и соединение закроется
 
         try:
@@ -132,6 +138,7 @@ class Scheduler:
             )
             last_obs_date = last_observation.date if last_observation else None
             logger.info(f"\n📅 Last observation date in DB: {last_obs_date or 'No data'}")
+            timer.mark("load_last_observation")
 
             # Парсим новые наблюдаемые данные
             logger.info("\n🔄 Fetching new data from source...")
@@ -139,43 +146,57 @@ class Scheduler:
                 parser_type=task_config['parser']['type'],
                 params=task_config['parser']['params']
             )
-            logger.info(f"✅ Received {len(parsed_data['dates'])} data points")
-            logger.info(f"📆 Date range: {parsed_data['dates'][0]} to {parsed_data['dates'][-1]}")
+            logger.info(f"✅ Received {len(parsed_data)} data points")
+            logger.info(f"📆 Date range: {parsed_data.dates[0]} to {parsed_data.dates[-1]}")
+            timer.mark("parse")
 
-            # Фильтруем напарсенные данные и вычисляем ошибки для старых прогнозов
+            # Фильтруем напарсенные данные (векторно) и вычисляем ошибки для старых прогнозов
             updated_forecasts = 0
+            new_errors = []
             new_observations = []
-            for i, date in enumerate(parsed_data["dates"]):
-                if not last_obs_date or date > last_obs_date:
-                    existing_record = db_session.query(crud.model)\
-                                    .filter(crud.model.date == date)\
-                                    .first()       
-                    if existing_record and existing_record.predict is not None:
-                        existing_record.endog = parsed_data["endog"][i]
-                        if parsed_data["endog"][i] is not None:
-                            existing_record.absolute_error = abs(parsed_data["endog"][i] - existing_record.predict)
-                        updated_forecasts += 1
-                        logger.info(f"🔄 Updated forecast for {date} with actual data")
-                    else:
-                        new_observations.append({
-                            "date": date, 
-                            "endog": parsed_data["endog"][i],
-                            "predict": None,
-                            "ci_low": None,
-                            "ci_up": None,
-                            "conf_level": None, 
-                            "absolute_error": None,  
-                            "last_summary": None,
-                        })  
-            if updated_forecasts > 0:
+            if last_obs_date:
+                is_new = parsed_data.dates > np.datetime64(last_obs_date)
+            else:
+                is_new = np.ones(len(parsed_data), dtype=bool)
+            for date, value in zip(to_datetimes(parsed_data.dates[is_new]), parsed_data.endog[is_new].tolist()):
+                value = None if np.isnan(value) else value  # Пропуск в данных источника
+                existing_record = db_session.query(crud.model)\
+                                .filter(crud.model.date == date)\
+                                .first()
+                if existing_record and existing_record.predict is not None:
+                    existing_record.endog = value
+                    if value is not None:
+                        existing_record.absolute_error = abs(value - existing_record.predict)
+                        new_errors.append(existing_record.absolute_error)
+                    updated_forecasts += 1
+                    logger.info(f"🔄 Updated forecast for {date} with actual data")
+                else:
+                    new_observations.append({
+                        "date": date,
+                        "endog": value,
+                        "predict": None,
+                        "ci_low": None,
+                        "ci_up": None,
+                        "conf_level": None,
+                        "absolute_error": None,
+                        "last_summary": None,
+                    })
+            if new_observations:
+                crud.bulk_create(db_session, new_observations, commit=False)
+            if updated_forecasts or new_observations:
+                # Версия таблицы увеличивается после записи всех изменений и фиксируется с ними
+                # в одной транзакции: API и подписчики не увидят новую версию без новых данных
+                data_version_crud.bump(db_session, tablename)
                 db_session.commit()
+            if updated_forecasts > 0:
                 logger.info(f"📊 Updated {updated_forecasts} existing forecasts with actual data")
             if new_observations:
-                crud.bulk_create(db_session, new_observations)
                 logger.info(f"💾 Saved {len(new_observations)} new observations")
             else:
                 logger.info("\n🆗 No new observations to save")
+            timer.mark("save_observations")
             if not updated_forecasts and not new_observations:
+                timer.total()
                 return True
 
             # Получаем данные для прогнозирования
@@ -194,24 +215,54 @@ class Scheduler:
             logger.info(f"📆 From {observations_for_forecast[-1].date} to {observations_for_forecast[0].date}")  
 
             # Подготовка данных для прогноза
-            forecast_input = {
-                'endog': [obs.endog for obs in reversed(observations_for_forecast)],
-                'dates': [obs.date for obs in reversed(observations_for_forecast)]
-            }
+            forecast_input = TimeSeries(
+                [obs.endog for obs in reversed(observations_for_forecast)],
+                [obs.date for obs in reversed(observations_for_forecast)],
+            )
+
+            # Параметры предыдущего обучения для тёплого старта (если конфигурация модели не менялась)
+            model_type = task_config['model']['type']
+            model_settings = dict(task_config['model']['params'])
+            model_state = model_state_crud.get_by_task_name(db_session, task_config['name'])
+            start_params = None
+            fixed_params = None
+            if model_state and model_state.model_type == model_type and model_state.settings == model_settings:
+                start_params = model_state.params
+
+                # Между полными переобучениями модель только применяется к новым данным с прежними параметрами
+                refit_policy = task_config['model'].get('refit_policy') or {}
+                full_refit_every = refit_policy.get('full_refit_every', 1)
+                error_threshold = refit_policy.get('error_threshold')
+                recent_error = sum(new_errors) / len(new_errors) if new_errors else None
+                refit_due = (model_state.ticks_since_refit or 0) + 1 >= full_refit_every
+                error_drifted = error_threshold is not None and recent_error is not None and recent_error > error_threshold
+
+                if refit_due or error_drifted:
+                    reason = "error drift" if error_drifted else "schedule"
+                    logger.info(f"♨️ Full refit ({reason}), warm start from parameters fitted at {model_state.updated_at}")
+                else:
+                    fixed_params = start_params
+                    logger.info(f"⏩ Incremental update with parameters fitted at {model_state.updated_at}")
+
+            timer.mark("load_window")
 
             # Строим прогноз
             logger.info('forecast_input: ', forecast_input)
             logger.info("\n🔮 Running forecast...")
             forecast_result = forecast(
                 data=forecast_input,
-                model_type=task_config['model']['type'],
-                settings=task_config['model']['params']
+                model_type=model_type,
+                settings=dict(model_settings),
+                start_params=start_params,
+                fixed_params=fixed_params,
+                return_params=True,
             )
             logger.info(f"✅ Forecast completed for {len(forecast_result['prediction'])} future points")
+            timer.mark("forecast")
 
             # Добавление прогнозов в БД
-            historical_len = len(forecast_input['endog'])
-            forecast_dates = forecast_result['full_dates'][historical_len:]
+            historical_len = len(forecast_input)
+            forecast_dates = to_datetimes(forecast_result['full_dates'][historical_len:])
             logger.info(f"\n📝 Updating {len(forecast_dates)} forecast points in DB...")
             
             updated = 0
@@ -242,9 +293,26 @@ class Scheduler:
                     )
                     db_session.add(new_forecast)
 
+            data_version_crud.bump(db_session, tablename)
             db_session.commit()
             logger.info(f"📊 Forecast points updated: {updated}")
             logger.info(f"📊 Forecast points created: {created}")
+            timer.mark("save_forecast")
+
+            # Сохраняем обученные параметры для тёплого старта на следующем запуске
+            if forecast_result.get('params') is not None:
+                model_state_crud.save(db_session, task_config['name'], {
+                    'tablename': tablename,
+                    'model_type': model_type,
+                    'settings': model_settings,
+                    'params': forecast_result['params'],
+                    'ticks_since_refit': (model_state.ticks_since_refit or 0) + 1 if fixed_params is not None else 0,
+                    'window_start': observations_for_forecast[-1].date,
+                    'window_end': observations_for_forecast[0].date,
+                })
+                logger.info("💾 Model parameters saved for warm start")
+                timer.mark("save_model_state")
+            timer.total()
             logger.info(f"\n🎉 Task completed successfully!")
             return True
 
@@ -1,50 +1,61 @@
 #!/usr/bin/env python3
+"""
+Подбор порядков SARIMA для задач планировщика.
+
+Для каждой задачи из scheduler_config.yml запускает параллельный перебор по сетке
+(services.forecasting.tuning.SARIMAGridSearch). Промежуточные результаты и загруженные
+данные сохраняются в --output-dir, поэтому прерванный запуск продолжается с места остановки.
+Лучшие порядки записываются в YAML-файл в формате scheduler_config.yml.
+"""
 
 import os
 import sys
-import pandas as pd
-import numpy as np
-import itertools
-import matplotlib.pyplot as plt
+import json
+import argparse
 import datetime
-import warnings
+
+import yaml
+import numpy as np
 from tqdm import tqdm
-from sklearn.metrics import mean_squared_error
-from statsmodels.tsa.statespace.sarimax import SARIMAX
-from statsmodels.tools.sm_exceptions import ModelWarning, ValueWarning
 
-# Добавление корня проекта в Path (для того чтобы ресолвились нужные модули)
+# Добавление корня проекта и бэкенда в Path (для того чтобы ресолвились нужные модули)
 parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
-if parent_dir not in sys.path:
-    sys.path.insert(0, parent_dir)
+backend_dir = os.path.join(parent_dir, 'backend')
+for path in (parent_dir, backend_dir):
+    if path not in sys.path:
+        sys.path.insert(0, path)
 
 from scheduler.config_loader import ConfigLoader
-from backend.services.parsers import parse
-
-warnings.simplefilter("ignore", ModelWarning)
-warnings.simplefilter("ignore", ValueWarning)
-warnings.simplefilter("ignore", UserWarning)
-warnings.simplefilter("ignore", RuntimeWarning)
-
-config_loader = ConfigLoader("../scheduler/scheduler_config.yml")
-tasks_config = config_loader.tasks
-
-# ПАРАМЕТРЫ:
-# Перебор параметров SARIMA
-p = d = q = range(0, 3)
-P = D = Q = range(0, 3)
-seasonal_period = 24
-# Кол-во дней до end_date
-days_back = 5
-
-for task_config in tasks_config:
-    task_name = task_config['name'] 
-    print("=" * 60)
-    print(f"🔮 Прогнозирование для задачи: {task_name}")
-    print("-" * 60)
-
-    print("📥 Парсинг данных...")
-    end_date = datetime.datetime.strptime(task_config['parser']['params']['end_date'], "%Y-%m-%d").date()
+from services.parsers import parse
+from services.timeseries import TimeSeries
+from services.forecasting.tuning import SARIMAGridSearch, record_to_params
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Подбор порядков SARIMA для задач планировщика")
+    parser.add_argument("--config", default=os.path.join(parent_dir, "scheduler", "scheduler_config.yml"))
+    parser.add_argument("--output-dir", default="sarimax_fit_results")
+    parser.add_argument("--tasks", nargs="*", help="Имена задач (по умолчанию все)")
+    parser.add_argument("--max-order", type=int, default=2, help="Максимальное значение p, d, q, P, D, Q")
+    parser.add_argument("--seasonal-period", type=int, default=24)
+    parser.add_argument("--days-back", type=int, default=5, help="Кол-во дней до end_date")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--criterion", choices=["aic", "bic"], default="aic")
+    parser.add_argument("--criterion-margin", type=float, default=None,
+                        help="Не проверять на отложенной выборке кандидатов с критерием хуже лучшего на эту величину")
+    parser.add_argument("--metric", choices=["rmse", "aic", "bic"], default="rmse")
+    parser.add_argument("--restart", action="store_true", help="Начать перебор заново, удалив сохранённые результаты")
+    return parser.parse_args()
+
+
+def load_task_data(task_config, data_path, days_back):
+    """Загружает данные задачи из сохранённого файла или парсит их заново."""
+    if os.path.exists(data_path):
+        with open(data_path, "r") as f:
+            saved = json.load(f)
+        return TimeSeries(saved["endog"], saved["dates"])
+
+    end_date = datetime.datetime.strptime(str(task_config['parser']['params']['end_date']), "%Y-%m-%d").date()
     start_date = end_date - datetime.timedelta(days=days_back)
     task_config['parser']['params']['start_date'] = start_date.strftime('%Y-%m-%d')
     parsed_data = parse(
@@ -52,67 +63,99 @@ for task_config in tasks_config:
         params=task_config['parser']['params']
     )
 
-    print("🧹 Очистка данных...")
-    df = pd.DataFrame({
-        'date': parsed_data['dates'],
-        'value': parsed_data['endog']
-    }).dropna()
-    df.set_index('date', inplace=True)
-
-    try:
-        inferred_freq = pd.infer_freq(df.index)
-        df.index = pd.DatetimeIndex(df.index, freq=inferred_freq)
-        print(f"⏱ Частота временного ряда определена как: {inferred_freq}")
-    except Exception:
-        print("⚠️ Не удалось определить частоту временного ряда.")
-
-    # Деление на train/test
-    train_size = int(len(df) * 0.8)
-    train, test = df.iloc[:train_size], df.iloc[train_size:]
-    print(f"📊 Размер train: {len(train)}, test: {len(test)}")
-
-    pdq = list(itertools.product(p, d, q))
-    seasonal_pdq = list(itertools.product(P, D, Q))
-
-    results = []
-
-    print(f"⚙️ Начинаем перебор параметров SARIMAX (может занять время)...")
-    for param in tqdm(pdq):
-        for seasonal in seasonal_pdq:
-            try:
-                model = SARIMAX(
-                    train,
-                    order=param,
-                    seasonal_order=seasonal + (seasonal_period,),
-                    enforce_stationarity=False,
-                    enforce_invertibility=False
-                )
-                model_fit = model.fit(disp=False)
-                pred = model_fit.forecast(steps=len(test))
-                rmse = np.sqrt(mean_squared_error(test, pred))
-
-                results.append({
-                    'order': param,
-                    'seasonal_order': seasonal + (seasonal_period,),
-                    'rmse': rmse
-                })
-            except Exception:
-                continue
-
-    if not results:
-        print("❌ Не удалось подобрать модель. Пропускаем задачу.")
-        continue
-
-    results.sort(key=lambda x: x['rmse'])
-    top_n = 3
-
-    print("\n🏆 Топ-3 конфигурации по RMSE:")
-    print("{:<15} {:<25} {:<10}".format("Order", "Seasonal Order", "RMSE"))
-    for r in results[:top_n]:
-        print("{:<15} {:<25} {:.4f}".format(
-            str(r['order']),
-            str(r['seasonal_order']),
-            r['rmse']
-        ))
-    print('\n')
-    
+    # Очистка данных от пропусков
+    observed = ~np.isnan(parsed_data.endog)
+    data = TimeSeries(parsed_data.endog[observed], parsed_data.dates[observed])
+
+    with open(data_path, "w") as f:
+        json.dump({
+            "endog": data.endog.tolist(),
+            "dates": np.datetime_as_string(data.dates, unit="s").tolist(),
+        }, f)
+    return data
+
+
+def main():
+    args = parse_args()
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    tasks_config = ConfigLoader(args.config).tasks
+    if args.tasks:
+        tasks_config = [t for t in tasks_config if t['name'] in args.tasks]
+
+    orders = range(0, args.max_order + 1)
+    tuned_tasks = []
+
+    for task_config in tasks_config:
+        task_name = task_config['name']
+        print("=" * 60)
+        print(f"🔮 Подбор параметров для задачи: {task_name}")
+        print("-" * 60)
+
+        data_path = os.path.join(args.output_dir, f"{task_name}.data.json")
+        results_path = os.path.join(args.output_dir, f"{task_name}.results.jsonl")
+        if args.restart:
+            for path in (data_path, results_path):
+                if os.path.exists(path):
+                    os.remove(path)
+
+        print("📥 Загрузка данных...")
+        data = load_task_data(task_config, data_path, args.days_back)
+
+        model_params = task_config['model']['params']
+        search = SARIMAGridSearch(
+            data,
+            p_values=orders, d_values=orders, q_values=orders,
+            P_values=orders, D_values=orders, Q_values=orders,
+            s=args.seasonal_period,
+            settings={
+                "trend": model_params.get("trend"),
+                "enforce_stationarity": False,
+                "enforce_invertibility": False,
+            },
+            criterion=args.criterion,
+            criterion_margin=args.criterion_margin,
+            results_path=results_path,
+            max_workers=args.workers,
+        )
+        print(f"📊 Размер train: {len(search.train)}, test: {len(search.test_endog)}")
+
+        total = len(search.candidates())
+        with tqdm(total=total, desc="⚙️ Перебор параметров SARIMAX") as progress_bar:
+            results = search.run(progress=lambda record: progress_bar.update(1))
+            progress_bar.n = len(results)
+            progress_bar.refresh()
+
+        pruned = sum(1 for r in results if r["pruned"])
+        print(f"✂️ Отсечено кандидатов: {pruned} из {len(results)}")
+
+        best = search.best(args.metric)
+        if best is None:
+            print("❌ Не удалось подобрать модель. Пропускаем задачу.")
+            continue
+
+        valid = sorted((r for r in results if r["rmse"] is not None), key=lambda r: r[args.metric])
+        print(f"\n🏆 Топ-3 конфигурации по {args.metric.upper()}:")
+        print("{:<15} {:<25} {:<10} {:<10}".format("Order", "Seasonal Order", "RMSE", args.criterion.upper()))
+        for r in valid[:3]:
+            print("{:<15} {:<25} {:<10.4f} {:<10.2f}".format(
+                str(tuple(r['order'])),
+                str(tuple(r['seasonal_order'])),
+                r['rmse'],
+                r[args.criterion],
+            ))
+        print('\n')
+
+        tuned_tasks.append({
+            "name": task_name,
+            "model": {"type": "SARIMA", "params": record_to_params(best)},
+        })
+
+    output_path = os.path.join(args.output_dir, "tuned_config.yml")
+    with open(output_path, "w") as f:
+        yaml.safe_dump({"tasks": tuned_tasks}, f, sort_keys=False, allow_unicode=True)
+    print(f"💾 Подобранные параметры сохранены в {output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Сравнение конвертеров Parquet и Arrow IPC (Feather) с конвертером CSV.
+
+Генерирует часовой ряд заданной длины и сохраняет его во временный каталог в виде CSV
+(даты ISO 8601), Parquet и Feather v2 (даты как метки времени и как строки), после чего
+преобразует каждый файл через `converters.convert_file` (как в пуле преобразования файлов),
+сверяет результаты с рядом из CSV и выводит размер файла и время преобразования.
+Завершается с ненулевым кодом, если результаты различаются.
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import statistics
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
+
+# Добавление бэкенда в Path (для того чтобы ресолвились нужные модули)
+backend_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+if backend_dir not in sys.path:
+    sys.path.insert(0, backend_dir)
+
+from converters import convert_file
+
+
+def write_files(directory: str, rows: int) -> dict:
+    """Сохраняет один и тот же ряд в каждом из форматов и возвращает пути к файлам."""
+    values = np.round(np.random.default_rng(0).normal(10.0, 3.0, rows).cumsum(), 4)
+    dates = pd.date_range("2000-01-01", periods=rows, freq="h")
+    table = pa.table({"dates": pa.array(dates.to_numpy(), pa.timestamp("ns")), "value": values})
+    string_table = table.set_column(0, "dates", pa.array(dates.strftime("%Y-%m-%d %H:%M:%S")))
+
+    paths = {name: os.path.join(directory, f"data.{name.split()[0]}") for name in ("csv", "parquet", "feather")}
+    paths["feather (str)"] = os.path.join(directory, "data_str.feather")
+
+    pd.DataFrame({"dates": dates.strftime("%Y-%m-%d %H:%M:%S"), "value": values}).to_csv(paths["csv"], index=False)
+    pq.write_table(table, paths["parquet"])
+    feather.write_feather(table, paths["feather"], compression="uncompressed")
+    feather.write_feather(string_table, paths["feather (str)"], compression="uncompressed")
+    return paths
+
+
+def convert(path: str, repeat: int):
+    timings = []
+    result = None
+    for _ in range(repeat):
+        # Неизвестный формат разбирается как ISO 8601 (даты с временем)
+        settings = {"csvDelimiter": ",", "dateFormat": "ISO 8601"}
+        started_at = time.perf_counter()
+        result = convert_file(path, os.path.basename(path), settings)
+        timings.append(time.perf_counter() - started_at)
+    return result, statistics.median(timings)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Сравнение конвертеров Parquet/Arrow IPC и CSV")
+    parser.add_argument("--rows", type=int, nargs="*", default=[100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    print("{:>9} {:<14} {:>10} {:>10} {:>8}".format("rows", "format", "size, MB", "time, s", "speedup"))
+
+    failed = 0
+    for rows in args.rows:
+        with tempfile.TemporaryDirectory() as directory:
+            paths = write_files(directory, rows)
+            reference, reference_time = convert(paths["csv"], args.repeat)
+            for name, path in paths.items():
+                series, elapsed = convert(path, args.repeat)
+                if not (np.array_equal(series.endog, reference.endog) and np.array_equal(series.dates, reference.dates)):
+                    failed += 1
+                    print(f"Результаты различаются: rows={rows}, format={name}")
+                print("{:>9} {:<14} {:>10.1f} {:>10.3f} {:>7.1f}x".format(
+                    rows, name, os.path.getsize(path) / 2**20, elapsed, reference_time / elapsed))
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
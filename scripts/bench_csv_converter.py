@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Сравнение векторизованного конвертера CSV с прежней построчной реализацией.
+
+Генерирует CSV-файлы заданного размера с датами в каждом из поддерживаемых форматов
+и без столбца дат, конвертирует их прежним способом (decode, csv.DictReader, strptime
+для каждой строки) и текущим `converters.csv_to_dict`, сверяет результаты и выводит время конвертации
+(с --memory — также пиковое потребление памяти; трассировка tracemalloc заметно замедляет
+обе реализации, поэтому по умолчанию отключена). Завершается с ненулевым кодом, если результаты различаются.
+"""
+
+import os
+import sys
+import csv
+import time
+import argparse
+import tracemalloc
+from io import BytesIO, StringIO
+from datetime import datetime, timedelta
+
+import numpy as np
+from starlette.datastructures import UploadFile
+
+# Добавление бэкенда в Path (для того чтобы ресолвились нужные модули)
+backend_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+if backend_dir not in sys.path:
+    sys.path.insert(0, backend_dir)
+
+from converters import csv_to_dict
+from converters.config import ConvertersConfig
+from converters.utils import detect_date_format, detect_delimiter
+
+
+def legacy_csv_to_dict(file: UploadFile, delimiter: str = "auto", date_format: str = "auto") -> dict:
+    """Прежняя реализация конвертера (без ограничения количества строк)."""
+    content = file.file.read().decode('utf-8')
+    file.file.seek(0)
+
+    if delimiter == "auto":
+        first_line = content.split('\n')[0]
+        delimiter = detect_delimiter(first_line, ConvertersConfig.CSV_DELIMITERS, ConvertersConfig.CSV_DEFAULT_DELIMETER)
+
+    reader = csv.DictReader(StringIO(content), delimiter=delimiter)
+    use_index = "dates" not in reader.fieldnames
+    data = {"dates": None, "endog": []} if use_index else {"dates": [], "endog": []}
+
+    if date_format == "auto" and not use_index:
+        date_format = detect_date_format(next(reader)["dates"])
+
+    reader = csv.DictReader(StringIO(content), delimiter=delimiter)
+    for row in reader:
+        if use_index:
+            data["endog"].append(float(list(row.values())[0]))
+        else:
+            date_str = row["dates"]
+            if date_format in ConvertersConfig.DATE_FORMATS:
+                date = datetime.strptime(date_str, ConvertersConfig.DATE_FORMATS[date_format])
+            else:
+                date = datetime.fromisoformat(date_str)
+            data["dates"].append(date)
+            data["endog"].append([float(val) for key, val in row.items() if key != "dates"][0])
+    return data
+
+
+def make_csv(rows: int, date_format: str, delimiter: str, seed: int = 0) -> bytes:
+    """Генерирует CSV-файл с суточным рядом; при date_format=None — без столбца дат."""
+    rng = np.random.default_rng(seed)
+    values = np.round(rng.normal(10.0, 3.0, rows).cumsum(), 4)
+    if date_format is None:
+        lines = ["value"] + [repr(float(v)) for v in values]
+    else:
+        start = datetime(2000, 1, 1)
+        strftime_format = ConvertersConfig.DATE_FORMATS[date_format]
+        # Шаг в один день, чтобы даты в формате без времени не повторялись
+        lines = [f"dates{delimiter}value"] + [
+            f"{(start + timedelta(days=i % 36500)).strftime(strftime_format)}{delimiter}{float(v)!r}"
+            for i, v in enumerate(values)
+        ]
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def measure(func, content: bytes, date_format: str, memory: bool):
+    file = UploadFile(BytesIO(content), filename="data.csv")
+    start = time.perf_counter()
+    result = func(file, date_format=date_format)
+    elapsed = time.perf_counter() - start
+    if not memory:
+        return result, elapsed, float("nan")
+
+    file.file.seek(0)
+    tracemalloc.start()
+    func(file, date_format=date_format)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Сравнение конвертеров CSV")
+    parser.add_argument("--rows", type=int, nargs="*", default=[1_000, 100_000, 1_000_000])
+    parser.add_argument("--formats", nargs="*", default=["none", *ConvertersConfig.DATE_FORMATS],
+                        help="Форматы дат ('none' — файл без столбца дат)")
+    parser.add_argument("--delimiter", default=",")
+    parser.add_argument("--memory", action="store_true", help="Измерять пиковое потребление памяти")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    print("{:>9} {:<11} {:>10} {:>10} {:>8} {:>12} {:>12}".format(
+        "rows", "dates", "legacy, s", "new, s", "speedup", "legacy, MB", "new, MB"))
+
+    failed = 0
+    for rows in args.rows:
+        for date_format in args.formats:
+            content = make_csv(rows, None if date_format == "none" else date_format, args.delimiter)
+            # Формат передаётся явно: для первой даты 01/01 форматы MM/DD и DD/MM неразличимы
+            legacy, legacy_time, legacy_peak = measure(legacy_csv_to_dict, content, date_format, args.memory)
+            new, new_time, new_peak = measure(csv_to_dict, content, date_format, args.memory)
+
+            new = {"dates": new.to_datetimes() or None, "endog": new.endog.tolist()}
+            if legacy != new:
+                failed += 1
+                print(f"Результаты различаются: rows={rows}, dates={date_format}")
+
+            print("{:>9} {:<11} {:>10.3f} {:>10.3f} {:>7.1f}x {:>12.1f} {:>12.1f}".format(
+                rows, date_format, legacy_time, new_time, legacy_time / new_time,
+                legacy_peak / 2**20, new_peak / 2**20))
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
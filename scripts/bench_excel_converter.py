@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Сравнение потокового конвертера Excel с прежней реализацией на `pd.read_excel`.
+
+Генерирует Excel-файлы заданного размера с датами в ячейках-датах, со строковыми датами
+и без столбца дат (с дополнительными столбцами, которые конвертер не должен читать),
+конвертирует их прежним способом (`pd.read_excel` и strptime для каждой строки) и текущим
+`converters.excel_to_dict`, сверяет результаты и выводит время конвертации (с --memory —
+также пиковое потребление памяти по tracemalloc). Затем проверяет, что файл, превышающий
+допустимое количество строк (--limit), отклоняется, не дочитываясь до конца.
+Завершается с ненулевым кодом, если результаты различаются или файл не отклонён.
+"""
+
+import os
+import sys
+import time
+import argparse
+import tracemalloc
+from io import BytesIO
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import openpyxl
+from starlette.datastructures import UploadFile
+
+# Добавление бэкенда в Path (для того чтобы ресолвились нужные модули)
+backend_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+if backend_dir not in sys.path:
+    sys.path.insert(0, backend_dir)
+
+from converters import excel_to_dict
+from converters.config import ConvertersConfig
+from converters.utils import detect_date_format
+from services.timeseries import TimeSeries
+
+
+def legacy_excel_to_dict(file: UploadFile) -> TimeSeries:
+    """Прежняя реализация конвертера (формат дат всегда определяется автоматически)."""
+    df = pd.read_excel(file.file)
+    if "dates" not in df.columns:
+        return TimeSeries(df.iloc[:, 0].to_numpy(dtype=float))
+
+    sample_date = df["dates"].iloc[0]
+    if isinstance(sample_date, str):
+        strftime_format = ConvertersConfig.DATE_FORMATS[detect_date_format(sample_date)]
+        df["dates"] = df["dates"].apply(lambda x: datetime.strptime(x, strftime_format))
+    else:
+        df["dates"] = pd.to_datetime(df["dates"])
+    return TimeSeries(df.drop(columns=["dates"]).iloc[:, 0].to_numpy(dtype=float), df["dates"])
+
+
+def make_excel(rows: int, kind: str) -> bytes:
+    """Генерирует книгу с суточным рядом: kind — "cells" (ячейки-даты), "strings" или "none" (без дат)."""
+    values = np.round(np.random.default_rng(0).normal(10.0, 3.0, rows).cumsum(), 4).tolist()
+    start = datetime(2000, 1, 1)
+    # Книга сохраняется в обычном режиме: как и Excel, он записывает размеры листа в начало листа
+    # (без них openpyxl при открытии листа на чтение просматривает его целиком)
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    if kind == "none":
+        sheet.append(["value", "comment", "extra"])
+        for v in values:
+            sheet.append([v, "note", 1])
+    else:
+        sheet.append(["dates", "value", "comment"])
+        for i, v in enumerate(values):
+            date = start + timedelta(days=i % 36500)
+            sheet.append([date.strftime("%d.%m.%Y") if kind == "strings" else date, v, "note"])
+    buffer = BytesIO()
+    workbook.save(buffer)
+    return buffer.getvalue()
+
+
+def measure(func, content: bytes, memory: bool):
+    file = UploadFile(BytesIO(content), filename="data.xlsx")
+    start = time.perf_counter()
+    result = func(file)
+    elapsed = time.perf_counter() - start
+    if not memory:
+        return result, elapsed, float("nan")
+
+    file.file.seek(0)
+    tracemalloc.start()
+    func(file)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def check_limit(rows: int, limit: int) -> bool:
+    """Проверяет, что файл сверх допустимого количества строк отклоняется до чтения всего файла."""
+    content = make_excel(rows, "cells")
+    _, full_time, _ = measure(excel_to_dict, content, memory=False)
+
+    max_rows = ConvertersConfig.MAX_FILE_ROWS
+    ConvertersConfig.MAX_FILE_ROWS = limit
+    try:
+        started_at = time.perf_counter()
+        excel_to_dict(UploadFile(BytesIO(content), filename="data.xlsx"))
+        print(f"Файл из {rows} строк не отклонён при пределе {limit} строк")
+        return False
+    except ValueError as e:
+        elapsed = time.perf_counter() - started_at
+        print(f"Файл из {rows} строк отклонён при пределе {limit} за {elapsed:.3f} с "
+              f"(чтение всего файла — {full_time:.3f} с): {e}")
+        return elapsed < full_time
+    finally:
+        ConvertersConfig.MAX_FILE_ROWS = max_rows
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Сравнение конвертеров Excel")
+    parser.add_argument("--rows", type=int, nargs="*", default=[10_000, 100_000])
+    parser.add_argument("--kinds", nargs="*", default=["cells", "strings", "none"],
+                        help="Даты: cells — ячейки-даты, strings — строки, none — без столбца дат")
+    parser.add_argument("--limit", type=int, default=10_000, help="Предел строк для проверки досрочного отказа")
+    parser.add_argument("--memory", action="store_true", help="Измерять пиковое потребление памяти")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    print("{:>9} {:<8} {:>10} {:>10} {:>8} {:>12} {:>12}".format(
+        "rows", "dates", "legacy, s", "new, s", "speedup", "legacy, MB", "new, MB"))
+
+    failed = 0
+    for rows in args.rows:
+        for kind in args.kinds:
+            content = make_excel(rows, kind)
+            legacy, legacy_time, legacy_peak = measure(legacy_excel_to_dict, content, args.memory)
+            new, new_time, new_peak = measure(excel_to_dict, content, args.memory)
+
+            same_dates = (legacy.dates is None and new.dates is None) or np.array_equal(legacy.dates, new.dates)
+            if not (same_dates and np.array_equal(legacy.endog, new.endog)):
+                failed += 1
+                print(f"Результаты различаются: rows={rows}, dates={kind}")
+
+            print("{:>9} {:<8} {:>10.3f} {:>10.3f} {:>7.1f}x {:>12.1f} {:>12.1f}".format(
+                rows, kind, legacy_time, new_time, legacy_time / new_time,
+                legacy_peak / 2**20, new_peak / 2**20))
+
+    if not check_limit(max(args.rows), args.limit):
+        failed += 1
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
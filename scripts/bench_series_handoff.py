@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Сравнение передачи временного ряда процессам пула прогнозирования через сериализацию
+и через разделяемую память.
+
+Для рядов заданной длины измеряет время передачи ряда процессу пула (задача возвращает
+только длину ряда) и полный цикл "ряд в процесс — результат обратно" (задача возвращает
+словарь с датами, значениями ряда и прогнозом, как `services.forecasting.forecast`)
+в пуле `ForecastingPool` с сериализацией рядов и с передачей через разделяемую память.
+Затем проверяет, что сегменты разделяемой памяти удаляются после ошибки в задаче и после
+отмены задачи в очереди. Завершается с ненулевым кодом, если результаты различаются
+или остались неудалённые сегменты.
+"""
+
+import os
+import sys
+import time
+import argparse
+import statistics
+from concurrent.futures import wait
+
+import numpy as np
+import pandas as pd
+
+# Добавление бэкенда в Path (для того чтобы ресолвились нужные модули)
+backend_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+if backend_dir not in sys.path:
+    sys.path.insert(0, backend_dir)
+
+from services.timeseries import TimeSeries
+from workers import ForecastingPool
+from workers.transport import SEGMENT_PREFIX
+
+
+STEPS = 100
+
+
+def series_length(series: TimeSeries) -> int:
+    return len(series)
+
+
+def forecast_like(series: TimeSeries) -> dict:
+    return {
+        "summary": None,
+        "full_dates": series.extended_dates(STEPS),
+        "endog": series.endog,
+        "prediction": series.endog[-STEPS:] + 1.0,
+        "confidence_intervals": {"intervals": None, "confidence_level": None},
+    }
+
+
+def failing(series: TimeSeries) -> None:
+    raise ValueError("Ошибка в задаче")
+
+
+def sleeping(seconds: float) -> None:
+    time.sleep(seconds)
+
+
+def make_series(points: int) -> TimeSeries:
+    values = np.random.default_rng(0).normal(10.0, 3.0, points).cumsum()
+    return TimeSeries(values, pd.date_range("2000-01-01", periods=points, freq="min"))
+
+
+def leftover_segments() -> list:
+    if not os.path.isdir("/dev/shm"):
+        return []
+    return [name for name in os.listdir("/dev/shm") if name.startswith(SEGMENT_PREFIX)]
+
+
+def measure(pool: ForecastingPool, fn, series: TimeSeries, repeat: int):
+    timings = []
+    result = None
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        result = pool.submit(fn, series).result()
+        timings.append(time.perf_counter() - started_at)
+    return result, statistics.median(timings)
+
+
+def same_result(a: dict, b: dict) -> bool:
+    return a.keys() == b.keys() and all(
+        np.array_equal(a[key], b[key]) if isinstance(a[key], np.ndarray) else a[key] == b[key] for key in a
+    )
+
+
+def check_lifecycle(pool: ForecastingPool, series: TimeSeries) -> bool:
+    ok = True
+    try:
+        pool.submit(failing, series).result()
+        ok = False
+    except ValueError:
+        pass
+
+    # Единственный процесс пула и очередь передачи задач процессам заняты,
+    # поэтому задача с рядом ждёт в очереди пула и снимается с неё
+    busy = [pool.submit(sleeping, 0.2) for _ in range(3)]
+    queued = pool.submit(series_length, series)
+    ok &= pool.shared_bytes > 0 and queued.cancel() and queued.cancelled()
+    wait(busy)
+
+    if pool.shared_bytes or leftover_segments():
+        print(f"Не удалены сегменты разделяемой памяти: {leftover_segments()}, {pool.shared_bytes} байт")
+        return False
+    return ok
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Передача рядов процессам пула: сериализация и разделяемая память")
+    parser.add_argument("--points", type=int, nargs="*", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=20)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    pickle_pool = ForecastingPool(1)
+    shared_pool = ForecastingPool(1, shared_min_bytes=1)
+    pickle_pool.warm_up()
+    shared_pool.warm_up()
+
+    print("{:>9} {:>10} {:>16} {:>16} {:>16} {:>16}".format(
+        "points", "size, MB", "to worker pkl", "to worker shm", "round trip pkl", "round trip shm"))
+
+    failed = 0
+    try:
+        for points in args.points:
+            series = make_series(points)
+            size = (series.endog.nbytes + series.dates.nbytes) / 2**20
+            _, pickle_in = measure(pickle_pool, series_length, series, args.repeat)
+            _, shared_in = measure(shared_pool, series_length, series, args.repeat)
+            pickle_result, pickle_trip = measure(pickle_pool, forecast_like, series, args.repeat)
+            shared_result, shared_trip = measure(shared_pool, forecast_like, series, args.repeat)
+
+            if not same_result(pickle_result, shared_result):
+                failed += 1
+                print(f"Результаты различаются: points={points}")
+
+            print("{:>9} {:>10.1f} {:>13.2f} мс {:>13.2f} мс {:>13.2f} мс {:>13.2f} мс".format(
+                points, size, pickle_in * 1000, shared_in * 1000, pickle_trip * 1000, shared_trip * 1000))
+
+        if not check_lifecycle(shared_pool, make_series(args.points[-1])):
+            failed += 1
+        else:
+            print("Сегменты разделяемой памяти удалены после ошибки и отмены задач")
+    finally:
+        pickle_pool.shutdown()
+        shared_pool.shutdown()
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
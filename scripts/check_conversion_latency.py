@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Проверка того, что преобразование большого загруженного файла не задерживает другие запросы.
+
+Поднимает приложение backend в процессе скрипта (без БД: состояние приложения создаётся
+вручную) и, пока на `POST /api/forecast` загружается и преобразуется большой CSV-файл,
+с заданным периодом отправляет лёгкие запросы `GET /api/forecast/admission-stats`.
+Сравнивает задержки лёгких запросов без загрузки и во время неё. С --inline файл
+преобразуется прежним способом, прямо в цикле событий (для сравнения).
+Завершается с ненулевым кодом, если максимальная задержка во время загрузки превышает --max-latency.
+"""
+
+import os
+import sys
+import time
+import asyncio
+import argparse
+import statistics
+from datetime import datetime, timedelta
+
+import httpx
+import numpy as np
+
+# Добавление бэкенда в Path (для того чтобы ресолвились нужные модули)
+backend_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+if backend_dir not in sys.path:
+    sys.path.insert(0, backend_dir)
+
+from converters import convert_to_dict
+from main import app
+from workers import AdmissionController, ConversionPool, ForecastingPool, WorkersConfig
+
+
+class InlineConverter:
+    """Преобразование файла прямо в цикле событий, как до выноса в пул."""
+
+    async def convert(self, file, settings: dict) -> dict:
+        return convert_to_dict(file=file, settings=settings)
+
+
+def make_csv(rows: int) -> bytes:
+    values = np.random.default_rng(0).normal(10.0, 3.0, rows).cumsum()
+    start = datetime(2000, 1, 1)
+    lines = ["dates,value"] + [
+        f"{(start + timedelta(days=i % 36500)).date().isoformat()},{v:.4f}" for i, v in enumerate(values)
+    ]
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+async def probe(client: httpx.AsyncClient, interval: float, stop: asyncio.Event) -> list:
+    latencies = []
+    while not stop.is_set():
+        started_at = time.perf_counter()
+        response = await client.get("/api/forecast/admission-stats")
+        response.raise_for_status()
+        latencies.append(time.perf_counter() - started_at)
+        await asyncio.sleep(interval)
+    return latencies
+
+
+async def upload(client: httpx.AsyncClient, content: bytes) -> httpx.Response:
+    return await client.post(
+        "/api/forecast",
+        data={
+            # Неизвестная модель: прогноз завершается ошибкой сразу после преобразования файла
+            "selectedModel": "NONE",
+            "modelSettings": '{"steps": 1}',
+            "fileSettings": '{"csvDelimiter": "auto", "dateFormat": "auto"}',
+        },
+        files={"uploadedData": ("data.csv", content, "text/csv")},
+        timeout=600,
+    )
+
+
+def describe(latencies: list) -> str:
+    ms = [latency * 1000 for latency in latencies]
+    return f"запросов {len(ms)}, медиана {statistics.median(ms):.1f} мс, максимум {max(ms):.1f} мс"
+
+
+async def run(args) -> float:
+    content = make_csv(args.rows)
+    print(f"Файл: {args.rows} строк, {len(content) / 2**20:.1f} МБ")
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        stop = asyncio.Event()
+        probe_task = asyncio.create_task(probe(client, args.interval, stop))
+        await asyncio.sleep(args.baseline)
+        stop.set()
+        print(f"Без загрузки:       {describe(await probe_task)}")
+
+        stop = asyncio.Event()
+        probe_task = asyncio.create_task(probe(client, args.interval, stop))
+        started_at = time.perf_counter()
+        response = await upload(client, content)
+        elapsed = time.perf_counter() - started_at
+        stop.set()
+        latencies = await probe_task
+        print(f"Во время загрузки:  {describe(latencies)}")
+        print(f"Загрузка обработана за {elapsed:.2f} с (HTTP {response.status_code})")
+    return max(latencies)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Задержка лёгких запросов во время преобразования большого файла")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--interval", type=float, default=0.01, help="Период лёгких запросов в секундах")
+    parser.add_argument("--baseline", type=float, default=1.0, help="Длительность замера без загрузки в секундах")
+    parser.add_argument("--max-latency", type=float, default=0.25,
+                        help="Допустимая задержка лёгкого запроса во время загрузки в секундах")
+    parser.add_argument("--inline", action="store_true", help="Преобразовывать файл в цикле событий")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    app.state.forecasting_process_pool = ForecastingPool(1)
+    app.state.forecast_admission = AdmissionController(
+        families=WorkersConfig.MODEL_FAMILIES,
+        default_family=WorkersConfig.DEFAULT_MODEL_FAMILY,
+        concurrency=WorkersConfig.ADMISSION_CONCURRENCY,
+        max_queued=WorkersConfig.ADMISSION_MAX_QUEUED,
+        max_queued_per_client=WorkersConfig.ADMISSION_MAX_QUEUED_PER_CLIENT,
+    )
+    if args.inline:
+        app.state.conversion_pool = InlineConverter()
+    else:
+        app.state.conversion_pool = ConversionPool(1, max_pending=4, max_pending_bytes=256 * 2**20)
+        app.state.conversion_pool.warm_up()
+
+    try:
+        max_latency = asyncio.run(run(args))
+    finally:
+        if not args.inline:
+            app.state.conversion_pool.shutdown()
+        app.state.forecasting_process_pool.shutdown()
+
+    if max_latency > args.max_latency:
+        print(f"Задержка лёгкого запроса {max_latency:.3f} с превышает {args.max_latency} с")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
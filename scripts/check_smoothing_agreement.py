@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Сверка быстрой реализации SES/HES на NumPy с statsmodels.
+
+На синтетических рядах обучает `NumpyExponentialSmoothingModel` и `ExponentialSmoothing`
+из statsmodels с одинаковыми параметрами, сравнивает SSE, прогнозы и время обучения.
+Завершается с ненулевым кодом, если расхождение прогнозов превышает --tolerance.
+"""
+
+import os
+import sys
+import time
+import argparse
+import warnings
+
+import numpy as np
+from statsmodels.tsa.holtwinters import ExponentialSmoothing
+
+# Добавление бэкенда в Path (для того чтобы ресолвились нужные модули)
+backend_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+if backend_dir not in sys.path:
+    sys.path.insert(0, backend_dir)
+
+from services.forecasting.smoothing import NumpyExponentialSmoothingModel
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Сверка SES/HES на NumPy с statsmodels")
+    parser.add_argument("--lengths", type=int, nargs="*", default=[50, 200, 2000])
+    parser.add_argument("--seeds", type=int, default=5, help="Количество случайных рядов на конфигурацию")
+    parser.add_argument("--steps", type=int, default=10)
+    parser.add_argument("--tolerance", type=float, default=1e-2,
+                        help="Допустимое относительное расхождение прогнозов")
+    return parser.parse_args()
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main():
+    args = parse_args()
+    warnings.simplefilter("ignore")
+
+    configs = [
+        {"trend": None, "initialization_method": "estimated"},
+        {"trend": None, "initialization_method": "known"},
+        {"trend": "add", "initialization_method": "estimated"},
+        {"trend": "add", "initialization_method": "known"},
+    ]
+
+    print("{:<6} {:<6} {:<10} {:>12} {:>12} {:>12} {:>10} {:>10}".format(
+        "n", "trend", "init", "SSE numpy", "SSE sm", "max diff", "numpy, ms", "sm, ms"))
+
+    failed = 0
+    for n in args.lengths:
+        for config in configs:
+            for seed in range(args.seeds):
+                rng = np.random.default_rng(seed)
+                y = np.cumsum(rng.normal(0.1, 1.0, n)) + 20.0
+
+                settings = dict(config)
+                if settings["initialization_method"] == "known":
+                    settings["initial_level"] = float(y[0])
+                    if settings["trend"]:
+                        settings["initial_trend"] = 0.1
+
+                model = NumpyExponentialSmoothingModel(**settings)
+                results, numpy_time = timed(lambda: model.fit({"endog": y}))
+                numpy_forecast = model.forecast(args.steps)
+
+                sm_settings = {key: value for key, value in settings.items() if value is not None}
+                sm_results, sm_time = timed(lambda: ExponentialSmoothing(y, **sm_settings).fit())
+                sm_forecast = sm_results.forecast(args.steps)
+
+                diff = np.max(np.abs(numpy_forecast - sm_forecast))
+                scale = max(np.max(np.abs(sm_forecast)), 1.0)
+                if diff / scale > args.tolerance:
+                    failed += 1
+
+                if seed == 0 or diff / scale > args.tolerance:
+                    print("{:<6} {:<6} {:<10} {:>12.4f} {:>12.4f} {:>12.2e} {:>10.2f} {:>10.2f}".format(
+                        n, str(config["trend"]), config["initialization_method"],
+                        results.sse, sm_results.sse, diff, numpy_time * 1000, sm_time * 1000,
+                    ))
+
+    if failed:
+        print(f"❌ Расхождение выше допустимого в {failed} случаях")
+        sys.exit(1)
+    print("✅ Прогнозы совпадают с statsmodels в пределах допуска")
+
+
+if __name__ == "__main__":
+    main()